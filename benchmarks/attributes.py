@@ -0,0 +1,89 @@
+"""
+Measure building and rendering elements with many attributes, with and
+without prototype presets.
+
+Usage: python benchmarks/attributes.py [elements]
+"""
+
+import sys
+import time
+from collections.abc import Callable
+
+from minihtml import Element, template
+from minihtml.tags import button, div, input, label
+
+field = div.preset(class_="mb-3")
+field_label = label.preset(class_="form-label")
+text_input = input.preset(
+    type="text", class_="form-control", data_validate="required", required=True
+)
+clear_button = button.preset(type="button", class_="btn btn-secondary")
+
+
+def build_form(n: int) -> Element:
+    return div["form"](
+        *[
+            div(class_="mb-3")(
+                label(class_="form-label", for_=f"field-{i}")(f"Field {i}"),
+                input(
+                    type="text",
+                    class_="form-control",
+                    data_validate="required",
+                    required=True,
+                    id=f"field-{i}",
+                    name=f"field_{i}",
+                    aria_describedby=f"help-{i}",
+                ),
+                button(type="button", class_="btn btn-secondary")("Clear"),
+            )
+            for i in range(n)
+        ]
+    )
+
+
+def build_form_with_presets(n: int) -> Element:
+    return div["form"](
+        *[
+            field(
+                field_label(for_=f"field-{i}")(f"Field {i}"),
+                text_input(
+                    id=f"field-{i}", name=f"field_{i}", aria_describedby=f"help-{i}"
+                ),
+                clear_button("Clear"),
+            )
+            for i in range(n)
+        ]
+    )
+
+
+@template()
+def form(n: int, presets: bool) -> Element:
+    return build_form_with_presets(n) if presets else build_form(n)
+
+
+def measure(build: Callable[[], object]) -> float:
+    start = time.perf_counter()
+    build()
+    return time.perf_counter() - start
+
+
+def run_benchmark() -> None:
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    print(f"{n} form fields")
+    # Presets put their attributes first, so the output is only the same
+    # because build_form() passes the attributes in the same order.
+    assert form(10, presets=True).render() == form(10, presets=False).render()
+
+    baseline = measure(lambda: build_form(n))
+    print(f"{'build':>16}  {baseline:>7.2f}s")
+    elapsed = measure(lambda: build_form_with_presets(n))
+    print(f"{'build (presets)':>16}  {elapsed:>7.2f}s  {baseline / elapsed:>6.1f}x")
+
+    baseline = measure(lambda: form(n, presets=False).render())
+    print(f"{'render':>16}  {baseline:>7.2f}s")
+    elapsed = measure(lambda: form(n, presets=True).render())
+    print(f"{'render (presets)':>16}  {elapsed:>7.2f}s  {baseline / elapsed:>6.1f}x")
+
+
+if __name__ == "__main__":
+    run_benchmark()
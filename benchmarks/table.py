@@ -0,0 +1,70 @@
+"""
+Compare building and rendering a large table from individual elements with
+table_from_rows().
+
+If NumPy is installed, a NumPy array with the same data is rendered as well.
+
+Usage: python benchmarks/table.py [rows] [columns]
+"""
+
+import sys
+import time
+from collections.abc import Callable
+from typing import Any
+
+from minihtml import Element, table_from_rows, template
+from minihtml.tags import table, tbody, td, th, thead, tr
+
+
+def make_rows(rows: int, columns: int) -> list[list[object]]:
+    return [
+        [f"<cell {r}/{c}>" if c % 2 else r * columns + c for c in range(columns)]
+        for r in range(rows)
+    ]
+
+
+@template()
+def prototypes(rows: list[list[object]], columns: list[str]) -> Element:
+    return table(
+        thead(tr(*[th(c) for c in columns])),
+        tbody(*[tr(*[td(str(value)) for value in row]) for row in rows]),
+    )
+
+
+@template()
+def bulk(rows: Any, columns: list[str]) -> Element:
+    return table_from_rows(rows, columns)
+
+
+def measure(render: Callable[[], str]) -> tuple[float, int]:
+    start = time.perf_counter()
+    size = len(render())
+    return time.perf_counter() - start, size
+
+
+def run_benchmark() -> None:
+    n_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    n_columns = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    rows = make_rows(n_rows, n_columns)
+    columns = [f"column {c}" for c in range(n_columns)]
+    print(f"{n_rows} rows x {n_columns} columns")
+
+    baseline, expected = measure(lambda: prototypes(rows, columns).render())
+    print(f"{'prototypes':>16}  {baseline:>7.2f}s")
+
+    elapsed, size = measure(lambda: bulk(rows, columns).render())
+    assert size == expected
+    print(f"{'table_from_rows':>16}  {elapsed:>7.2f}s  {baseline / elapsed:>6.1f}x")
+
+    try:
+        import numpy as np  # pyright: ignore[reportMissingImports]
+    except ImportError:
+        return
+
+    array = np.arange(n_rows * n_columns).reshape(n_rows, n_columns)
+    elapsed, _ = measure(lambda: bulk(array, columns).render())
+    print(f"{'numpy':>16}  {elapsed:>7.2f}s  {baseline / elapsed:>6.1f}x")
+
+
+if __name__ == "__main__":
+    run_benchmark()
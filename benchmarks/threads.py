@@ -0,0 +1,82 @@
+"""
+Measure rendering throughput with an increasing number of threads.
+
+On the free-threaded build of Python (3.13t or later), throughput should scale
+close to linearly with the number of threads (up to the number of CPU cores).
+With the GIL enabled, it stays flat.
+
+Usage: python benchmarks/threads.py [max_threads]
+"""
+
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from minihtml import Component, Element, Slots, component, template
+from minihtml.tags import a, body, div, h2, head, html, li, main, p, title, ul
+
+PAGES_PER_THREAD = 50
+
+
+@component()
+def card(slots: Slots, n: int) -> Element:
+    with div["card shadow"] as elem:
+        h2(f"Card {n}")
+        p("Lorem ipsum dolor sit amet, consectetur adipiscing elit & more.")
+        with ul:
+            for i in range(5):
+                li(a(href=f"/items/{n}/{i}")(f"Item {i}"))
+    return elem
+
+
+@component()
+def layout(slots: Slots) -> Element:
+    with html as elem:
+        with head:
+            title("Benchmark")
+        with body, main:
+            slots.slot()
+    return elem
+
+
+@template(layout=layout)
+def page(layout: Component, cards: int) -> None:
+    for n in range(cards):
+        card(n)
+
+
+def render_pages(count: int) -> int:
+    size = 0
+    for _ in range(count):
+        size += len(page(100).render())
+    return size
+
+
+def run(threads: int) -> float:
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        futures = [
+            executor.submit(render_pages, PAGES_PER_THREAD) for _ in range(threads)
+        ]
+        for future in futures:
+            future.result()
+    elapsed = time.perf_counter() - start
+    return threads * PAGES_PER_THREAD / elapsed
+
+
+def run_benchmark() -> None:
+    max_threads = int(sys.argv[1]) if len(sys.argv) > 1 else (os.cpu_count() or 4)
+    gil = getattr(sys, "_is_gil_enabled", lambda: True)()
+    print(f"Python {sys.version.split()[0]}, GIL {'enabled' if gil else 'disabled'}")
+
+    render_pages(5)  # warm up
+    baseline = run(1)
+    print(f"{'threads':>7}  {'pages/s':>9}  {'speedup':>7}")
+    for threads in range(1, max_threads + 1):
+        rate = baseline if threads == 1 else run(threads)
+        print(f"{threads:>7}  {rate:>9.1f}  {rate / baseline:>7.2f}")
+
+
+if __name__ == "__main__":
+    run_benchmark()
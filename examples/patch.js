@@ -0,0 +1,40 @@
+// Apply a list of patch operations created by minihtml.diff() to the DOM.
+//
+// `root` is the element corresponding to the root of the old tree. Returns the
+// new root element, which is different from `root` if it has been replaced.
+export function applyPatch(root, patches) {
+  const resolve = (path) => path.reduce((el, i) => el.children[i], root);
+  const parse = (html) => {
+    const template = document.createElement("template");
+    template.innerHTML = html;
+    return template.content;
+  };
+
+  for (const patch of patches) {
+    switch (patch.op) {
+      case "replace": {
+        const target = resolve(patch.path);
+        const fragment = parse(patch.html);
+        const replacement = fragment.firstElementChild;
+        target.replaceWith(fragment);
+        if (target === root) root = replacement;
+        break;
+      }
+      case "set_attr":
+        resolve(patch.path).setAttribute(patch.name, patch.value ?? "");
+        break;
+      case "remove_attr":
+        resolve(patch.path).removeAttribute(patch.name);
+        break;
+      case "insert": {
+        const parent = resolve(patch.path);
+        parent.insertBefore(parse(patch.html), parent.children[patch.index] ?? null);
+        break;
+      }
+      case "remove":
+        resolve(patch.path).remove();
+        break;
+    }
+  }
+  return root;
+}
@@ -1,5 +1,10 @@
+from ._adapters import asgi_response, wsgi_response
+from ._assets import Assets
+from ._build import Build
+from ._builder import element, from_data
 from ._component import Component, ComponentWrapper, SlotContext, Slots, component
 from ._core import (
+    AttributeFilter,
     CircularReferenceError,
     Element,
     ElementEmpty,
@@ -10,35 +15,72 @@ from ._core import (
     PrototypeEmpty,
     PrototypeNonEmpty,
     Text,
+    Transform,
     fragment,
     make_prototype,
     safe,
+    set_escape_function,
     text,
 )
-from ._template import Template, component_scripts, component_styles, template
+from ._diff import Patch, diff
+from ._events import AttributeEvent, EndEvent, Event, StartEvent, TextEvent
+from ._manifest import Manifest
+from ._parallel import independent
+from ._table import table_from_rows
+from ._template import (
+    Dependencies,
+    Template,
+    clear_manifests,
+    component_scripts,
+    component_styles,
+    template,
+)
+from ._template_context import depends_on
 
 __all__ = [
+    "Assets",
+    "AttributeEvent",
+    "AttributeFilter",
+    "Build",
     "CircularReferenceError",
     "Component",
     "ComponentWrapper",
+    "Dependencies",
     "Element",
     "ElementEmpty",
     "ElementNonEmpty",
+    "EndEvent",
+    "Event",
     "Fragment",
+    "Manifest",
     "Node",
+    "Patch",
     "Prototype",
     "PrototypeEmpty",
     "PrototypeNonEmpty",
     "SlotContext",
     "Slots",
+    "StartEvent",
     "Template",
     "Text",
+    "TextEvent",
+    "Transform",
+    "asgi_response",
+    "clear_manifests",
     "component",
     "component_scripts",
     "component_styles",
+    "depends_on",
+    "diff",
+    "element",
     "fragment",
+    "from_data",
+    "independent",
     "make_prototype",
     "safe",
+    "set_escape_function",
+    "table_from_rows",
     "template",
     "text",
+    "wsgi_response",
 ]
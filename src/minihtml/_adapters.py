@@ -0,0 +1,207 @@
+import asyncio
+import concurrent.futures
+import threading
+from collections.abc import Awaitable, Callable, Generator, Iterable, MutableMapping
+from functools import partial
+from typing import Any, Protocol, TypeAlias
+
+from ._streaming import (
+    DEFAULT_CHUNK_SIZE,
+    ChunkWriter,
+    Compression,
+    Compressor,
+    RenderCancelled,
+    iter_chunks,
+)
+from ._template import Template
+
+Headers: TypeAlias = Iterable[tuple[str, str]]
+Message: TypeAlias = MutableMapping[str, Any]
+
+
+class StartResponse(Protocol):
+    def __call__(
+        self, status: str, headers: list[tuple[str, str]], /
+    ) -> object: ...  # pragma: no cover
+
+
+def _response_headers(
+    encoding: str, compression: Compression | None, headers: Headers
+) -> list[tuple[str, str]]:
+    response_headers = [("Content-Type", f"text/html; charset={encoding}")]
+    if compression:
+        response_headers.append(("Content-Encoding", compression))
+        response_headers.append(("Vary", "Accept-Encoding"))
+    response_headers.extend(headers)
+    return response_headers
+
+
+def wsgi_response(
+    template: Template,
+    start_response: StartResponse,
+    *,
+    status: str = "200 OK",
+    headers: Headers = (),
+    encoding: str = "utf-8",
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    minify: bool = False,
+    compression: Compression | None = None,
+    compresslevel: int = 6,
+    sync_flush: bool = True,
+) -> Generator[bytes, None, None]:
+    """
+    Render a template as a streaming WSGI response.
+
+    Return the result from a WSGI application. The template is rendered in a
+    background thread while the server sends the response, one chunk at a
+    time. ``start_response`` is called when the first chunk is ready, so
+    errors raised while building the page can still be handled by the server
+    or middleware. Closing the response (for example when the client
+    disconnects) stops rendering.
+
+    Args:
+        template: The template to render.
+        start_response: The ``start_response`` callable passed to the WSGI
+          application.
+        status: The HTTP status line.
+        headers: Additional response headers.
+        encoding: The output encoding. Also used for the ``charset`` of the
+          ``Content-Type`` header.
+        chunk_size: The minimum size (in characters) of each chunk.
+        minify: Produce minified output (see :meth:`Template.write`).
+        compression: Compress the response with ``"gzip"`` or ``"deflate"``
+          while rendering, and set the ``Content-Encoding`` header. Check the
+          request's ``Accept-Encoding`` header before enabling this.
+        compresslevel: The compression level, from 0 to 9.
+        sync_flush: Flush the compressor after each chunk, so that the client
+          can start decoding the page right away. Disable for slightly better
+          compression.
+    """
+    response_headers = _response_headers(encoding, compression, headers)
+    compressor = (
+        Compressor(compression, compresslevel, sync_flush) if compression else None
+    )
+    chunks = iter_chunks(partial(template.write, minify=minify), chunk_size)
+    try:
+        for i, chunk in enumerate(chunks):
+            if i == 0:
+                start_response(status, response_headers)
+            data = chunk.encode(encoding)
+            if compressor:
+                data = compressor.compress(data)
+            if data:
+                yield data
+    finally:
+        chunks.close()
+    if compressor:
+        yield compressor.finish()
+
+
+async def asgi_response(
+    template: Template,
+    receive: Callable[[], Awaitable[Message]],
+    send: Callable[[Message], Awaitable[None]],
+    *,
+    status: int = 200,
+    headers: Headers = (),
+    encoding: str = "utf-8",
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    minify: bool = False,
+    compression: Compression | None = None,
+    compresslevel: int = 6,
+    sync_flush: bool = True,
+) -> None:
+    """
+    Render a template as a streaming ASGI HTTP response.
+
+    The template is rendered in a worker thread. Each chunk is sent as soon as
+    it is ready, and rendering waits until ``send()`` has completed before
+    continuing, so a slow client applies backpressure. When the client
+    disconnects or the task running the application is cancelled, rendering
+    stops at the next chunk boundary.
+
+    Args:
+        template: The template to render.
+        receive: The ``receive`` callable passed to the ASGI application.
+        send: The ``send`` callable passed to the ASGI application.
+        status: The HTTP status code.
+        headers: Additional response headers.
+        encoding: The output encoding. Also used for the ``charset`` of the
+          ``Content-Type`` header.
+        chunk_size: The minimum size (in characters) of each chunk.
+        minify: Produce minified output (see :meth:`Template.write`).
+        compression: Compress the response with ``"gzip"`` or ``"deflate"``
+          while rendering, and set the ``Content-Encoding`` header. Check the
+          request's ``Accept-Encoding`` header before enabling this.
+        compresslevel: The compression level, from 0 to 9.
+        sync_flush: Flush the compressor after each chunk, so that the client
+          can start decoding the page right away. Disable for slightly better
+          compression.
+    """
+    loop = asyncio.get_running_loop()
+    disconnected = threading.Event()
+    sending: concurrent.futures.Future[None] | None = None
+    started = False
+    response_headers = [
+        (k.lower().encode("latin-1"), v.encode("latin-1"))
+        for k, v in _response_headers(encoding, compression, headers)
+    ]
+    compressor = (
+        Compressor(compression, compresslevel, sync_flush) if compression else None
+    )
+
+    async def start_response() -> None:
+        nonlocal started
+        if not started:
+            started = True
+            await send(
+                {
+                    "type": "http.response.start",
+                    "status": status,
+                    "headers": response_headers,
+                }
+            )
+
+    async def send_chunk(body: bytes) -> None:
+        await start_response()
+        await send({"type": "http.response.body", "body": body, "more_body": True})
+
+    def emit(chunk: str) -> None:
+        nonlocal sending
+        if disconnected.is_set():
+            raise RenderCancelled
+        body = chunk.encode(encoding)
+        if compressor:
+            body = compressor.compress(body)
+        if body:
+            sending = asyncio.run_coroutine_threadsafe(send_chunk(body), loop)
+            try:
+                sending.result()
+            except concurrent.futures.CancelledError:
+                raise RenderCancelled from None
+
+    def render() -> None:
+        writer = ChunkWriter(emit, chunk_size)
+        template.write(writer, minify=minify)
+        writer.emit_chunk()
+
+    async def watch_disconnect() -> None:
+        while (await receive())["type"] != "http.disconnect":
+            pass
+        disconnected.set()
+
+    watcher = asyncio.create_task(watch_disconnect())
+    try:
+        await asyncio.to_thread(render)
+    except RenderCancelled:
+        return
+    finally:
+        # Also stop the worker thread if this task was cancelled (for example
+        # by the server), instead of rendering the rest of the page.
+        disconnected.set()
+        if sending is not None:
+            sending.cancel()
+        watcher.cancel()
+    await start_response()
+    body = compressor.finish() if compressor else b""
+    await send({"type": "http.response.body", "body": body, "more_body": False})
@@ -0,0 +1,128 @@
+import base64
+import hashlib
+import os
+import tempfile
+import threading
+from collections.abc import Iterable
+from pathlib import Path
+from typing import Literal
+
+from ._builder import element
+from ._core import Node, escape_text
+from ._events import EndEvent, StartEvent, TextEvent
+from ._template_context import content_key
+
+ResourceKind = Literal["style", "script"]
+
+_SUFFIXES: dict[ResourceKind, str] = {"style": "css", "script": "js"}
+_SEPARATORS: dict[ResourceKind, str] = {"style": "\n", "script": ";\n"}
+
+
+def _inline_content(node: Node, kind: ResourceKind) -> str | None:
+    # Returns the content of a <style> or <script> element without
+    # attributes, or None if the node cannot be moved into a bundle.
+    events = list(node.iter_events())
+    if len(events) < 2 or events[0] != StartEvent(kind) or events[-1] != EndEvent(kind):
+        return None
+    parts: list[str] = []
+    for event in events[1:-1]:
+        if not isinstance(event, TextEvent):
+            return None
+        parts.append(event.text if event.safe else escape_text(event.text))
+    return "".join(parts)
+
+
+def write_file_atomic(path: Path, data: bytes) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # Write to a temporary file first, so that a partially written file is
+    # never served.
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.chmod(tmp, 0o644)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+class Assets:
+    """
+    Write component styles and scripts to external files.
+
+    Pass an instance to :deco:`template` with ``assets=...`` to replace
+    the ``<style>`` and ``<script>`` elements inserted by
+    :func:`component_styles` and :func:`component_scripts` with references to
+    files. Consecutive elements without attributes are combined into one file,
+    named after the hash of its content, and referenced with a ``<link>`` or
+    ``<script src>`` element that includes a `subresource integrity
+    <https://developer.mozilla.org/en-US/docs/Web/Security/Subresource_Integrity>`_
+    hash. The references have a ``crossorigin="anonymous"`` attribute, which
+    browsers require to check the hash of files served from another origin,
+    such as a CDN. Elements with attributes are left in place.
+
+    Files are written the first time they are needed, and never modified
+    afterwards. They can be served with long cache lifetimes.
+
+    Args:
+        directory: The directory to write the files to. It will be created if
+          it does not exist.
+        url_prefix: The URL under which the files in `directory` are served.
+    """
+
+    def __init__(self, directory: str | os.PathLike[str], url_prefix: str = "/"):
+        self._directory = Path(directory)
+        self._url_prefix = url_prefix if url_prefix.endswith("/") else url_prefix + "/"
+        self._bundles: dict[tuple[str, ...], Node] = {}
+        self._lock = threading.Lock()
+
+    def link_nodes(self, nodes: Iterable[Node], kind: ResourceKind) -> list[Node]:
+        """
+        Replace runs of bundleable nodes with references to bundle files.
+        """
+        result: list[Node] = []
+        run: list[tuple[Node, str]] = []
+        for node in nodes:
+            content = _inline_content(node, kind)
+            if content is None:
+                if run:
+                    result.append(self._bundle(run, kind))
+                    run = []
+                result.append(node)
+            else:
+                run.append((node, content))
+        if run:
+            result.append(self._bundle(run, kind))
+        return result
+
+    def _bundle(self, run: list[tuple[Node, str]], kind: ResourceKind) -> Node:
+        key = tuple([content_key(node) for node, _ in run])
+        with self._lock:
+            if (node := self._bundles.get(key)) is None:
+                data = _SEPARATORS[kind].join([c for _, c in run]).encode()
+                name = f"{hashlib.sha256(data).hexdigest()[:16]}.{_SUFFIXES[kind]}"
+                self._write_file(name, data)
+                url = self._url_prefix + name
+                digest = base64.b64encode(hashlib.sha384(data).digest()).decode()
+                integrity = f"sha384-{digest}"
+                if kind == "style":
+                    node = element(
+                        "link",
+                        rel="stylesheet",
+                        href=url,
+                        integrity=integrity,
+                        crossorigin="anonymous",
+                    )
+                else:
+                    node = element(
+                        "script", src=url, integrity=integrity, crossorigin="anonymous"
+                    )
+                self._bundles[key] = node
+        return node
+
+    def _write_file(self, name: str, data: bytes) -> None:
+        path = self._directory / name
+        if path.exists():
+            return
+        write_file_atomic(path, data)
@@ -0,0 +1,150 @@
+import inspect
+import json
+import os
+import sys
+from pathlib import Path
+from typing import Any
+
+from ._assets import write_file_atomic
+from ._component import ComponentWrapper
+from ._template import Template
+from ._template_context import file_hash, source_hash
+
+STATE_VERSION = 1
+
+
+def _resolve(name: str) -> object:
+    # Find a module-level object by its qualified name ("module:qualname").
+    module_name, _, qualname = name.partition(":")
+    obj: object = sys.modules.get(module_name)
+    for part in qualname.split("."):
+        obj = getattr(obj, part, None)
+    return obj
+
+
+def _current_fingerprint(name: str) -> str | None:
+    kind, _, rest = name.partition(":")
+    if kind == "file":
+        return file_hash(rest)
+    if kind in ("style", "script"):
+        # Named by their content. Changes show up in the fingerprints of the
+        # components that include them.
+        return rest
+    obj = _resolve(rest)
+    if kind == "component" and isinstance(obj, ComponentWrapper):
+        return obj.fingerprint()
+    if kind == "template" and callable(obj):
+        return source_hash(inspect.unwrap(obj))
+    return None
+
+
+class Build:
+    """
+    Render static pages, skipping the pages that have not changed since the
+    last build.
+
+    The dependencies of each page (see :meth:`Dependencies.fingerprints`) are
+    recorded in a state file. A page is only rendered again if its output file
+    is missing, if it uses a different template, `key` or `minify` option, or
+    if one of its dependencies has changed: the source code of the template function or of
+    a component, the styles and scripts of a component, or an input file
+    recorded with :func:`depends_on`. Pages that use templates or components
+    that are not defined at the module level are always rendered.
+
+    Changes to other code, such as helper functions, are not detected. Include
+    a version number in the `key` of each page, or delete the state file, to
+    render all pages again.
+
+    Use the build as a context manager to save the state file at the end::
+
+        with Build("build/.state.json") as build:
+            for post in posts:
+                build.render(f"build/{post.slug}.html", post_page(post))
+
+    Args:
+        state_file: The file to keep the state of the build in.
+    """
+
+    def __init__(self, state_file: str | os.PathLike[str]):
+        self._state_file = Path(state_file)
+        self._pages: dict[str, dict[str, Any]] = {}
+        # Current fingerprints, which do not change during a build.
+        self._current: dict[str, str | None] = {}
+        try:
+            with open(self._state_file, "rb") as f:
+                state: dict[str, Any] = json.load(f)
+        except (OSError, ValueError):
+            return
+        if state.get("version") == STATE_VERSION:
+            self._pages = state["pages"]
+
+    def __enter__(self) -> "Build":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.save()
+
+    def render(
+        self,
+        path: str | os.PathLike[str],
+        template: Template,
+        *,
+        key: str = "",
+        minify: bool = False,
+    ) -> bool:
+        """
+        Render a page to a file, unless it is up to date.
+
+        The file is replaced atomically, so that a partially written page is
+        never served.
+
+        Args:
+            path: The output file. Missing directories are created.
+            template: The template to render.
+            key: A string that identifies the data the page is rendered from,
+              if not recorded with :func:`depends_on`. For example, a hash of
+              the template arguments.
+            minify: Produce minified output (see :meth:`Template.write`).
+
+        Returns:
+            Whether or not the page was rendered.
+        """
+        name = os.fspath(path)
+        if self._is_current(name, template, key, minify):
+            return False
+        output = template.render(minify=minify)
+        write_file_atomic(Path(name), output.encode())
+        self._pages[name] = {
+            "template": template.name,
+            "key": key,
+            "minify": minify,
+            "fingerprints": template.dependencies.fingerprints(),
+        }
+        return True
+
+    def save(self) -> None:
+        """
+        Write the state file.
+        """
+        state = {"version": STATE_VERSION, "pages": self._pages}
+        write_file_atomic(self._state_file, json.dumps(state, indent=1).encode())
+
+    def _is_current(
+        self, name: str, template: Template, key: str, minify: bool
+    ) -> bool:
+        page = self._pages.get(name)
+        if (
+            page is None
+            or page["template"] != template.name
+            or page["key"] != key
+            or page.get("minify", False) != minify
+            or not os.path.exists(name)
+        ):
+            return False
+        fingerprints: dict[str, str] = page["fingerprints"]
+        for dependency, fingerprint in fingerprints.items():
+            if dependency not in self._current:
+                self._current[dependency] = _current_fingerprint(dependency)
+            if self._current[dependency] != fingerprint:
+                return False
+        return True
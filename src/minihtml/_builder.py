@@ -0,0 +1,84 @@
+from collections.abc import Mapping, Sequence
+from functools import cache
+from typing import TypeAlias
+
+from ._core import (
+    Content,
+    Element,
+    Node,
+    PrototypeEmpty,
+    PrototypeNonEmpty,
+    Text,
+)
+
+Data: TypeAlias = "str | Node | Sequence[Data | Mapping[str, str | bool]]"
+
+
+@cache
+def _prototypes() -> dict[str, PrototypeEmpty | PrototypeNonEmpty]:
+    from . import tags
+
+    return {
+        name.rstrip("_"): value
+        for name, value in vars(tags).items()
+        if isinstance(value, PrototypeEmpty | PrototypeNonEmpty)
+    }
+
+
+def element(tag: str, /, *content: Content, **attrs: str | bool) -> Element:
+    """
+    Create an element by tag name, without using an element context.
+
+    The element is created in the same way as by the prototype in
+    :mod:`minihtml.tags` with the same name, but is not added to the current
+    element context, and its content is not checked against the current element
+    context. Tags that are not defined by the HTML specification, such as
+    custom elements, are created as block elements.
+
+    Args:
+        tag: The tag name.
+        content: The element content. Must be empty for empty elements such
+          as ``img``.
+        attrs: The element attributes.
+    """
+    prototype = _prototypes().get(tag) or PrototypeNonEmpty(tag, inline=False)
+    if isinstance(prototype, PrototypeEmpty):
+        if content:
+            raise ValueError(f"Element {tag!r} cannot have content")
+        return prototype.build(**attrs)
+    return prototype.build(*content, **attrs)
+
+
+def from_data(data: Data) -> Node:
+    """
+    Create a tree of elements from nested sequences.
+
+    An element is described by a tuple (or list) containing the tag name, an
+    optional dictionary of attributes, and the element content. Content can be
+    strings, other element descriptions or existing nodes. For example::
+
+        ("ul", {"class": "items"}, ("li", "one"), ("li", "two"))
+
+    The elements are created with :func:`element`, so no element context is
+    involved.
+
+    Args:
+        data: The description of an element, a string or a node.
+    """
+    match data:
+        case str(s):
+            return Text(s)
+        case Node():
+            return data
+        case [str(tag), Mapping() as attrs, *content]:
+            return element(tag, *[_from_content(c) for c in content], **attrs)
+        case [str(tag), *content]:
+            return element(tag, *[_from_content(c) for c in content])
+        case _:
+            raise ValueError(f"Invalid element data: {data!r}")
+
+
+def _from_content(data: "Data | Mapping[str, str | bool]") -> Node:
+    if isinstance(data, Mapping):
+        raise ValueError(f"Unexpected attributes in element content: {data!r}")
+    return from_data(data)
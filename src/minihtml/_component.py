@@ -1,3 +1,4 @@
+import hashlib
 import io
 import sys
 from collections.abc import Iterable, Iterator, Sequence
@@ -10,15 +11,24 @@ else:
     from typing_extensions import Self
 
 from ._core import (
+    DeferredNode,
     ElementNonEmpty,
     HasNodes,
     Node,
+    is_deferring,
     iter_nodes,
     pop_element_context,
     push_element_context,
     register_with_context,
 )
-from ._template_context import register_template_scripts, register_template_styles
+from ._template_context import (
+    content_key,
+    qualified_name,
+    register_template_component,
+    register_template_scripts,
+    register_template_styles,
+    source_hash,
+)
 
 
 class SlotContext:
@@ -64,6 +74,9 @@ class Slots:
             register_with_context(obj)
         return SlotContext(capture=self.is_filled(slot))
 
+    def all_content(self) -> list[Node | HasNodes]:
+        return [obj for content in self._slots.values() for obj in content]
+
     def is_filled(self, slot: str | None = None) -> bool:
         """
         Returns whether or not the slot has been filled.
@@ -92,6 +105,7 @@ class Component:
         self._callback = callback
         self._slots = slots
         self._cached_nodes: list[Node] | None = None
+        self._deferred: DeferredNode | None = None
 
     def __enter__(self) -> Self:
         self._capture = ElementNonEmpty("__capture__")
@@ -123,6 +137,13 @@ class Component:
             self._slots.add_content(slot, content)
 
     def get_nodes(self) -> Iterable[Node]:
+        if is_deferring() and self._cached_nodes is None:
+            if self._deferred is None:
+                self._deferred = DeferredNode(self._expand, self._slots.all_content)
+            return [self._deferred]
+        return self._expand()
+
+    def _expand(self) -> list[Node]:
         if self._cached_nodes is None:
             # Ensure elements created by self._callback are not registered with the currently
             # active context.
@@ -139,6 +160,9 @@ class Component:
         Node.render_list(buf, self.get_nodes())
         return buf.getvalue()
 
+    def __html__(self) -> str:
+        return str(self)
+
 
 class ComponentWrapper(Generic[P]):
     """
@@ -162,12 +186,30 @@ class ComponentWrapper(Generic[P]):
         self._styles = styles
         self._scripts = scripts
 
+    @property
+    def name(self) -> str:
+        """
+        The module and qualified name of the component function, such as
+        ``"myapp.components:card"``.
+        """
+        return qualified_name(self._impl)
+
+    def fingerprint(self) -> str:
+        """
+        Return a hash of the source code of the component function and of the
+        component's styles and scripts, to detect changes between builds.
+        """
+        nodes = [*(self._styles or ()), *(self._scripts or ())]
+        keys = [source_hash(self._impl), *[content_key(node) for node in nodes]]
+        return hashlib.sha256(" ".join(keys).encode()).hexdigest()
+
     def __call__(self, *args: P.args, **kwargs: P.kwargs) -> Component:
         callback: Callable[[Slots], Node | HasNodes] = lambda slots: self._impl(
             slots, *args, **kwargs
         )
         component = Component(callback, slots=Slots(self._slots, default=self._default))
         register_with_context(component)
+        register_template_component(self)
         if self._styles:
             register_template_styles(self._styles)
         if self._scripts:
@@ -1,21 +1,49 @@
+import copy
 import io
 import re
 import sys
-from collections.abc import Iterable, Iterator
+import weakref
+from collections.abc import Collection, Generator, Iterable, Iterator, Mapping
+from contextlib import contextmanager
 from contextvars import ContextVar
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from functools import lru_cache
 from html import escape
-from itertools import zip_longest
-from typing import Literal, Protocol, TextIO, overload
+from itertools import islice
+from typing import (
+    Any,
+    Callable,
+    Literal,
+    Protocol,
+    TextIO,
+    TypeAlias,
+    overload,
+    runtime_checkable,
+)
 
 if sys.version_info >= (3, 11):
     from typing import Self
 else:
     from typing_extensions import Self
 
+from ._events import AttributeEvent, EndEvent, Event, StartEvent, TextEvent
+from ._query import ElementIndex
+from ._selector import Selector, parse_selector_list
+
 # We also disallow '&', '<', ';'
 ATTRIBUTE_NAME_RE = re.compile(r"^[a-zA-Z0-9!#$%()*+,.:?@\[\]^_`{|}~-]+$")
 
+# Escaped attribute values that do not need to be quoted (a trailing "/" would
+# be easy to misread as a self-closing tag)
+UNQUOTED_VALUE_RE = re.compile(r"^[^\s=`]*[^\s=`/]$")
+
+# The end tag of an element that is the last child of one of these elements
+# can not be omitted (the parent has a transparent content model). The same
+# applies to custom elements, whose names contain a "-".
+TRANSPARENT_TAGS = frozenset(
+    ["a", "audio", "canvas", "del", "ins", "map", "noscript", "slot", "video"]
+)
+
 
 class CircularReferenceError(Exception):
     """
@@ -40,30 +68,257 @@ class Node:
         self.write(buffer)
         return buffer.getvalue()
 
+    def __html__(self) -> str:
+        return str(self)
+
+    def iter_events(self) -> Iterator[Event]:
+        """
+        Generate a stream of events describing the node and its content.
+
+        This walks the tree without rendering it, yielding a
+        :class:`StartEvent`, :class:`AttributeEvent`, :class:`TextEvent` or
+        :class:`EndEvent` for each part of the document.
+        """
+        return self._iter_events(set())
+
+    def _iter_events(self, ids_seen: set[int]) -> Iterator[Event]:
+        # Nodes that do not override this are included as rendered HTML.
+        yield TextEvent(str(self), safe=True)
+
+    def compact(self) -> "Node":
+        """
+        Simplify the node and its content in place, without changing the
+        output.
+
+        Adjacent text nodes are merged, and inline elements without
+        attributes that only contain text are replaced by pre-rendered text.
+        This is useful for trees that are rendered repeatedly.
+
+        Pre-rendered elements are no longer elements: transforms, attribute
+        filters and the `select` option of :meth:`Template.write` do not
+        apply to them, and their text stays escaped with the escape function
+        that was active when the node was compacted (see
+        :func:`set_escape_function`).
+
+        Returns:
+            The compacted node. This is either the node itself, or a text node
+            that replaces it.
+        """
+        return self._compact(set(), None)
+
+    def _compact(self, ids_seen: set[int], prev: "Node | None") -> "Node":
+        return self
+
+    def transform(self, *transforms: "Transform") -> "Node":
+        """
+        Apply transforms to every element in the tree, in a single pass.
+
+        Each transform is called with an element and either modifies it in
+        place and returns ``None``, or returns a node to replace it with. The
+        transforms are applied in order, each one to the result of the
+        previous one, before the content of the element is visited. The
+        replacement itself is not transformed again, but its content is.
+
+        The tree is modified in place. To leave the tree unchanged and apply
+        the transforms while rendering instead, pass them to
+        :meth:`Template.write` with ``transforms=...``.
+
+        Args:
+            transforms: The functions to apply.
+
+        Returns:
+            The transformed node. This is either the node itself, or the node
+            that replaces it.
+        """
+        return self._transform(transforms, set())
+
+    def _transform(
+        self, transforms: tuple["Transform", ...], active: set[int]
+    ) -> "Node":
+        return self
+
+    def _transform_content(
+        self, transforms: tuple["Transform", ...], active: set[int]
+    ) -> None:
+        pass
+
+    def _find(
+        self, selector: Selector, pending: list["DeferredNode"]
+    ) -> "Element | None":
+        return None
+
+    @staticmethod
+    def find_selected(nodes: Iterable["Node"], selector: Selector) -> "Element | None":
+        # Search for the first element matching selector. Components that
+        # have been deferred (see deferring()) are only expanded if no match
+        # is found outside of them, and the contents of their slots are
+        # searched before the components themselves are expanded.
+        return Node._find_selected(nodes, selector, set())
+
+    @staticmethod
+    def _find_selected(
+        nodes: Iterable["Node"], selector: Selector, seen: set[int]
+    ) -> "Element | None":
+        pending: list[DeferredNode] = []
+        for node in nodes:
+            if (found := node._find(selector, pending)) is not None:
+                return found
+        for deferred in pending:
+            if id(deferred) in seen:
+                continue
+            seen.add(id(deferred))
+            slot_content = iter_nodes(deferred.slot_content())
+            if (found := Node._find_selected(slot_content, selector, seen)) is not None:
+                return found
+            if (
+                found := Node._find_selected(deferred.expand(), selector, seen)
+            ) is not None:
+                return found
+        return None
+
+    @staticmethod
+    def resolve_deferred(nodes: Iterable["Node"]) -> list["Node"]:
+        # Replace deferred components with their nodes, recursively.
+        result: list[Node] = []
+        for node in nodes:
+            if isinstance(node, DeferredNode):
+                result.extend(Node.resolve_deferred(node.expand()))
+            else:
+                node._resolve_deferred()
+                result.append(node)
+        return result
+
+    def _resolve_deferred(self) -> None:
+        pass
+
+    def _add_to_index(
+        self, index: ElementIndex, parent: "Element | None", ids_seen: set[int]
+    ) -> None:
+        pass
+
+    @staticmethod
+    def find_shared(nodes: Iterable["Node"]) -> set[int]:
+        # Return the ids of elements that appear more than once in the tree.
+        # These are not released while rendering with release=True.
+        seen: set[int] = set()
+        shared: set[int] = set()
+        for node in nodes:
+            node._find_shared(seen, shared)
+        return shared
+
+    def _find_shared(self, seen: set[int], shared: set[int]) -> None:
+        pass
+
+    @staticmethod
+    def compact_list(
+        nodes: Iterable["Node"], ids_seen: set[int] | None = None
+    ) -> list["Node"]:
+        """
+        Compact a sequence of sibling nodes (see :meth:`compact`).
+        """
+        ids_seen = set() if ids_seen is None else ids_seen
+        result: list[Node] = []
+        for node in nodes:
+            prev = result[-1] if result else None
+            node = node._compact(ids_seen, prev)
+            if isinstance(node, Text) and isinstance(prev, Text):
+                result[-1] = Text(str(prev) + str(node), escape=False)
+            else:
+                result.append(node)
+        return result
+
     @staticmethod
     def render_list(f: TextIO, nodes: Iterable["Node"]) -> None:
-        node_list = list(nodes)
-        for node, next_ in zip_longest(node_list, node_list[1:]):
-            node.write(f)
-            if next_ is not None:
-                if node._inline != next_._inline or not (node._inline or next_._inline):
+        minify = is_minifying()
+        prev: Node | None = None
+        for node in nodes:
+            if prev is not None and not minify:
+                if prev._inline != node._inline or not (prev._inline or node._inline):
                     f.write("\n")
+            node.write(f)
+            prev = node
 
 
+@runtime_checkable
 class HasNodes(Protocol):
     def get_nodes(self) -> Iterable[Node]: ...  # pragma: no cover
 
 
-def iter_nodes(objects: Iterable[Node | HasNodes | str]) -> Iterator[Node]:
+@runtime_checkable
+class HasHTML(Protocol):
+    def __html__(self) -> str: ...  # pragma: no cover
+
+
+Content: TypeAlias = (
+    "Node | HasNodes | HasHTML | str | Iterator[Node | HasNodes | HasHTML | str]"
+)
+
+
+def iter_nodes(objects: Iterable[Content]) -> Iterator[Node]:
     for obj in objects:
         match obj:
-            case str(s):
-                yield Text(s)
+            case str() if type(obj) is str:
+                yield Text(obj)
             case Node():
                 yield obj
-            case _:
+            case Iterator():
+                yield LazyNodes(obj)
+            case HasNodes():
                 for node in obj.get_nodes():
                     yield node
+            # Objects that are already escaped, such as markupsafe.Markup
+            case HasHTML():
+                yield Text(obj.__html__(), escape=False)
+            case str():
+                yield Text(obj)
+            case _:
+                raise TypeError(f"Invalid content: {obj!r}")
+
+
+_escape_function: Callable[[str], str] | None = None
+
+
+def set_escape_function(fn: Callable[[str], str] | None) -> None:
+    """
+    Replace the function used to escape text and attribute values.
+
+    The function must replace at least the characters ``&``, ``<``, ``>`` and
+    ``"`` with character references. For example, to use the escape function
+    of `markupsafe <https://markupsafe.palletsprojects.com/>`_, which is
+    implemented in C::
+
+        import markupsafe
+        set_escape_function(markupsafe.escape)
+
+    This changes the output of all nodes rendered afterwards, and text that is
+    escaped in advance (such as the cells of :func:`table_from_rows`) created
+    afterwards. Call this once at startup.
+
+    Args:
+        fn: The escape function, or ``None`` to go back to the default
+          (:func:`html.escape`).
+    """
+    global _escape_function
+    _escape_function = fn
+
+
+@contextmanager
+def escaping(fn: Callable[[str], str] | None) -> Generator[None, None, None]:
+    # Use a different escape function temporarily, in a worker process that
+    # renders part of a document (see RenderContext.fork()).
+    global _escape_function
+    if fn is _escape_function:
+        yield
+        return
+    previous, _escape_function = _escape_function, fn
+    try:
+        yield
+    finally:
+        _escape_function = previous
+
+
+def escape_text(s: str) -> str:
+    return escape(s, quote=False) if _escape_function is None else _escape_function(s)
 
 
 class Text(Node):
@@ -80,10 +335,17 @@ class Text(Node):
 
     def write(self, f: TextIO, indent: int = 0) -> None:
         if self._escape:
-            f.write(escape(self._text, quote=False))
+            f.write(
+                escape(self._text, quote=False)
+                if _escape_function is None
+                else _escape_function(self._text)
+            )
         else:
             f.write(self._text)
 
+    def _iter_events(self, ids_seen: set[int]) -> Iterator[Event]:
+        yield TextEvent(self._text, safe=not self._escape)
+
 
 def text(s: str) -> Text:
     """
@@ -109,13 +371,188 @@ def safe(s: str) -> Text:
     return node
 
 
+# Attribute names for keyword argument names that have already been validated.
+# The number of entries is limited, in case names are generated dynamically.
+_attribute_names: dict[str, str] = {}
+_MAX_ATTRIBUTE_NAMES = 1024
+
+
+def _attribute_name(name: str) -> str:
+    attr = _attribute_names.get(name)
+    if attr is None:
+        attr = name if name == "_" else name.rstrip("_").replace("_", "-")
+        if not ATTRIBUTE_NAME_RE.fullmatch(attr):
+            raise ValueError(f"Invalid attribute name: {attr!r}")
+        if len(_attribute_names) < _MAX_ATTRIBUTE_NAMES:
+            _attribute_names[name] = attr
+    return attr
+
+
+def set_attributes(
+    attrs: dict[str, str],
+    bools: dict[str, Literal[True]],
+    values: Mapping[str, str | bool],
+) -> None:
+    names = _attribute_names
+    for name, value in values.items():
+        name = names.get(name) or _attribute_name(name)
+        if value is True:
+            bools[name] = True
+        elif value is not False:
+            attrs[name] = value
+
+
+def format_attributes(
+    attrs: dict[str, str], bools: dict[str, Literal[True]], *, minify: bool = False
+) -> str:
+    if not (attrs or bools):
+        return ""
+    if minify:
+        return f" {_format_attrs_minified(attrs, bools)}"
+    return f" {_format_attrs(attrs, bools)}"
+
+
+@dataclass(frozen=True, slots=True)
+class SerializedPreset:
+    """
+    The attributes of a preset, serialized with one escape function.
+    """
+
+    pretty: str
+    minified: str
+    # The parts of pretty and minified (without the leading space), to
+    # combine with additional attributes of an element.
+    pretty_attrs: str
+    minified_attrs: str
+
+
+@dataclass(frozen=True, slots=True)
+class AttributePreset:
+    """
+    Validated attributes shared by all elements created from a prototype
+    preset, with their serialized forms.
+    """
+
+    attrs: dict[str, str]
+    bools: dict[str, Literal[True]]
+    bool_attrs: str
+    # Serialized lazily for each escape function the preset is rendered with,
+    # so that presets created before set_escape_function() is called stay fast.
+    serialized: dict[Callable[[str], str] | None, SerializedPreset] = field(
+        default_factory=dict[Callable[[str], str] | None, SerializedPreset]
+    )
+
+    @classmethod
+    def create(
+        cls, base: "AttributePreset | None", values: Mapping[str, str | bool]
+    ) -> "AttributePreset":
+        attrs = dict(base.attrs) if base is not None else {}
+        bools = dict(base.bools) if base is not None else {}
+        set_attributes(attrs, bools, values)
+        return cls(attrs=attrs, bools=bools, bool_attrs=" ".join(bools))
+
+    def serialize(self) -> SerializedPreset:
+        # Return the serialized attributes for the current escape function.
+        serialized = self.serialized.get(_escape_function)
+        if serialized is None:
+            attrs, bools = self.attrs, self.bools
+            serialized = SerializedPreset(
+                pretty=format_attributes(attrs, bools),
+                minified=format_attributes(attrs, bools, minify=True),
+                pretty_attrs=_format_attrs(attrs, {}),
+                minified_attrs=_format_attrs_minified(attrs, {}),
+            )
+            self.serialized[_escape_function] = serialized
+        return serialized
+
+    def overridden_by(self, names: Iterable[str]) -> bool:
+        # Whether setting any of the attributes (given as keyword argument
+        # names) would change one of the preset attributes.
+        for name in names:
+            name = _attribute_names.get(name) or _attribute_name(name)
+            if name in self.attrs or name in self.bools:
+                return True
+        return False
+
+    def format_with(
+        self, attrs: dict[str, str], bools: dict[str, Literal[True]], minify: bool
+    ) -> str:
+        # Format the attributes of an element that has the preset attributes,
+        # followed by additional ones. Only the additional ones are escaped.
+        fn = _escape_function or escape
+        serialized = self.serialize()
+        parts: list[str] = []
+        if preset_attrs := (
+            serialized.minified_attrs if minify else serialized.pretty_attrs
+        ):
+            parts.append(preset_attrs)
+        extra = islice(attrs.items(), len(self.attrs), None)
+        if minify:
+            for k, v in extra:
+                v = fn(v)
+                parts.append(
+                    f"{k}={v}" if UNQUOTED_VALUE_RE.fullmatch(v) else f'{k}="{v}"'
+                )
+        else:
+            parts += [f'{k}="{fn(v)}"' for k, v in extra]
+        if self.bool_attrs:
+            parts.append(self.bool_attrs)
+        if len(bools) > len(self.bools):
+            parts += islice(bools, len(self.bools), None)
+        return " " + " ".join(parts)
+
+
+def filter_attributes(
+    fn: "AttributeFilter", attrs: dict[str, str], bools: dict[str, Literal[True]]
+) -> tuple[dict[str, str], dict[str, Literal[True]]]:
+    # Apply an attribute filter to a copy of the attributes.
+    values: dict[str, str | None] = {**attrs, **dict.fromkeys(bools)}
+    fn(values)
+    new_attrs: dict[str, str] = {}
+    new_bools: dict[str, Literal[True]] = {}
+    for name, value in values.items():
+        if not ATTRIBUTE_NAME_RE.fullmatch(name):
+            raise ValueError(f"Invalid attribute name: {name!r}")
+        if value is None:
+            new_bools[name] = True
+        else:
+            new_attrs[name] = value
+    return new_attrs, new_bools
+
+
 def _format_attrs(attrs: dict[str, str], bools: dict[str, Literal[True]]) -> str:
+    fn = _escape_function or escape
+    return " ".join([f'{k}="{fn(v)}"' for k, v in attrs.items()] + [k for k in bools])
+
+
+def _format_attrs_minified(
+    attrs: dict[str, str], bools: dict[str, Literal[True]]
+) -> str:
+    fn = _escape_function or escape
+    values = [fn(v) for v in attrs.values()]
     return " ".join(
-        [f'{k}="{escape(v, quote=True)}"' for k, v in attrs.items()]
+        [
+            f"{k}={v}" if UNQUOTED_VALUE_RE.fullmatch(v) else f'{k}="{v}"'
+            for k, v in zip(attrs, values)
+        ]
         + [k for k in bools]
     )
 
 
+@lru_cache(maxsize=1024)
+def _parse_class_selector(key: str) -> tuple[str | None, tuple[str, ...]]:
+    # Split the key of Element.__getitem__ into the id (if any) and the class
+    # names, without duplicates.
+    id_: str | None = None
+    class_names: dict[str, None] = {}
+    for name in key.split():
+        if name[0] == "#":
+            id_ = name[1:]
+        else:
+            class_names[name] = None
+    return id_, tuple(class_names)
+
+
 class Element(Node):
     """
     Base class for elements.
@@ -124,80 +561,320 @@ class Element(Node):
     _tag: str
     _attrs: dict[str, str]
     _bools: dict[str, Literal[True]]
+    _index: ElementIndex | None = None
+    _indexes: "weakref.WeakSet[ElementIndex] | None" = None
+    # Class names added with [...], as an ordered set. If set, the value of
+    # _attrs["class"] is out of date until _current_attrs() is called.
+    _classes: dict[str, None] | None = None
+    # The preset the attributes are shared with, until they are changed.
+    _preset: AttributePreset | None = None
+
+    def __call__(self, **attrs: str | bool) -> Self:
+        if self._indexes is not None:
+            self._changed()
+        if self._classes is not None:
+            self._current_attrs()
+        if attrs:
+            if self._preset is not None:
+                self._own_attributes(attrs)
+            set_attributes(self._attrs, self._bools, attrs)
+
+        return self
 
     def __getitem__(self, key: str) -> Self:
-        class_names: list[str] = []
-        for name in key.split():
-            if name[0] == "#":
-                self._attrs["id"] = name[1:]
-            else:
-                class_names.append(name)
-        if class_names:
-            old_names = self._attrs.get("class", "").split()
-            self._attrs["class"] = " ".join(old_names + class_names)
+        if self._indexes is not None:
+            self._changed()
+        id_, class_names = _parse_class_selector(key)
+        if self._preset is not None:
+            self._own_attributes(
+                (["id"] if id_ is not None else []) + (["class"] if class_names else [])
+            )
+        if id_ is not None:
+            self._attrs["id"] = id_
+        if not class_names:
+            return self
+        classes = self._classes
+        if classes is None:
+            if "class" not in self._attrs:
+                self._attrs["class"] = " ".join(class_names)
+                return self
+            # The value of _attrs["class"] is kept as a placeholder, so that
+            # the attribute stays in its position.
+            classes = self._classes = dict.fromkeys(self._attrs["class"].split())
+        for name in class_names:
+            classes[name] = None
         return self
 
+    def _init_attributes(
+        self, attrs: Mapping[str, str | bool], preset: AttributePreset | None
+    ) -> None:
+        if preset is None:
+            self._attrs = {}
+            self._bools = {}
+        elif not attrs:
+            self._attrs, self._bools, self._preset = preset.attrs, preset.bools, preset
+            return
+        else:
+            self._attrs, self._bools = dict(preset.attrs), dict(preset.bools)
+            if not preset.overridden_by(attrs):
+                self._preset = preset
+        set_attributes(self._attrs, self._bools, attrs)
+
+    def _own_attributes(self, names: Iterable[str]) -> None:
+        # Copy the attributes shared with the preset before changing them. The
+        # preset is kept as long as its attributes are unchanged, and only
+        # the attributes added to them have to be formatted when rendering.
+        preset = self._preset
+        assert preset is not None
+        if self._attrs is preset.attrs:
+            self._attrs = dict(self._attrs)
+            self._bools = dict(self._bools)
+        if preset.overridden_by(names):
+            self._preset = None
+
+    def _current_attrs(self) -> dict[str, str]:
+        classes = self._classes
+        if classes is not None:
+            self._attrs["class"] = " ".join(classes)
+            self._classes = None
+        return self._attrs
+
     def __repr__(self) -> str:
         return f"<{type(self).__name__} {self._tag}>"
 
+    @property
+    def tag(self) -> str:
+        """
+        The tag name.
+        """
+        return self._tag
+
+    @property
+    def attributes(self) -> dict[str, str | None]:
+        """
+        A copy of the element's attributes. The value of boolean attributes is
+        ``None``.
+        """
+        return {**self._current_attrs(), **dict.fromkeys(self._bools)}
+
+    def copy(self) -> Self:
+        """
+        Return a shallow copy of the element, with its own attributes and list
+        of children.
+        """
+        new = copy.copy(self)
+        new._attrs = dict(self._current_attrs())
+        new._bools = dict(self._bools)
+        new._index = new._indexes = new._preset = None
+        return new
+
+    def __getstate__(self) -> dict[str, Any]:
+        # Indexes hold weak references and are rebuilt on demand, so they are
+        # not pickled (for example, when rendering in worker processes).
+        state = self.__dict__.copy()
+        state.pop("_index", None)
+        state.pop("_indexes", None)
+        return state
+
+    def select(self, selector: str) -> list["Element"]:
+        """
+        Find all elements in the tree that match a CSS selector.
+
+        The element itself and all elements it contains are searched, and the
+        matches are returned in document order. Supported selectors are
+        combinations of tag names, ``*``, ``#id`` and ``.class``, descendant
+        and child (``>``) combinators, and comma-separated lists of
+        selectors.
+
+        The first call builds an index of the tree, which is reused by later
+        calls until one of the elements in the tree is modified.
+
+        Args:
+            selector: The CSS selector to match.
+        """
+        return self._get_index().select(parse_selector_list(selector))
+
+    def select_one(self, selector: str) -> "Element | None":
+        """
+        Find the first element in the tree that matches a CSS selector, or
+        ``None`` if there is no match. See :meth:`select`.
+
+        Args:
+            selector: The CSS selector to match.
+        """
+        found = self.select(selector)
+        return found[0] if found else None
+
+    def _get_index(self) -> ElementIndex:
+        index = self._index
+        if index is None or not index.valid:
+            index = ElementIndex()
+            self._add_to_index(index, None, set())
+            self._index = index
+        return index
+
+    def _add_to_index(
+        self, index: ElementIndex, parent: "Element | None", ids_seen: set[int]
+    ) -> None:
+        if self not in index:
+            index.add(self, self._tag, self._current_attrs(), parent)
+            self._watch(index)
+
+    def _watch(self, index: ElementIndex) -> None:
+        if self._indexes is None:
+            self._indexes = weakref.WeakSet()
+        self._indexes.add(index)
+
+    def _transform(self, transforms: tuple["Transform", ...], active: set[int]) -> Node:
+        if id(self) in active:
+            return self
+        node = apply_transforms(self, transforms)
+        ids = {id(self), id(node)} - active
+        active |= ids
+        try:
+            node._transform_content(transforms, active)
+        finally:
+            active -= ids
+        return node
+
+    def _format_attributes(self, ctx: "RenderContext | None", minify: bool) -> str:
+        preset = self._preset
+        if preset is not None and (
+            ctx is None or self._tag not in ctx.attribute_filters
+        ):
+            attrs = self._attrs if self._classes is None else self._current_attrs()
+            if attrs is preset.attrs:
+                serialized = preset.serialize()
+                return serialized.minified if minify else serialized.pretty
+            return preset.format_with(attrs, self._bools, minify)
+        attrs = self._attrs if self._classes is None else self._current_attrs()
+        bools = self._bools
+        if ctx is not None and ctx.attribute_filters:
+            fn = ctx.attribute_filters.get(self._tag)
+            if fn is not None:
+                attrs, bools = filter_attributes(fn, attrs, bools)
+        return format_attributes(attrs, bools, minify=minify)
+
+    def _write_transformed(
+        self, ctx: "RenderContext", write: Callable[[Node], None]
+    ) -> bool:
+        # Apply the transforms of the render context. If the element is
+        # replaced, write the replacement with `write` and return True.
+        if id(self) in ctx.transformed:
+            return False
+        node = apply_transforms(self, ctx.transforms)
+        if node is self:
+            return False
+        ids = {id(self), id(node)} - ctx.transformed
+        ctx.transformed |= ids
+        try:
+            write(node)
+        finally:
+            ctx.transformed -= ids
+        return True
+
+    def _changed(self) -> None:
+        # Invalidate the indexes of all trees that contain this element.
+        if self._indexes is not None:
+            for index in self._indexes:
+                index.invalidate()
+            self._indexes = None
+
+    def _find(
+        self, selector: Selector, pending: list["DeferredNode"]
+    ) -> "Element | None":
+        return self if selector.matches(self._tag, self._current_attrs()) else None
+
+    def _iter_attribute_events(self) -> Iterator[Event]:
+        for name, value in self._current_attrs().items():
+            yield AttributeEvent(name, value)
+        for name in self._bools:
+            yield AttributeEvent(name, None)
+
 
 class ElementEmpty(Element):
     """
     An empty element.
     """
 
-    def __init__(self, tag: str, *, inline: bool = False, omit_end_tag: bool):
+    def __init__(
+        self,
+        tag: str,
+        *,
+        inline: bool = False,
+        omit_end_tag: bool,
+        attrs: Mapping[str, str | bool] = {},
+        preset: AttributePreset | None = None,
+    ):
         self._tag = tag
         self._inline = inline
         self._omit_end_tag = omit_end_tag
-        self._attrs: dict[str, str] = {}
-        self._bools: dict[str, Literal[True]] = {}
-
-    def __call__(self, **attrs: str | bool) -> Self:
-        for name, value in attrs.items():
-            name = name if name == "_" else name.rstrip("_").replace("_", "-")
-            if not ATTRIBUTE_NAME_RE.fullmatch(name):
-                raise ValueError(f"Invalid attribute name: {name!r}")
-            if value is True:
-                self._bools[name] = True
-            elif value is not False:
-                self._attrs[name] = value
-
-        return self
+        self._init_attributes(attrs, preset)
 
     def write(self, f: TextIO, indent: int = 0) -> None:
-        attrs = (
-            f" {_format_attrs(self._attrs, self._bools)}"
-            if self._attrs or self._bools
-            else ""
-        )
+        ctx = _rendering_context.get(None)
+        if (
+            ctx is not None
+            and ctx.transforms
+            and self._write_transformed(ctx, lambda node: node.write(f, indent))
+        ):
+            return
+        attrs = self._format_attributes(ctx, minify=ctx is not None and ctx.minify)
         if self._omit_end_tag:
             f.write(f"<{self._tag}{attrs}>")
         else:
             f.write(f"<{self._tag}{attrs}></{self._tag}>")
 
+    def _iter_events(self, ids_seen: set[int]) -> Iterator[Event]:
+        yield StartEvent(self._tag)
+        yield from self._iter_attribute_events()
+        yield EndEvent(self._tag)
+
 
 class ElementNonEmpty(Element):
     """
     An element that can have content.
     """
 
-    def __init__(self, tag: str, *, inline: bool = False):
+    def __init__(
+        self,
+        tag: str,
+        *,
+        inline: bool = False,
+        omit_end_tag_before: Collection[str] = (),
+        omit_end_tag_last: bool = False,
+        content: Iterable[Content] = (),
+        attrs: Mapping[str, str | bool] = {},
+        preset: AttributePreset | None = None,
+    ):
         self._tag = tag
-        self._attrs: dict[str, str] = {}
-        self._bools: dict[str, Literal[True]] = {}
-        self._children: list[Node] = []
+        self._init_attributes(attrs, preset)
+        self._children: list[Node] = list(iter_nodes(content))
         self._inline = inline
-
-    def __call__(self, *content: Node | HasNodes | str, **attrs: str | bool) -> Self:
-        for name, value in attrs.items():
-            name = name if name == "_" else name.rstrip("_").replace("_", "-")
-            if not ATTRIBUTE_NAME_RE.fullmatch(name):
-                raise ValueError(f"Invalid attribute name: {name!r}")
-            if value is True:
-                self._bools[name] = True
-            elif value is not False:
-                self._attrs[name] = value
+        self._omit_end_tag_before = omit_end_tag_before
+        self._omit_end_tag_last = omit_end_tag_last
+
+    @property
+    def children(self) -> tuple[Node, ...]:
+        """
+        The child nodes of the element.
+        """
+        return tuple(self._children)
+
+    def copy(self) -> Self:
+        new = super().copy()
+        new._children = list(self._children)
+        return new
+
+    def __call__(self, *content: Content, **attrs: str | bool) -> Self:
+        if self._indexes is not None:
+            self._changed()
+        if self._classes is not None:
+            self._current_attrs()
+        if attrs:
+            if self._preset is not None:
+                self._own_attributes(attrs)
+            set_attributes(self._attrs, self._bools, attrs)
 
         for obj in content:
             if not isinstance(obj, str):
@@ -216,38 +893,317 @@ class ElementNonEmpty(Element):
         parent(*content)
 
     def write(self, f: TextIO, indent: int = 0) -> None:
-        ids_seen = _rendering_context.get(None)
-        if ids_seen is not None:
+        ctx = _rendering_context.get(None)
+        token = None
+        release = False
+        keep = False
+        if ctx is not None:
+            if ctx.transforms and self._write_transformed(
+                ctx, lambda node: node.write(f, indent)
+            ):
+                return
+            if ctx.minify:
+                self._write_minified(f, ctx, omit_end_tag=False)
+                return
+            ids_seen = ctx.ids_seen
             if id(self) in ids_seen:
                 raise CircularReferenceError
             ids_seen.add(id(self))
+            release = ctx.release
+            if release and id(self) in ctx.shared:
+                # Keep elements that appear more than once, and their content.
+                ctx.release = release = False
+                keep = True
         else:
+            # Reset the context variable when the outermost element is done, so
+            # that threads which inherit the current context (the default on
+            # free-threaded builds) do not end up sharing the same set.
             ids_seen = {id(self)}
-            _rendering_context.set(ids_seen)
+            token = _rendering_context.set(RenderContext(ids_seen))
 
         try:
-            inline_mode = self._inline or all([c._inline for c in self._children])
-            first_child_is_block = self._children and not self._children[0]._inline
+            children = self._children
+            inline_mode = self._inline or all([c._inline for c in children])
+            first_child_is_block = children and not children[0]._inline
             indent_next_child = not inline_mode or first_child_is_block
+            has_children = bool(children)
+            if release:
+                self._changed()
+                self._children = []
 
-            attrs = (
-                f" {_format_attrs(self._attrs, self._bools)}"
-                if self._attrs or self._bools
-                else ""
-            )
+            attrs = self._format_attributes(ctx, minify=False)
             f.write(f"<{self._tag}{attrs}>")
-            for node in self._children:
+            for node in drain(children) if release else children:
                 if indent_next_child or not node._inline:
                     f.write(f"\n{'  ' * (indent + 1)}")
                 node.write(f, indent + 1)
                 indent_next_child = not node._inline
 
-            if self._children and (indent_next_child or not inline_mode):
+            if has_children and (indent_next_child or not inline_mode):
                 f.write(f"\n{'  ' * indent}")
 
             f.write(f"</{self._tag}>")
         finally:
             ids_seen.remove(id(self))
+            if keep:
+                assert ctx is not None
+                ctx.release = True
+            if token is not None:
+                _rendering_context.reset(token)
+
+    def _find(
+        self, selector: Selector, pending: list["DeferredNode"]
+    ) -> Element | None:
+        if selector.matches(self._tag, self._current_attrs()):
+            return self
+        for node in self._children:
+            if (found := node._find(selector, pending)) is not None:
+                return found
+        return None
+
+    def _resolve_deferred(self) -> None:
+        self._changed()
+        self._children = Node.resolve_deferred(self._children)
+
+    def _transform_content(
+        self, transforms: tuple["Transform", ...], active: set[int]
+    ) -> None:
+        self._changed()
+        self._children = [
+            node._transform(transforms, active) for node in self._children
+        ]
+
+    def _add_to_index(
+        self, index: ElementIndex, parent: Element | None, ids_seen: set[int]
+    ) -> None:
+        if id(self) in ids_seen:
+            raise CircularReferenceError
+        if self in index:
+            return
+        ids_seen.add(id(self))
+        index.add(self, self._tag, self._current_attrs(), parent)
+        self._watch(index)
+        for node in self._children:
+            node._add_to_index(index, self, ids_seen)
+        ids_seen.remove(id(self))
+
+    def _find_shared(self, seen: set[int], shared: set[int]) -> None:
+        if id(self) in seen:
+            shared.add(id(self))
+            return
+        seen.add(id(self))
+        for node in self._children:
+            node._find_shared(seen, shared)
+
+    def _compact(self, ids_seen: set[int], prev: Node | None) -> Node:
+        if id(self) in ids_seen:
+            raise CircularReferenceError
+        ids_seen.add(id(self))
+        self._changed()
+        try:
+            self._children = Node.compact_list(self._children, ids_seen)
+        finally:
+            ids_seen.remove(id(self))
+
+        if (
+            self._inline
+            and not (self._attrs or self._bools)
+            and not (self._omit_end_tag_before or self._omit_end_tag_last)
+            and all(isinstance(node, Text) for node in self._children)
+            # The end tag of the previous sibling could depend on this tag.
+            and not (
+                isinstance(prev, ElementNonEmpty)
+                and self._tag in prev._omit_end_tag_before
+            )
+        ):
+            return Text(str(self), escape=False)
+        return self
+
+    def _iter_events(self, ids_seen: set[int]) -> Iterator[Event]:
+        if id(self) in ids_seen:
+            raise CircularReferenceError
+        ids_seen.add(id(self))
+        yield StartEvent(self._tag)
+        yield from self._iter_attribute_events()
+        for node in self._children:
+            yield from node._iter_events(ids_seen)
+        yield EndEvent(self._tag)
+        ids_seen.remove(id(self))
+
+    def _write_minified(
+        self, f: TextIO, ctx: "RenderContext", omit_end_tag: bool
+    ) -> None:
+        ids_seen = ctx.ids_seen
+        if id(self) in ids_seen:
+            raise CircularReferenceError
+        ids_seen.add(id(self))
+        keep = ctx.release and id(self) in ctx.shared
+        if keep:
+            ctx.release = False
+
+        try:
+            attrs = self._format_attributes(ctx, minify=True)
+            f.write(f"<{self._tag}{attrs}>")
+            children = self._children
+            if ctx.release:
+                self._changed()
+                self._children = []
+                children.reverse()
+                while children:
+                    node = children.pop()
+                    next_ = children[-1] if children else None
+                    self._write_minified_child(f, ctx, node, next_)
+            else:
+                last = len(children) - 1
+                for i, node in enumerate(children):
+                    next_ = children[i + 1] if i < last else None
+                    self._write_minified_child(f, ctx, node, next_)
+            if not omit_end_tag:
+                f.write(f"</{self._tag}>")
+        finally:
+            ids_seen.remove(id(self))
+            if keep:
+                ctx.release = True
+
+    def _write_minified_child(
+        self, f: TextIO, ctx: "RenderContext", node: Node, next_: Node | None
+    ) -> None:
+        if (
+            ctx.transforms
+            and isinstance(node, Element)
+            and node._write_transformed(
+                ctx, lambda new: self._write_minified_child(f, ctx, new, next_)
+            )
+        ):
+            return
+        if isinstance(node, LazyNodes):
+            # Look ahead by one node, so that end tags can be omitted.
+            nodes = node.resolve()
+            current = next(nodes, None)
+            while current is not None:
+                following = next(nodes, None)
+                self._write_minified_child(
+                    f, ctx, current, next_ if following is None else following
+                )
+                current = following
+        elif isinstance(node, ElementNonEmpty):
+            # Transforms can change the tag of the next element, so end tags
+            # are only omitted without them.
+            omit_end_tag = not ctx.transforms and node._can_omit_end_tag(self, next_)
+            node._write_minified(f, ctx, omit_end_tag)
+        else:
+            node.write(f)
+
+    def _can_omit_end_tag(self, parent: "ElementNonEmpty", next_: Node | None) -> bool:
+        if next_ is None:
+            return (
+                self._omit_end_tag_last
+                and parent._tag not in TRANSPARENT_TAGS
+                and "-" not in parent._tag
+            )
+        return isinstance(next_, Element) and next_._tag in self._omit_end_tag_before
+
+
+class LazyNodes(Node):
+    """
+    Content produced by an iterator, which is only consumed when the
+    surrounding element is rendered.
+
+    For layout purposes, the content is treated as a block, and each node
+    produced by the iterator is placed on its own line.
+    """
+
+    def __init__(self, nodes: Iterator[Node | HasNodes | HasHTML | str]):
+        self._nodes = nodes
+        self._consumed = False
+        self._inline = False
+
+    def resolve(self) -> Iterator[Node]:
+        if self._consumed:
+            raise RuntimeError("Content from an iterator can only be rendered once")
+        self._consumed = True
+        nodes = iter_nodes(self._nodes)
+        while True:
+            # Ensure elements created by the iterator are not registered with
+            # the currently active context.
+            push_element_context(ElementNonEmpty("__capture__"))
+            try:
+                node = next(nodes, None)
+            finally:
+                pop_element_context()
+            if node is None:
+                return
+            yield node
+
+    def write(self, f: TextIO, indent: int = 0) -> None:
+        minify = is_minifying()
+        for i, node in enumerate(self.resolve()):
+            if i > 0 and not minify:
+                f.write(f"\n{'  ' * indent}")
+            node.write(f, indent)
+
+    def _iter_events(self, ids_seen: set[int]) -> Iterator[Event]:
+        for node in self.resolve():
+            yield from node._iter_events(ids_seen)
+
+
+class DeferredNode(Node):
+    """
+    Placeholder for the nodes of a component that have not been created yet.
+    """
+
+    def __init__(
+        self,
+        expand: Callable[[], Iterable[Node]],
+        slot_content: Callable[[], Iterable[Node | HasNodes]],
+    ):
+        self._expand = expand
+        self._slot_content = slot_content
+        self._inline = False
+
+    def expand(self) -> Iterable[Node]:
+        return self._expand()
+
+    def slot_content(self) -> Iterable[Node | HasNodes]:
+        return self._slot_content()
+
+    def write(self, f: TextIO, indent: int = 0) -> None:
+        nodes = Node.resolve_deferred(self.expand())
+        minify = is_minifying()
+        for i, node in enumerate(nodes):
+            if i > 0 and not minify:
+                f.write(f"\n{'  ' * indent}")
+            node.write(f, indent)
+
+    def _find(
+        self, selector: Selector, pending: list["DeferredNode"]
+    ) -> Element | None:
+        pending.append(self)
+        return None
+
+    def _iter_events(self, ids_seen: set[int]) -> Iterator[Event]:
+        for node in Node.resolve_deferred(self.expand()):
+            yield from node._iter_events(ids_seen)
+
+
+_deferring = ContextVar[bool]("deferring", default=False)
+
+
+@contextmanager
+def deferring(enabled: bool = True) -> Generator[None, None, None]:
+    """
+    Context manager to defer the expansion of components into placeholder
+    nodes, see DeferredNode.
+    """
+    token = _deferring.set(enabled)
+    try:
+        yield
+    finally:
+        _deferring.reset(token)
+
+
+def is_deferring() -> bool:
+    return _deferring.get()
 
 
 @dataclass(slots=True)
@@ -258,7 +1214,79 @@ class ElementContext:
 
 
 _context_stack = ContextVar[list[ElementContext]]("context_stack")
-_rendering_context = ContextVar[set[int]]("rendering_context")
+
+
+Transform: TypeAlias = Callable[[Element], Node | None]
+AttributeFilter: TypeAlias = Callable[[dict[str, str | None]], None]
+
+
+def apply_transforms(elem: Element, transforms: Iterable[Transform]) -> Node:
+    node: Node = elem
+    for fn in transforms:
+        if not isinstance(node, Element):
+            break
+        if (replacement := fn(node)) is not None:
+            node = replacement
+    return node
+
+
+@dataclass(slots=True)
+class RenderContext:
+    ids_seen: set[int] = field(default_factory=set[int])
+    minify: bool = False
+    release: bool = False
+    # Elements that are not released, see Node.find_shared().
+    shared: set[int] = field(default_factory=set[int])
+    transforms: tuple[Transform, ...] = ()
+    transformed: set[int] = field(default_factory=set[int])
+    attribute_filters: Mapping[str, AttributeFilter] = field(
+        default_factory=dict[str, AttributeFilter]
+    )
+    # The escape function of the thread that forked this context.
+    escape_function: Callable[[str], str] | None = None
+
+    def fork(self) -> "RenderContext":
+        """
+        Return a copy of the rendering options, for rendering in another
+        thread or process.
+        """
+        return RenderContext(
+            minify=self.minify,
+            release=self.release,
+            shared=self.shared,
+            transforms=self.transforms,
+            attribute_filters=self.attribute_filters,
+            escape_function=_escape_function,
+        )
+
+
+def drain(nodes: list[Node]) -> Iterator[Node]:
+    # Iterate over nodes, removing each one from the list before it is
+    # returned, so that it can be freed as soon as the caller is done with it.
+    nodes.reverse()
+    while nodes:
+        yield nodes.pop()
+
+
+_rendering_context = ContextVar[RenderContext]("rendering_context")
+
+
+@contextmanager
+def rendering(ctx: RenderContext) -> Generator[None, None, None]:
+    token = _rendering_context.set(ctx)
+    try:
+        yield
+    finally:
+        _rendering_context.reset(token)
+
+
+def current_render_context() -> RenderContext:
+    return _rendering_context.get(None) or RenderContext()
+
+
+def is_minifying() -> bool:
+    ctx = _rendering_context.get(None)
+    return ctx is not None and ctx.minify
 
 
 def push_element_context(parent: ElementNonEmpty) -> None:
@@ -284,7 +1312,9 @@ def register_with_context(obj: Node | HasNodes) -> None:
             ctx.collected_content.append(obj)
 
 
-def deregister_from_context(obj: Node | HasNodes) -> None:
+def deregister_from_context(obj: Content) -> None:
+    if not isinstance(obj, Node | HasNodes):
+        return
     if stack := _context_stack.get(None):
         ctx = stack[-1]
         ctx.registered_content.discard(obj)
@@ -297,8 +1327,8 @@ class Fragment:
     Use the :func:`fragment` function to create fragments.
     """
 
-    def __init__(self, *content: Node | HasNodes | str):
-        self._content = list(content)
+    def __init__(self, *content: Content):
+        self._content: list[Content] = list(content)
         for obj in content:
             if not isinstance(obj, str):
                 deregister_from_context(obj)
@@ -306,6 +1336,26 @@ class Fragment:
     def get_nodes(self) -> Iterable[Node]:
         return iter_nodes(self._content)
 
+    def compact(self) -> Self:
+        """
+        Simplify the fragment contents in place, without changing the output
+        (see :meth:`Node.compact` for what pre-rendering leaves out).
+
+        Nested fragments and components are replaced by their contents.
+        """
+        self._content = list(Node.compact_list(iter_nodes(self._content)))
+        return self
+
+    def transform(self, *transforms: Transform) -> Self:
+        """
+        Apply transforms to every element in the fragment, in place (see
+        :meth:`Node.transform`).
+
+        Nested fragments and components are replaced by their contents.
+        """
+        self._content = [node.transform(*transforms) for node in self.get_nodes()]
+        return self
+
     def __enter__(self) -> Self:
         self._capture = ElementNonEmpty("__capture__")
         push_element_context(self._capture)
@@ -321,8 +1371,11 @@ class Fragment:
         Node.render_list(buf, self.get_nodes())
         return buf.getvalue()
 
+    def __html__(self) -> str:
+        return str(self)
+
 
-def fragment(*content: Node | HasNodes | str) -> Fragment:
+def fragment(*content: Content) -> Fragment:
     """
     Create a fragment.
 
@@ -342,6 +1395,25 @@ class Prototype:
     """
 
     _tag: str
+    _preset: AttributePreset | None = None
+
+    def preset(self, **attrs: str | bool) -> Self:
+        """
+        Create a prototype that sets the given attributes on every element it
+        creates.
+
+        The attributes are validated and serialized once, and shared by the
+        elements until one of them is changed. Attributes passed when
+        creating an element are added to (or override) the preset
+        attributes, and only added attributes are serialized when the element
+        is rendered. A preset can itself be used to create another preset.
+
+        Args:
+            attrs: The attributes to set.
+        """
+        new = copy.copy(self)
+        new._preset = AttributePreset.create(self._preset, attrs)
+        return new
 
     def _get_repr(self, **flags: bool) -> str:
         flag_names = [k for k, v in flags.items() if v]
@@ -363,14 +1435,33 @@ class PrototypeEmpty(Prototype):
 
     def __call__(self, **attrs: str | bool) -> ElementEmpty:
         elem = ElementEmpty(
-            self._tag, inline=self._inline, omit_end_tag=self._omit_end_tag
-        )(**attrs)
+            self._tag,
+            inline=self._inline,
+            omit_end_tag=self._omit_end_tag,
+            attrs=attrs,
+            preset=self._preset,
+        )
         register_with_context(elem)
         return elem
 
+    def build(self, **attrs: str | bool) -> ElementEmpty:
+        """
+        Create an element without adding it to the current element context.
+        """
+        return ElementEmpty(
+            self._tag,
+            inline=self._inline,
+            omit_end_tag=self._omit_end_tag,
+            attrs=attrs,
+            preset=self._preset,
+        )
+
     def __getitem__(self, key: str) -> ElementEmpty:
         elem = ElementEmpty(
-            self._tag, inline=self._inline, omit_end_tag=self._omit_end_tag
+            self._tag,
+            inline=self._inline,
+            omit_end_tag=self._omit_end_tag,
+            preset=self._preset,
         )[key]
         register_with_context(elem)
         return elem
@@ -386,24 +1477,58 @@ class PrototypeNonEmpty(Prototype):
     Use the :func:`make_prototype` function to create new prototypes.
     """
 
-    def __init__(self, tag: str, *, inline: bool):
+    def __init__(
+        self,
+        tag: str,
+        *,
+        inline: bool,
+        omit_end_tag_before: Iterable[str] = (),
+        omit_end_tag_last: bool = False,
+    ):
         self._tag = tag
         self._inline = inline
+        self._omit_end_tag_before = frozenset(omit_end_tag_before)
+        self._omit_end_tag_last = omit_end_tag_last
+
+    def _new_element(self) -> ElementNonEmpty:
+        return ElementNonEmpty(
+            self._tag,
+            inline=self._inline,
+            omit_end_tag_before=self._omit_end_tag_before,
+            omit_end_tag_last=self._omit_end_tag_last,
+            preset=self._preset,
+        )
 
-    def __call__(
-        self, *content: Node | HasNodes | str, **attrs: str | bool
-    ) -> ElementNonEmpty:
-        elem = ElementNonEmpty(self._tag, inline=self._inline)(*content, **attrs)
+    def build(self, *content: Content, **attrs: str | bool) -> ElementNonEmpty:
+        """
+        Create an element without adding it to the current element context.
+
+        Unlike calling the prototype, this does not check whether any of the
+        `content` has been added to the current element context as well, so
+        it must not be mixed with element contexts (``with`` blocks).
+        """
+        return ElementNonEmpty(
+            self._tag,
+            inline=self._inline,
+            omit_end_tag_before=self._omit_end_tag_before,
+            omit_end_tag_last=self._omit_end_tag_last,
+            content=content,
+            attrs=attrs,
+            preset=self._preset,
+        )
+
+    def __call__(self, *content: Content, **attrs: str | bool) -> ElementNonEmpty:
+        elem = self._new_element()(*content, **attrs)
         register_with_context(elem)
         return elem
 
     def __getitem__(self, key: str) -> ElementNonEmpty:
-        elem = ElementNonEmpty(self._tag, inline=self._inline)[key]
+        elem = self._new_element()[key]
         register_with_context(elem)
         return elem
 
     def __enter__(self) -> ElementNonEmpty:
-        elem = ElementNonEmpty(self._tag, inline=self._inline)
+        elem = self._new_element()
         register_with_context(elem)
         push_element_context(elem)
         return elem
@@ -417,12 +1542,23 @@ class PrototypeNonEmpty(Prototype):
 
 
 @overload
-def make_prototype(tag: str, *, inline: bool = ...) -> PrototypeNonEmpty: ...
+def make_prototype(
+    tag: str,
+    *,
+    inline: bool = ...,
+    omit_end_tag_before: Iterable[str] = ...,
+    omit_end_tag_last: bool = ...,
+) -> PrototypeNonEmpty: ...
 
 
 @overload
 def make_prototype(
-    tag: str, *, inline: bool = ..., empty: Literal[False]
+    tag: str,
+    *,
+    inline: bool = ...,
+    empty: Literal[False],
+    omit_end_tag_before: Iterable[str] = ...,
+    omit_end_tag_last: bool = ...,
 ) -> PrototypeNonEmpty: ...
 
 
@@ -433,7 +1569,13 @@ def make_prototype(
 
 
 def make_prototype(
-    tag: str, *, inline: bool = False, empty: bool = False, omit_end_tag: bool = False
+    tag: str,
+    *,
+    inline: bool = False,
+    empty: bool = False,
+    omit_end_tag: bool = False,
+    omit_end_tag_before: Iterable[str] = (),
+    omit_end_tag_last: bool = False,
 ) -> PrototypeNonEmpty | PrototypeEmpty:
     """
     Factory function to create a new element prototype.
@@ -445,10 +1587,22 @@ def make_prototype(
         empty: Whether or not the element is allowed to have content.
         omit_end_tag: When `empty=True`, whether or not the end tag should be
           omitted when rendering.
+        omit_end_tag_before: When `empty=False`, a list of tag names. In
+          minified output, the end tag is omitted if the element is
+          immediately followed by a sibling element with one of these tags.
+        omit_end_tag_last: When `empty=False`, whether or not the end tag is
+          omitted in minified output if the element is the last child of its
+          parent. The end tag is always kept inside elements with a
+          transparent content model (such as ``<a>``) and custom elements.
 
     Returns:
         An element prototype.
     """
     if empty:
         return PrototypeEmpty(tag, inline=inline, omit_end_tag=omit_end_tag)
-    return PrototypeNonEmpty(tag, inline=inline)
+    return PrototypeNonEmpty(
+        tag,
+        inline=inline,
+        omit_end_tag_before=omit_end_tag_before,
+        omit_end_tag_last=omit_end_tag_last,
+    )
@@ -0,0 +1,122 @@
+from typing import Any, TypeAlias
+
+from ._core import Element, ElementEmpty, ElementNonEmpty, Node
+
+Patch: TypeAlias = dict[str, Any]
+
+
+def diff(old: Node, new: Node) -> list[Patch]:
+    """
+    Compute the changes needed to turn one element tree into another.
+
+    The result is a list of patch operations that can be serialized as JSON and
+    applied to the DOM of a page showing `old` (see :ref:`diffing`). Each
+    operation has an ``op`` and a ``path``, the list of element child indices
+    leading from the root element to the element the operation applies to:
+
+    - ``{"op": "replace", "path": [...], "html": "..."}``: Replace the element
+      with new HTML.
+    - ``{"op": "set_attr", "path": [...], "name": "...", "value": "..."}``:
+      Set an attribute (``value`` is ``None`` for boolean attributes).
+    - ``{"op": "remove_attr", "path": [...], "name": "..."}``: Remove an
+      attribute.
+    - ``{"op": "insert", "path": [...], "index": 0, "html": "..."}``: Insert new
+      HTML as the element child with the given index.
+    - ``{"op": "remove", "path": [...]}``: Remove the element.
+
+    Children are matched by their ``id`` attribute where present, and by
+    position otherwise. Elements that contain text are replaced as a whole when
+    their content changes.
+
+    Args:
+        old: The tree currently shown.
+        new: The tree to show.
+    """
+    patches: list[Patch] = []
+    _diff_node(old, new, [], patches)
+    return patches
+
+
+def _diff_node(old: Node, new: Node, path: list[int], patches: list[Patch]) -> None:
+    if old is new:
+        return
+    if (
+        not isinstance(old, Element)
+        or not isinstance(new, Element)
+        or type(old) is not type(new)
+        or old.tag != new.tag
+    ):
+        if str(old) != str(new):
+            patches.append({"op": "replace", "path": path, "html": str(new)})
+        return
+
+    if isinstance(old, ElementNonEmpty) and isinstance(new, ElementNonEmpty):
+        old_children, new_children = old.children, new.children
+        if not _only_elements(old_children) or not _only_elements(new_children):
+            if str(old) != str(new):
+                patches.append({"op": "replace", "path": path, "html": str(new)})
+            return
+        _diff_attributes(old, new, path, patches)
+        _diff_children(old_children, new_children, path, patches)
+    elif isinstance(old, ElementEmpty):
+        _diff_attributes(old, new, path, patches)
+    elif str(old) != str(new):
+        patches.append({"op": "replace", "path": path, "html": str(new)})
+
+
+def _only_elements(nodes: tuple[Node, ...]) -> bool:
+    return all(isinstance(node, Element) for node in nodes)
+
+
+def _diff_attributes(
+    old: Element, new: Element, path: list[int], patches: list[Patch]
+) -> None:
+    old_attrs, new_attrs = old.attributes, new.attributes
+    for name, value in new_attrs.items():
+        if name not in old_attrs or old_attrs[name] != value:
+            patches.append(
+                {"op": "set_attr", "path": path, "name": name, "value": value}
+            )
+    for name in old_attrs:
+        if name not in new_attrs:
+            patches.append({"op": "remove_attr", "path": path, "name": name})
+
+
+def _key(node: Node) -> str | None:
+    return node.attributes.get("id") if isinstance(node, Element) else None
+
+
+def _diff_children(
+    old: tuple[Node, ...], new: tuple[Node, ...], path: list[int], patches: list[Patch]
+) -> None:
+    # Match new children to old ones, by id or else by position among the
+    # children without an id.
+    by_key = {key: node for node in old if (key := _key(node)) is not None}
+    unkeyed = iter([node for node in old if _key(node) is None])
+    matches: list[Node | None] = []
+    for node in new:
+        key = _key(node)
+        matches.append(
+            by_key.pop(key, None) if key is not None else next(unkeyed, None)
+        )
+
+    # Remove unmatched children, starting from the end so that indices stay
+    # valid.
+    matched = {id(node) for node in matches if node is not None}
+    current = list(old)
+    for i in reversed(range(len(current))):
+        if id(current[i]) not in matched:
+            patches.append({"op": "remove", "path": [*path, i]})
+            del current[i]
+
+    for i, (node, match) in enumerate(zip(new, matches)):
+        if match is not None and i < len(current) and current[i] is match:
+            _diff_node(match, node, [*path, i], patches)
+            continue
+        if match is not None:
+            # The matching element has moved, recreate it in its new place.
+            j = next(j for j in range(i, len(current)) if current[j] is match)
+            patches.append({"op": "remove", "path": [*path, j]})
+            del current[j]
+        patches.append({"op": "insert", "path": path, "index": i, "html": str(node)})
+        current.insert(i, node)
@@ -0,0 +1,54 @@
+from dataclasses import dataclass
+from typing import TypeAlias
+
+
+@dataclass(frozen=True, slots=True)
+class StartEvent:
+    """
+    The start of an element.
+
+    Followed by an :class:`AttributeEvent` for each attribute, and then by the
+    events for the element's content.
+    """
+
+    tag: str
+
+
+@dataclass(frozen=True, slots=True)
+class AttributeEvent:
+    """
+    An attribute of the element that was just started.
+
+    The value is ``None`` for boolean attributes.
+    """
+
+    name: str
+    value: str | None
+
+
+@dataclass(frozen=True, slots=True)
+class TextEvent:
+    """
+    Text content.
+
+    `text` is the original (unescaped) text. If `safe` is ``True``, the text
+    is HTML that is included in the output as-is.
+    """
+
+    text: str
+    safe: bool = False
+
+
+@dataclass(frozen=True, slots=True)
+class EndEvent:
+    """
+    The end of an element.
+
+    Every :class:`StartEvent` is followed by a matching `EndEvent`, even for
+    empty elements.
+    """
+
+    tag: str
+
+
+Event: TypeAlias = StartEvent | AttributeEvent | TextEvent | EndEvent
@@ -0,0 +1,85 @@
+from collections.abc import Hashable, Iterable, Mapping
+from dataclasses import dataclass
+
+from ._core import Node
+from ._events import AttributeEvent, StartEvent
+
+
+@dataclass(frozen=True)
+class Manifest:
+    """
+    The external resources a template needs, for sending preload hints before
+    the template is rendered.
+
+    Attributes:
+        styles: The URLs of the stylesheets included by
+          :func:`component_styles`.
+        scripts: The URLs of the scripts included by
+          :func:`component_scripts`.
+        crossorigin: The URLs of the styles and scripts that are requested
+          with ``crossorigin="anonymous"``. Their preload links include the
+          ``crossorigin`` attribute, so that browsers can use the preloaded
+          response.
+    """
+
+    styles: tuple[str, ...] = ()
+    scripts: tuple[str, ...] = ()
+    crossorigin: tuple[str, ...] = ()
+
+    def links(self) -> list[str]:
+        """
+        Return the preload links as values for separate ``Link`` headers.
+        """
+        return [self._link(url, "style") for url in self.styles] + [
+            self._link(url, "script") for url in self.scripts
+        ]
+
+    def _link(self, url: str, as_: str) -> str:
+        link = f"<{url}>; rel=preload; as={as_}"
+        return f"{link}; crossorigin" if url in self.crossorigin else link
+
+    def link_header(self) -> str:
+        """
+        Return the preload links as the value of a single ``Link`` header,
+        for example in a ``103 Early Hints`` response.
+
+        Returns an empty string if there is nothing to preload.
+        """
+        return ", ".join(self.links())
+
+
+def _resource(node: Node, tag: str, attr: str) -> tuple[str, bool] | None:
+    # Return the URL of a <link rel="stylesheet" href=...> or
+    # <script src=...> element, and whether it is requested in the anonymous
+    # CORS mode (the default for crossorigin attributes without a valid value).
+    events = node.iter_events()
+    if next(events, None) != StartEvent(tag):
+        return None
+    attrs: dict[str, str | None] = {}
+    for event in events:
+        if not isinstance(event, AttributeEvent):
+            break
+        attrs[event.name] = event.value
+    if tag == "link" and attrs.get("rel") != "stylesheet":
+        return None
+    if not (url := attrs.get(attr)):
+        return None
+    crossorigin = "crossorigin" in attrs and attrs["crossorigin"] != "use-credentials"
+    return url, crossorigin
+
+
+def make_manifest(styles: Iterable[Node], scripts: Iterable[Node]) -> Manifest:
+    style_urls = [r for node in styles if (r := _resource(node, "link", "href"))]
+    script_urls = [r for node in scripts if (r := _resource(node, "script", "src"))]
+    return Manifest(
+        styles=tuple([url for url, _ in style_urls]),
+        scripts=tuple([url for url, _ in script_urls]),
+        crossorigin=tuple([url for url, cors in style_urls + script_urls if cors]),
+    )
+
+
+def argument_shape(args: tuple[object, ...], kwargs: Mapping[str, object]) -> Hashable:
+    return (
+        tuple([type(arg) for arg in args]),
+        tuple(sorted([(name, type(value)) for name, value in kwargs.items()])),
+    )
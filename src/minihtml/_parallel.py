@@ -0,0 +1,167 @@
+import io
+import pickle
+import sys
+from collections.abc import Iterator
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from contextvars import Context
+from typing import TextIO
+
+from ._core import (
+    DeferredNode,
+    Element,
+    Event,
+    Node,
+    RenderContext,
+    Transform,
+    current_render_context,
+    deregister_from_context,
+    escaping,
+    register_with_context,
+    rendering,
+)
+from ._query import ElementIndex
+from ._selector import Selector
+from ._template_context import (
+    TemplateContext,
+    fork_template_context,
+    set_template_context,
+)
+
+
+def _render_subtree(
+    node: Node, indent: int, ctx: RenderContext, template_ctx: TemplateContext | None
+) -> str:
+    buf = io.StringIO()
+
+    def render() -> None:
+        set_template_context(template_ctx)
+        with rendering(ctx), escaping(ctx.escape_function):
+            node.write(buf, indent)
+
+    # Use a fresh context, so that worker threads do not share any rendering
+    # state with the thread that submitted the work.
+    Context().run(render)
+    return buf.getvalue()
+
+
+def _check_picklable(ctx: RenderContext) -> None:
+    # The rendering options are sent to each worker process. Check them once
+    # up front, instead of failing with a pickling error for every subtree.
+    options = {
+        "transforms": ctx.transforms,
+        "attribute_filters": ctx.attribute_filters,
+        "escape function": ctx.escape_function,
+    }
+    for name, value in options.items():
+        try:
+            pickle.dumps(value)
+        except Exception as e:
+            raise ValueError(
+                f"The {name} can not be sent to worker processes, because it "
+                f"can not be pickled ({e}). Use functions defined at the "
+                "module level, or render with worker threads by passing a "
+                "ThreadPoolExecutor as parallel=..."
+            ) from e
+
+
+class ParallelWriter(io.StringIO):
+    """
+    A buffer that renders independent subtrees using an executor.
+
+    The output of each subtree is stitched back into place by :meth:`getvalue`.
+    """
+
+    def __init__(self, executor: Executor):
+        super().__init__()
+        self._executor = executor
+        self._parts: list[str | Future[str]] = []
+        self._checked = False
+
+    def defer(self, node: Node, indent: int) -> None:
+        self._parts.append(super().getvalue())
+        self.seek(0)
+        self.truncate()
+        ctx = current_render_context().fork()
+        if not self._checked and isinstance(self._executor, ProcessPoolExecutor):
+            _check_picklable(ctx)
+            self._checked = True
+        template_ctx = fork_template_context()
+        self._parts.append(
+            self._executor.submit(_render_subtree, node, indent, ctx, template_ctx)
+        )
+
+    def getvalue(self) -> str:
+        parts = [p if isinstance(p, str) else p.result() for p in self._parts]
+        return "".join(parts) + super().getvalue()
+
+
+class IndependentNode(Node):
+    def __init__(self, node: Node):
+        self._node = node
+        self._inline = node._inline
+
+    def write(self, f: TextIO, indent: int = 0) -> None:
+        if isinstance(f, ParallelWriter):
+            f.defer(self._node, indent)
+        else:
+            self._node.write(f, indent)
+
+    def _compact(self, ids_seen: set[int], prev: Node | None) -> Node:
+        self._node = self._node._compact(ids_seen, None)
+        return self
+
+    def _iter_events(self, ids_seen: set[int]) -> Iterator[Event]:
+        return self._node._iter_events(ids_seen)
+
+    def _transform(self, transforms: tuple[Transform, ...], active: set[int]) -> Node:
+        self._node = self._node._transform(transforms, active)
+        return self
+
+    def _transform_content(
+        self, transforms: tuple[Transform, ...], active: set[int]
+    ) -> None:
+        self._transform(transforms, active)
+
+    def _add_to_index(
+        self, index: ElementIndex, parent: Element | None, ids_seen: set[int]
+    ) -> None:
+        self._node._add_to_index(index, parent, ids_seen)
+
+    def _find_shared(self, seen: set[int], shared: set[int]) -> None:
+        self._node._find_shared(seen, shared)
+
+    def _find(self, selector: Selector, pending: list[DeferredNode]) -> Element | None:
+        return self._node._find(selector, pending)
+
+    def _resolve_deferred(self) -> None:
+        self._node._resolve_deferred()
+
+
+def independent(node: Node) -> Node:
+    """
+    Mark a node as an independent subtree.
+
+    When a template is rendered with ``Template.render(parallel=...)``,
+    independent subtrees are rendered concurrently. Otherwise, the node
+    renders as usual.
+
+    When called inside an element context, replaces `node` in the parent
+    element.
+    """
+    deregister_from_context(node)
+    wrapper = IndependentNode(node)
+    register_with_context(wrapper)
+    return wrapper
+
+
+def make_executor(workers: int) -> Executor:
+    """
+    Create an executor for rendering independent subtrees.
+
+    Uses worker threads on free-threaded builds of Python, and worker processes
+    otherwise.
+    """
+    gil_enabled = getattr(sys, "_is_gil_enabled", lambda: True)()
+    if gil_enabled:
+        return ProcessPoolExecutor(max_workers=workers)
+    return ThreadPoolExecutor(max_workers=workers)
@@ -0,0 +1,88 @@
+from collections.abc import Mapping
+from typing import TYPE_CHECKING
+
+from ._selector import ComplexSelector, Selector
+
+if TYPE_CHECKING:
+    from ._core import Element
+
+
+class ElementIndex:
+    """
+    Maps ids, class names and tag names to the elements of a tree.
+
+    The index is filled by :meth:`Element.select` and discarded when one of the
+    indexed elements is modified.
+    """
+
+    def __init__(self) -> None:
+        self.valid = True
+        self._elements: list[tuple["Element", str, Mapping[str, str]]] = []
+        self._positions: dict[int, int] = {}
+        self._parents: dict[int, "Element"] = {}
+        self._by_id: dict[str, list[int]] = {}
+        self._by_class: dict[str, list[int]] = {}
+        self._by_tag: dict[str, list[int]] = {}
+
+    def __contains__(self, elem: "Element") -> bool:
+        return id(elem) in self._positions
+
+    def add(
+        self,
+        elem: "Element",
+        tag: str,
+        attrs: Mapping[str, str],
+        parent: "Element | None",
+    ) -> None:
+        position = len(self._elements)
+        self._elements.append((elem, tag, attrs))
+        self._positions[id(elem)] = position
+        if parent is not None:
+            self._parents[id(elem)] = parent
+        self._by_tag.setdefault(tag, []).append(position)
+        if "id" in attrs:
+            self._by_id.setdefault(attrs["id"], []).append(position)
+        for name in attrs.get("class", "").split():
+            self._by_class.setdefault(name, []).append(position)
+
+    def invalidate(self) -> None:
+        self.valid = False
+
+    def select(self, selectors: tuple[ComplexSelector, ...]) -> list["Element"]:
+        found: set[int] = set()
+        for selector in selectors:
+            for position in self._candidates(selector.compounds[-1]):
+                if position not in found and self._matches(
+                    position, selector, len(selector.compounds) - 1
+                ):
+                    found.add(position)
+        return [self._elements[position][0] for position in sorted(found)]
+
+    def _candidates(self, compound: Selector) -> list[int] | range:
+        # Use the most specific map for the rightmost compound selector.
+        if compound.id is not None:
+            return self._by_id.get(compound.id, [])
+        if compound.classes:
+            return min(
+                [self._by_class.get(name, []) for name in compound.classes], key=len
+            )
+        if compound.tag is not None:
+            return self._by_tag.get(compound.tag, [])
+        return range(len(self._elements))
+
+    def _matches(self, position: int, selector: ComplexSelector, i: int) -> bool:
+        elem, tag, attrs = self._elements[position]
+        if not selector.compounds[i].matches(tag, attrs):
+            return False
+        if i == 0:
+            return True
+        parent = self._parents.get(id(elem))
+        if selector.combinators[i - 1] == ">":
+            return parent is not None and self._matches(
+                self._positions[id(parent)], selector, i - 1
+            )
+        while parent is not None:
+            if self._matches(self._positions[id(parent)], selector, i - 1):
+                return True
+            parent = self._parents.get(id(parent))
+        return False
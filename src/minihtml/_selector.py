@@ -0,0 +1,80 @@
+import re
+from collections.abc import Mapping
+from dataclasses import dataclass
+from functools import lru_cache
+
+_COMPOUND_RE = re.compile(r"(\*|[a-zA-Z][\w-]*)?((?:[#.][\w-]+)*)")
+_PART_RE = re.compile(r"([#.])([\w-]+)")
+_COMBINATOR_RE = re.compile(r"\s*(>)\s*|\s+")
+
+
+@dataclass(frozen=True, slots=True)
+class Selector:
+    """
+    A compound CSS selector, such as ``div#main.wide``.
+    """
+
+    tag: str | None = None
+    id: str | None = None
+    classes: frozenset[str] = frozenset()
+
+    def matches(self, tag: str, attrs: Mapping[str, str]) -> bool:
+        if self.tag is not None and self.tag != tag:
+            return False
+        if self.id is not None and attrs.get("id") != self.id:
+            return False
+        if self.classes and not self.classes.issubset(attrs.get("class", "").split()):
+            return False
+        return True
+
+
+@dataclass(frozen=True, slots=True)
+class ComplexSelector:
+    """
+    A sequence of compound selectors joined by descendant (``" "``) or child
+    (``">"``) combinators, such as ``ul.nav > li a``.
+    """
+
+    compounds: tuple[Selector, ...]
+    combinators: tuple[str, ...] = ()
+
+
+@lru_cache(maxsize=256)
+def parse_selector(selector: str) -> Selector:
+    """
+    Parse a selector consisting of an optional tag name (or ``*``), followed by
+    any number of ``#id`` and ``.class`` parts.
+    """
+    match = _COMPOUND_RE.fullmatch(selector.strip())
+    if match is None or not (match[1] or match[2]):
+        raise ValueError(f"Invalid selector: {selector!r}")
+    tag, parts = match[1], match[2]
+    ids = [name for kind, name in _PART_RE.findall(parts) if kind == "#"]
+    if len(set(ids)) > 1:
+        raise ValueError(f"Invalid selector: {selector!r}")
+    return Selector(
+        tag=None if tag in (None, "*") else tag.lower(),
+        id=ids[0] if ids else None,
+        classes=frozenset(
+            [name for kind, name in _PART_RE.findall(parts) if kind == "."]
+        ),
+    )
+
+
+@lru_cache(maxsize=256)
+def parse_selector_list(selectors: str) -> tuple[ComplexSelector, ...]:
+    """
+    Parse a comma-separated list of compound selectors joined by descendant or
+    child combinators.
+    """
+    result: list[ComplexSelector] = []
+    for group in selectors.split(","):
+        # Compound selectors alternate with combinators (None for whitespace).
+        parts = _COMBINATOR_RE.split(group.strip())
+        try:
+            compounds = tuple([parse_selector(part) for part in parts[::2]])
+        except ValueError:
+            raise ValueError(f"Invalid selector: {selectors!r}") from None
+        combinators = tuple([part or " " for part in parts[1::2]])
+        result.append(ComplexSelector(compounds, combinators))
+    return tuple(result)
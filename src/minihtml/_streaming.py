@@ -0,0 +1,140 @@
+import io
+import queue
+import socket
+import threading
+import zlib
+from collections.abc import Callable, Generator
+from contextvars import copy_context
+from typing import Literal, Protocol, TextIO, TypeAlias, cast
+
+DEFAULT_CHUNK_SIZE = 16 * 1024
+
+Compression: TypeAlias = Literal["gzip", "deflate"]
+
+
+class BinarySink(Protocol):
+    def write(self, data: bytes, /) -> object: ...  # pragma: no cover
+
+
+class TextSink(Protocol):
+    def write(self, s: str, /) -> object: ...  # pragma: no cover
+
+
+def sink_writer(
+    sink: BinarySink | TextSink | socket.socket, encoding: str | None
+) -> Callable[[str], object]:
+    """
+    Return a function that writes text to `sink`, encoding it first unless
+    `encoding` is ``None``.
+    """
+    if encoding is None:
+        return cast(TextSink, sink).write
+    if isinstance(sink, socket.socket):
+        send = sink.sendall
+    else:
+        send = cast(BinarySink, sink).write
+    return lambda chunk: send(chunk.encode(encoding))
+
+
+class RenderCancelled(Exception):
+    """
+    Raised inside a rendering thread to stop rendering early.
+    """
+
+
+class ChunkWriter(io.StringIO):
+    """
+    A text buffer that passes its contents on to a callback in chunks of at
+    least `chunk_size` characters.
+
+    Call :meth:`emit_chunk` after rendering to pass on the remaining content.
+    """
+
+    def __init__(self, emit: Callable[[str], object], chunk_size: int):
+        super().__init__()
+        self._emit = emit
+        self._chunk_size = chunk_size
+
+    def write(self, s: str) -> int:
+        n = super().write(s)
+        if self.tell() >= self._chunk_size:
+            self.emit_chunk()
+        return n
+
+    def emit_chunk(self) -> None:
+        if chunk := self.getvalue():
+            self.seek(0)
+            self.truncate()
+            self._emit(chunk)
+
+
+class Compressor:
+    """
+    Incrementally compress a stream of chunks.
+
+    With `sync_flush`, the output for each chunk is flushed so that the client
+    can decompress (and display) it right away. Without it, zlib decides when
+    to emit output, which compresses slightly better.
+    """
+
+    def __init__(self, compression: Compression, level: int, sync_flush: bool):
+        wbits = 16 + zlib.MAX_WBITS if compression == "gzip" else zlib.MAX_WBITS
+        self._compressobj = zlib.compressobj(level, zlib.DEFLATED, wbits)
+        self._sync_flush = sync_flush
+
+    def compress(self, data: bytes) -> bytes:
+        output = self._compressobj.compress(data)
+        if self._sync_flush:
+            output += self._compressobj.flush(zlib.Z_SYNC_FLUSH)
+        return output
+
+    def finish(self) -> bytes:
+        return self._compressobj.flush(zlib.Z_FINISH)
+
+
+def iter_chunks(
+    render: Callable[[TextIO], None], chunk_size: int
+) -> Generator[str, None, None]:
+    """
+    Run `render` in a background thread and yield the output in chunks.
+
+    At most one chunk is buffered, so rendering does not get ahead of the
+    consumer. Closing the iterator stops rendering at the next chunk boundary.
+    """
+    chunks: queue.Queue[str | Exception | None] = queue.Queue(maxsize=1)
+    cancelled = threading.Event()
+
+    def put(item: str | Exception | None) -> None:
+        if cancelled.is_set():
+            raise RenderCancelled
+        chunks.put(item)
+
+    def produce() -> None:
+        try:
+            writer = ChunkWriter(put, chunk_size)
+            render(writer)
+            writer.emit_chunk()
+            put(None)
+        except RenderCancelled:
+            pass
+        except Exception as e:
+            try:
+                put(e)
+            except RenderCancelled:
+                pass
+
+    ctx = copy_context()
+    thread = threading.Thread(target=ctx.run, args=(produce,), daemon=True)
+    thread.start()
+    try:
+        while (item := chunks.get()) is not None:
+            if isinstance(item, Exception):
+                raise item
+            yield item
+    finally:
+        cancelled.set()
+        # Unblock the producer if it is waiting to hand over a chunk.
+        try:
+            chunks.get_nowait()
+        except queue.Empty:
+            pass
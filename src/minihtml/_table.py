@@ -0,0 +1,152 @@
+from collections.abc import Iterable, Iterator, Sequence
+from typing import Literal, Protocol, TextIO, runtime_checkable
+
+from ._core import (
+    Element,
+    Event,
+    current_render_context,
+    escape_text,
+    register_with_context,
+    set_attributes,
+)
+from ._events import EndEvent, StartEvent, TextEvent
+
+
+@runtime_checkable
+class SupportsToList(Protocol):
+    def tolist(self) -> Sequence[Sequence[object]]: ...  # pragma: no cover
+
+
+def _cell_text(value: object) -> str:
+    return "" if value is None else str(value)
+
+
+def _escape_column(values: Sequence[str]) -> list[str]:
+    # Escaping one large string is much faster than escaping every cell on its
+    # own. Cells are separated by a character that escape() leaves alone, and
+    # that is not expected to appear in the data.
+    escaped = escape_text("\x00".join(values)).split("\x00")
+    if len(escaped) != len(values):
+        escaped = [escape_text(value) for value in values]
+    return escaped
+
+
+class Table(Element):
+    """
+    A table with a header row and a body, with the cells stored column by
+    column.
+
+    Use the :func:`table_from_rows` function to create tables.
+    """
+
+    def __init__(
+        self,
+        columns: Sequence[str] | None,
+        data: list[list[str]],
+        rows: int,
+        attrs: dict[str, str | bool],
+    ):
+        self._tag = "table"
+        self._columns = (
+            _escape_column([str(c) for c in columns]) if columns is not None else None
+        )
+        self._data = data
+        self._rows = rows
+        self._inline = False
+        self._attrs: dict[str, str] = {}
+        self._bools: dict[str, Literal[True]] = {}
+        set_attributes(self._attrs, self._bools, attrs)
+
+    def write(self, f: TextIO, indent: int = 0) -> None:
+        ctx = current_render_context()
+        if ctx.transforms and self._write_transformed(
+            ctx, lambda node: node.write(f, indent)
+        ):
+            return
+        attrs = self._format_attributes(ctx, minify=ctx.minify)
+        data = self._data
+        if ctx.release:
+            self._data = []
+
+        if ctx.minify:
+            f.write(f"<table{attrs}>")
+            if self._columns is not None:
+                f.write("<thead><tr>" + "".join([f"<th>{c}" for c in self._columns]))
+            f.write("<tbody>")
+            for i in range(self._rows):
+                f.write("<tr>" + "".join([f"<td>{column[i]}" for column in data]))
+            f.write("</table>")
+            return
+
+        nl1, nl2, nl3 = [f"\n{'  ' * (indent + n)}" for n in (1, 2, 3)]
+        f.write(f"<table{attrs}>")
+        if self._columns is not None:
+            cells = "".join([f"{nl3}<th>{c}</th>" for c in self._columns])
+            row = f"<tr>{cells}{nl2}</tr>" if cells else "<tr></tr>"
+            f.write(f"{nl1}<thead>{nl2}{row}{nl1}</thead>")
+        if self._rows:
+            f.write(f"{nl1}<tbody>")
+            for i in range(self._rows):
+                cells = "".join([f"{nl3}<td>{column[i]}</td>" for column in data])
+                f.write(f"{nl2}<tr>{cells}{nl2}</tr>" if cells else f"{nl2}<tr></tr>")
+            f.write(f"{nl1}</tbody>")
+        else:
+            f.write(f"{nl1}<tbody></tbody>")
+        f.write(f"\n{'  ' * indent}</table>")
+
+    def _iter_events(self, ids_seen: set[int]) -> Iterator[Event]:
+        yield StartEvent("table")
+        yield from self._iter_attribute_events()
+        if self._columns is not None:
+            yield StartEvent("thead")
+            yield from self._iter_row_events("th", self._columns)
+            yield EndEvent("thead")
+        yield StartEvent("tbody")
+        for i in range(self._rows):
+            yield from self._iter_row_events("td", [c[i] for c in self._data])
+        yield EndEvent("tbody")
+        yield EndEvent("table")
+
+    def _iter_row_events(self, tag: str, cells: Iterable[str]) -> Iterator[Event]:
+        yield StartEvent("tr")
+        for cell in cells:
+            yield StartEvent(tag)
+            yield TextEvent(cell, safe=True)
+            yield EndEvent(tag)
+        yield EndEvent("tr")
+
+
+def table_from_rows(
+    rows: Iterable[Sequence[object]] | SupportsToList,
+    columns: Sequence[str] | None = None,
+    **attrs: str | bool,
+) -> Table:
+    """
+    Create a table from rows of data.
+
+    This is much faster than building the same table out of individual
+    elements. The cell values are converted to strings (with ``None`` becoming
+    an empty string), escaped, and stored column by column, and the table is
+    written out directly when rendering.
+
+    When called inside an element context, adds the table to the parent
+    element.
+
+    Args:
+        rows: An iterable of rows, each a sequence of cell values, or a
+          two-dimensional array (such as a NumPy array) with a ``tolist()``
+          method.
+        columns: The column headings. When given, the table gets a ``<thead>``
+          section with a header row.
+        attrs: Attributes for the ``<table>`` element.
+    """
+    if isinstance(rows, SupportsToList):
+        rows = rows.tolist()
+    cells = [[_cell_text(value) for value in row] for row in rows]
+    width = len(columns) if columns is not None else len(cells[0]) if cells else 0
+    if any(len(row) != width for row in cells):
+        raise ValueError(f"All rows must have {width} cells")
+    data = [_escape_column(column) for column in zip(*cells)] if cells else []
+    node = Table(columns, data, len(cells), attrs)
+    register_with_context(node)
+    return node
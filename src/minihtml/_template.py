@@ -1,11 +1,48 @@
 import io
-from collections.abc import Iterable
+import socket
+import threading
+import weakref
+from collections.abc import Hashable, Iterable, Iterator, Mapping
+from concurrent.futures import Executor
+from dataclasses import dataclass
 from functools import wraps
 from typing import Callable, Concatenate, ParamSpec, TextIO, TypeAlias, overload
 
+from ._assets import Assets, ResourceKind
 from ._component import Component, ComponentWrapper
-from ._core import HasNodes, Node, iter_nodes, register_with_context
-from ._template_context import get_template_context, template_context
+from ._core import (
+    AttributeFilter,
+    Event,
+    HasNodes,
+    Node,
+    RenderContext,
+    Transform,
+    current_render_context,
+    deferring,
+    drain,
+    iter_nodes,
+    register_with_context,
+    rendering,
+)
+from ._manifest import Manifest, argument_shape, make_manifest
+from ._parallel import ParallelWriter, make_executor
+from ._selector import parse_selector
+from ._streaming import (
+    DEFAULT_CHUNK_SIZE,
+    BinarySink,
+    ChunkWriter,
+    TextSink,
+    sink_writer,
+)
+from ._template_context import (
+    TemplateContext,
+    content_key,
+    file_hash,
+    get_template_context,
+    qualified_name,
+    source_hash,
+    template_context,
+)
 
 P = ParamSpec("P")
 
@@ -13,43 +50,379 @@ TemplateImpl: TypeAlias = Callable[P, Node | HasNodes]
 TemplateImplLayout: TypeAlias = Callable[Concatenate[Component, P], None]
 
 
+@dataclass(frozen=True)
+class Dependencies:
+    """
+    The dependencies of a rendered template.
+
+    Attributes:
+        template: The function decorated with :deco:`template`.
+        components: The components used while rendering, including the layout
+          component.
+        styles: The collected component styles.
+        scripts: The collected component scripts.
+        files: The paths recorded with :func:`depends_on`.
+    """
+
+    template: Callable[..., object]
+    components: tuple[ComponentWrapper[...], ...]
+    styles: tuple[Node, ...]
+    scripts: tuple[Node, ...]
+    files: tuple[str, ...]
+
+    def fingerprints(self) -> dict[str, str]:
+        """
+        Return a stable name for each dependency, mapped to a hash of its
+        current content.
+
+        The names are ``"template:<module>:<name>"`` and
+        ``"component:<module>:<name>"`` (hashed from the source code, and the
+        styles and scripts of components), ``"style:<hash>"`` and
+        ``"script:<hash>"`` (named by their content), and ``"file:<path>"``
+        (hashed from the file contents, or empty if the file does not exist).
+        The result can be stored and compared with the fingerprints of the next
+        build, see :class:`Build`.
+        """
+        fingerprints = {
+            f"template:{qualified_name(self.template)}": source_hash(self.template)
+        }
+        for component in self.components:
+            fingerprints[f"component:{component.name}"] = component.fingerprint()
+        for kind, nodes in (("style", self.styles), ("script", self.scripts)):
+            for node in nodes:
+                key = content_key(node)
+                fingerprints[f"{kind}:{key}"] = key
+        for path in self.files:
+            fingerprints[f"file:{path}"] = file_hash(path)
+        return fingerprints
+
+
+# The manifests learned for each template function, by argument shape. The
+# functions are only referenced weakly, so that templates that are defined
+# dynamically can be freed, and the number of shapes per function is limited.
+_manifests = weakref.WeakKeyDictionary[
+    Callable[..., object], dict[Hashable, Manifest]
+]()
+_manifests_lock = threading.Lock()
+MAX_MANIFESTS_PER_TEMPLATE = 32
+
+
+def clear_manifests() -> None:
+    """
+    Forget the manifests of all templates (see :attr:`Template.manifest`).
+
+    Each manifest is learned again the next time a template is rendered, for
+    example after the components used by a template have changed.
+    """
+    with _manifests_lock:
+        _manifests.clear()
+
+
 class Template:
     """
     The result of calling a function decorated with :deco:`template`.
     """
 
-    def __init__(self, callback: Callable[[], list[Node]]):
+    def __init__(
+        self,
+        callback: Callable[[], list[Node]],
+        fn: Callable[..., object],
+        assets: Assets | None = None,
+        shape: Hashable = None,
+    ):
         self._callback = callback
+        self._fn = fn
+        self._assets = assets
+        self._shape = shape
+        self._context: TemplateContext | None = None
+
+    @property
+    def name(self) -> str:
+        """
+        The module and qualified name of the template function, such as
+        ``"myapp.pages:index"``.
+        """
+        return qualified_name(self._fn)
+
+    @property
+    def dependencies(self) -> Dependencies:
+        """
+        The dependencies recorded during the most recent call to
+        :meth:`render`.
+
+        Raises :exc:`RuntimeError` if the template has not been rendered yet.
+        """
+        if self._context is None:
+            raise RuntimeError("Template has not been rendered yet")
+        ctx = self._context
+        components = [c for c in ctx.components if isinstance(c, ComponentWrapper)]
+        return Dependencies(
+            template=self._fn,
+            components=tuple(components),
+            styles=tuple(ctx.styles),
+            scripts=tuple(ctx.scripts),
+            files=tuple(ctx.files),
+        )
+
+    @property
+    def manifest(self) -> Manifest | None:
+        """
+        The external styles and scripts the template needs, as learned from
+        the first time a template from the same function was rendered with
+        arguments of the same types.
 
-    def render(self, *, doctype: bool = True) -> str:
+        This is available before the template is rendered, and can be used to
+        send preload hints to the browser before doing the work of rendering
+        the template. Is ``None`` if no such template has been rendered yet.
+        """
+        with _manifests_lock:
+            manifests = _manifests.get(self._fn)
+            return manifests.get(self._shape) if manifests is not None else None
+
+    def render(
+        self,
+        *,
+        doctype: bool = True,
+        minify: bool = False,
+        parallel: int | Executor | None = None,
+        select: str | None = None,
+        transforms: Iterable[Transform] = (),
+        attribute_filters: Mapping[str, AttributeFilter] = {},
+    ) -> str:
         """
         Render the template and return a string.
 
         Args:
             doctype: Whether or not to prepend the doctype declaration
               ``<!doctype html>`` to the output.
+            minify: Produce minified output (see :meth:`write`).
+            parallel: Render subtrees marked with :func:`independent`
+              concurrently, using either the given number of workers or an
+              existing :class:`~concurrent.futures.Executor`. By default,
+              worker processes are used (which requires the subtrees, the
+              `transforms` and the `attribute_filters` to be picklable), or
+              worker threads on free-threaded builds of Python.
+            select: Only render the first element matching this selector (see
+              :meth:`write`).
+            transforms: Functions to apply to each element while rendering
+              (see :meth:`write`).
+            attribute_filters: Functions to change the attributes of elements
+              while rendering (see :meth:`write`).
         """
-        nodes = self._callback()
-        buf = io.StringIO()
-        if doctype:
-            buf.write("<!doctype html>\n")
-        Node.render_list(buf, nodes)
-        buf.write("\n")
-        return buf.getvalue()
+        if parallel is None:
+            buf = io.StringIO()
+            self.write(
+                buf,
+                doctype=doctype,
+                minify=minify,
+                select=select,
+                transforms=transforms,
+                attribute_filters=attribute_filters,
+            )
+            return buf.getvalue()
+
+        if isinstance(parallel, Executor):
+            buf = ParallelWriter(parallel)
+            self.write(
+                buf,
+                doctype=doctype,
+                minify=minify,
+                select=select,
+                transforms=transforms,
+                attribute_filters=attribute_filters,
+            )
+            return buf.getvalue()
+
+        with make_executor(parallel) as executor:
+            buf = ParallelWriter(executor)
+            self.write(
+                buf,
+                doctype=doctype,
+                minify=minify,
+                select=select,
+                transforms=transforms,
+                attribute_filters=attribute_filters,
+            )
+            return buf.getvalue()
+
+    @overload
+    def render_to(
+        self,
+        sink: BinarySink | socket.socket,
+        *,
+        encoding: str = ...,
+        buffer_size: int = ...,
+        doctype: bool = ...,
+        minify: bool = ...,
+        release: bool = ...,
+        transforms: Iterable[Transform] = ...,
+        attribute_filters: Mapping[str, AttributeFilter] = ...,
+    ) -> None: ...
+
+    @overload
+    def render_to(
+        self,
+        sink: TextSink,
+        *,
+        encoding: None,
+        buffer_size: int = ...,
+        doctype: bool = ...,
+        minify: bool = ...,
+        release: bool = ...,
+        transforms: Iterable[Transform] = ...,
+        attribute_filters: Mapping[str, AttributeFilter] = ...,
+    ) -> None: ...
+
+    def render_to(
+        self,
+        sink: BinarySink | TextSink | socket.socket,
+        *,
+        encoding: str | None = "utf-8",
+        buffer_size: int = DEFAULT_CHUNK_SIZE,
+        doctype: bool = True,
+        minify: bool = False,
+        release: bool = False,
+        transforms: Iterable[Transform] = (),
+        attribute_filters: Mapping[str, AttributeFilter] = {},
+    ) -> None:
+        """
+        Render the template directly into a file, socket or other stream.
+
+        The output is collected into blocks of `buffer_size` characters, which
+        are encoded and written one at a time. The full document is never held
+        in memory.
+
+        Args:
+            sink: A binary stream (such as a file opened in binary mode or
+              :class:`io.BytesIO`), a :class:`socket.socket`, or a text stream
+              when `encoding` is ``None``.
+            encoding: The output encoding, or ``None`` to write text.
+            buffer_size: The size of each block (in characters).
+            doctype: Whether or not to prepend the doctype declaration
+              ``<!doctype html>`` to the output.
+            minify: Produce minified output (see :meth:`write`).
+            release: Release each part of the document as soon as it has been
+              written (see :meth:`write`).
+            transforms: Functions to apply to each element while rendering
+              (see :meth:`write`).
+            attribute_filters: Functions to change the attributes of elements
+              while rendering (see :meth:`write`).
+        """
+        writer = ChunkWriter(sink_writer(sink, encoding), buffer_size)
+        self.write(
+            writer,
+            doctype=doctype,
+            minify=minify,
+            release=release,
+            transforms=transforms,
+            attribute_filters=attribute_filters,
+        )
+        writer.emit_chunk()
+
+    def write(
+        self,
+        f: TextIO,
+        *,
+        doctype: bool = True,
+        minify: bool = False,
+        release: bool = False,
+        select: str | None = None,
+        transforms: Iterable[Transform] = (),
+        attribute_filters: Mapping[str, AttributeFilter] = {},
+    ) -> None:
+        """
+        Render the template and write the output to a text stream.
+
+        Args:
+            f: The stream to write to.
+            doctype: Whether or not to prepend the doctype declaration
+              ``<!doctype html>`` to the output.
+            minify: Produce minified output. Whitespace between elements is
+              left out, attribute values are only quoted where necessary,
+              and optional end tags (such as ``</li>`` or ``</td>``) are
+              omitted where the HTML specification allows it.
+            release: Detach each node from the document tree as soon as it
+              has been written, so that it can be freed before the rest of the
+              document is rendered. This keeps the memory used for exporting
+              large documents low, but leaves the elements that make up the
+              template empty afterwards. Elements that appear more than once
+              in the document, and component styles and scripts, are not
+              released.
+            select: Only render the first element matching this selector,
+              such as ``"#results"`` or ``"div.card"``, without the doctype
+              declaration. Components are only expanded if the element is not
+              found outside of them, so that components that do not contain
+              the element never run. Raises :exc:`ValueError` if no element
+              matches. Elements pre-rendered by :meth:`Node.compact` can not
+              be selected.
+            transforms: Functions to apply to each element as it is written,
+              without modifying the template (see :meth:`Node.transform`).
+              Transforms should return a new element, for example created
+              with :meth:`Element.copy`, instead of modifying the element in
+              place. Optional end tags are not omitted when minifying with
+              transforms. Elements pre-rendered by :meth:`Node.compact` are
+              not transformed.
+            attribute_filters: A mapping from tag names to functions that
+              change the attributes of elements with that tag as they are
+              written, without modifying the elements. Each function is
+              called with a dictionary of attribute names and values (with
+              ``None`` for boolean attributes) that it can change in place.
+              Elements pre-rendered by :meth:`Node.compact` are not
+              filtered.
+        """
+        selector = parse_selector(select) if select is not None else None
+        # The template context stays active while rendering, so that
+        # components created by lazy content (iterators) are recorded too.
+        with template_context(self._assets) as ctx:
+            if selector is None:
+                nodes = self._callback()
+            else:
+                with deferring():
+                    match = Node.find_selected(self._callback(), selector)
+                if match is None:
+                    raise ValueError(f"No element matches {select!r}")
+                nodes = Node.resolve_deferred([match])
+                doctype = False
+            self._context = ctx
+            render_ctx = RenderContext(
+                minify=minify,
+                release=release,
+                shared=Node.find_shared(nodes) if release else set(),
+                transforms=tuple(transforms),
+                attribute_filters=attribute_filters,
+            )
+            with rendering(render_ctx):
+                if doctype:
+                    f.write("<!doctype html>" if minify else "<!doctype html>\n")
+                Node.render_list(f, drain(nodes) if release else nodes)
+                if not minify:
+                    f.write("\n")
+
+        if selector is None and self.manifest is None:
+            manifest = make_manifest(ctx.resources("style"), ctx.resources("script"))
+            with _manifests_lock:
+                manifests = _manifests.setdefault(self._fn, {})
+                if len(manifests) >= MAX_MANIFESTS_PER_TEMPLATE:
+                    del manifests[next(iter(manifests))]
+                manifests[self._shape] = manifest
 
 
 @overload
-def template() -> Callable[[TemplateImpl[P]], Callable[P, Template]]: ...
+def template(
+    *, assets: Assets | None = ...
+) -> Callable[[TemplateImpl[P]], Callable[P, Template]]: ...
 
 
 @overload
 def template(
-    layout: ComponentWrapper[...],
+    layout: ComponentWrapper[...], *, assets: Assets | None = ...
 ) -> Callable[[TemplateImplLayout[P]], Callable[P, Template]]: ...
 
 
 def template(
     layout: ComponentWrapper[...] | None = None,
+    *,
+    assets: Assets | None = None,
 ) -> (
     Callable[[TemplateImpl[P]], Callable[P, Template]]
     | Callable[[TemplateImplLayout[P]], Callable[P, Template]]
@@ -60,6 +433,9 @@ def template(
     Args:
         layout: A component to use as the layout for the template. The layout
           must have a default slot.
+        assets: Write component styles and scripts to external files managed
+          by an :class:`Assets` instance, instead of including them in the
+          document.
 
     When ``layout`` is used, the decorated function will be executed within the
     context of the layout component when the template is rendered. All elements
@@ -81,11 +457,10 @@ def template(
             @wraps(fn)
             def wrapper(*args: P.args, **kwargs: P.kwargs) -> Template:
                 def callback() -> list[Node]:
-                    with template_context():
-                        result = fn(*args, **kwargs)
-                        return list(iter_nodes([result]))
+                    result = fn(*args, **kwargs)
+                    return list(iter_nodes([result]))
 
-                return Template(callback)
+                return Template(callback, fn, assets, argument_shape(args, kwargs))
 
             return wrapper
 
@@ -97,12 +472,11 @@ def template(
             @wraps(fn)
             def wrapper(*args: P.args, **kwargs: P.kwargs) -> Template:
                 def callback() -> list[Node]:
-                    with template_context():
-                        with layout() as result:
-                            fn(result, *args, **kwargs)
-                        return list(iter_nodes([result]))
+                    with layout() as result:
+                        fn(result, *args, **kwargs)
+                    return list(iter_nodes([result]))
 
-                return Template(callback)
+                return Template(callback, fn, assets, argument_shape(args, kwargs))
 
             return wrapper
 
@@ -110,18 +484,32 @@ def template(
 
 
 class ResourceWrapper(Node):
-    def __init__(self, nodes: Iterable[Node]):
-        self._nodes = nodes
+    def __init__(self, ctx: TemplateContext, kind: ResourceKind):
+        ctx.add_placeholder(kind)
+        self._ctx = ctx
+        self._kind: ResourceKind = kind
         self._inline = False
 
     def write(self, f: TextIO, indent: int = 0) -> None:
-        nodes = list(self._nodes)
+        nodes = self._ctx.resources(self._kind)
+        self._ctx.seal(self._kind)
         n = len(nodes)
-        for i, node in enumerate(nodes):
-            node.write(f, indent)
-            if i < n - 1:
-                f.write("\n")
-                f.write("  " * indent)
+        ctx = current_render_context()
+        # Component styles and scripts are shared by all renders, so they are
+        # never released.
+        release, ctx.release = ctx.release, False
+        try:
+            for i, node in enumerate(nodes):
+                node.write(f, indent)
+                if i < n - 1 and not ctx.minify:
+                    f.write("\n")
+                    f.write("  " * indent)
+        finally:
+            ctx.release = release
+
+    def _iter_events(self, ids_seen: set[int]) -> Iterator[Event]:
+        for node in self._ctx.resources(self._kind):
+            yield from node._iter_events(ids_seen)
 
 
 def component_styles() -> ResourceWrapper:
@@ -132,7 +520,7 @@ def component_styles() -> ResourceWrapper:
     :deco:`template`. Inserts the style nodes collected from all components
     used in the current template.
     """
-    wrapper = ResourceWrapper(get_template_context().styles)
+    wrapper = ResourceWrapper(get_template_context(), "style")
     register_with_context(wrapper)
     return wrapper
 
@@ -145,6 +533,6 @@ def component_scripts() -> ResourceWrapper:
     :deco:`template`. Inserts the script nodes collected from all components
     used in the current template.
     """
-    wrapper = ResourceWrapper(get_template_context().scripts)
+    wrapper = ResourceWrapper(get_template_context(), "script")
     register_with_context(wrapper)
     return wrapper
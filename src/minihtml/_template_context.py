@@ -1,21 +1,144 @@
+import hashlib
+import inspect
+import marshal
+import os
+import threading
+import weakref
 from collections.abc import Iterable, Iterator, Sequence
 from contextlib import contextmanager
 from contextvars import ContextVar
 from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Callable
 
-from ._core import Node
+from ._core import Node, RenderContext, rendering
+
+if TYPE_CHECKING:
+    from ._assets import Assets, ResourceKind
+
+
+_content_keys = weakref.WeakKeyDictionary[Node, str]()
+_content_keys_lock = threading.Lock()
+
+
+def content_key(node: Node) -> str:
+    """
+    Return a hash of the rendered node, computed only once per node.
+    """
+    with _content_keys_lock:
+        key = _content_keys.get(node)
+    if key is None:
+        # Resources can be registered while a template is rendered (by lazy
+        # content), so use a clean render context: the rendering options of
+        # the template must neither change the key nor release the node.
+        with rendering(RenderContext()):
+            html = str(node)
+        key = hashlib.sha256(html.encode()).hexdigest()
+        with _content_keys_lock:
+            _content_keys[node] = key
+    return key
+
+
+def qualified_name(fn: Callable[..., Any]) -> str:
+    """
+    Return the module and qualified name of a function, such as
+    ``"myapp.pages:index"``.
+    """
+    return f"{fn.__module__}:{fn.__qualname__}"
+
+
+def source_hash(fn: Callable[..., Any]) -> str:
+    """
+    Return a hash of the source code of a function, or of its compiled code if
+    the source is not available.
+    """
+    try:
+        data = inspect.getsource(fn).encode()
+    except (OSError, TypeError):
+        data = marshal.dumps(fn.__code__)
+    return hashlib.sha256(data).hexdigest()
+
+
+def file_hash(path: str) -> str:
+    """
+    Return a hash of the contents of a file, or an empty string if it can not
+    be read.
+    """
+    try:
+        with open(path, "rb") as f:
+            return hashlib.sha256(f.read()).hexdigest()
+    except OSError:
+        return ""
 
 
 @dataclass
 class TemplateContext:
-    _styles: dict[int, Node] = field(default_factory=dict[int, Node])
-    _scripts: dict[int, Node] = field(default_factory=dict[int, Node])
+    _styles: dict[str, Node] = field(default_factory=dict[str, Node])
+    _scripts: dict[str, Node] = field(default_factory=dict[str, Node])
+    _components: dict[int, object] = field(default_factory=dict[int, object])
+    _files: dict[str, None] = field(default_factory=dict[str, None])
+    _placeholders: set[str] = field(default_factory=set[str])
+    # Resource kinds that have been written, and can no longer be added to.
+    _sealed: set[str] = field(default_factory=set[str])
+    assets: "Assets | None" = None
 
     def add_style(self, node: Node):
-        self._styles[id(node)] = node
+        key = content_key(node)
+        if key not in self._styles:
+            self._check_not_sealed("style")
+            self._styles[key] = node
 
     def add_script(self, node: Node):
-        self._scripts[id(node)] = node
+        key = content_key(node)
+        if key not in self._scripts:
+            self._check_not_sealed("script")
+            self._scripts[key] = node
+
+    def _check_not_sealed(self, kind: "ResourceKind"):
+        if kind in self._sealed:
+            raise RuntimeError(
+                f"A component {kind} was added after component_{kind}s() was "
+                "rendered. Components in lazy content must not add new "
+                f"{kind}s after the component_{kind}s() placeholder, or in "
+                "independent subtrees rendered in parallel."
+            )
+
+    def add_component(self, component: object):
+        self._components[id(component)] = component
+
+    def add_file(self, path: str):
+        self._files[path] = None
+
+    def add_placeholder(self, kind: "ResourceKind"):
+        self._placeholders.add(kind)
+
+    def resources(self, kind: "ResourceKind") -> list[Node]:
+        """
+        Return the style or script nodes to insert into the document.
+        """
+        if kind not in self._placeholders:
+            return []
+        nodes = self.styles if kind == "style" else self.scripts
+        if self.assets is not None:
+            return self.assets.link_nodes(nodes, kind)
+        return list(nodes)
+
+    def seal(self, kind: "ResourceKind"):
+        """
+        Mark the style or script nodes as written. Adding new ones after this
+        raises an error, instead of leaving them out of the document.
+        """
+        self._sealed.add(kind)
+
+    def fork(self) -> "TemplateContext":
+        """
+        Return a copy for rendering in another thread or process, to which no
+        new styles or scripts can be added.
+        """
+        return TemplateContext(
+            _styles=dict(self._styles),
+            _scripts=dict(self._scripts),
+            _sealed={"style", "script"},
+        )
 
     @property
     def styles(self) -> Iterable[Node]:
@@ -25,6 +148,14 @@ class TemplateContext:
     def scripts(self) -> Iterable[Node]:
         return self._scripts.values()
 
+    @property
+    def components(self) -> Iterable[object]:
+        return self._components.values()
+
+    @property
+    def files(self) -> Iterable[str]:
+        return self._files.keys()
+
 
 _template_context = ContextVar[TemplateContext]("template_context")
 
@@ -41,14 +172,46 @@ def register_template_scripts(nodes: Sequence[Node]) -> None:
             ctx.add_script(node)
 
 
+def register_template_component(component: object) -> None:
+    if ctx := _template_context.get(None):
+        ctx.add_component(component)
+
+
+def depends_on(*paths: str | os.PathLike[str]) -> None:
+    """
+    Record input files the current template depends on.
+
+    Can be called from any code executed while rendering a template, for
+    example to note the data files a page was generated from. The recorded
+    paths are available from :attr:`Template.dependencies` after rendering.
+    Outside of a template, this function does nothing.
+    """
+    if ctx := _template_context.get(None):
+        for path in paths:
+            ctx.add_file(os.fspath(path))
+
+
 def get_template_context() -> TemplateContext:
     return _template_context.get()
 
 
+def fork_template_context() -> TemplateContext | None:
+    if ctx := _template_context.get(None):
+        return ctx.fork()
+    return None
+
+
+def set_template_context(ctx: TemplateContext | None) -> None:
+    # Only for use in a fresh contextvars.Context, see fork_template_context().
+    if ctx is not None:
+        _template_context.set(ctx)
+
+
 @contextmanager
-def template_context() -> Iterator[None]:
-    token = _template_context.set(TemplateContext())
+def template_context(assets: "Assets | None" = None) -> Iterator[TemplateContext]:
+    ctx = TemplateContext(assets=assets)
+    token = _template_context.set(ctx)
     try:
-        yield
+        yield ctx
     finally:
         _template_context.reset(token)
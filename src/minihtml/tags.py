@@ -123,7 +123,7 @@ __all__ = [
     "template_",
     "slot",
     "canvas",
-    # [[[end]]] (checksum: 8f9d1678585a7aed604675580615b43b)
+    # [[[end]]] (sum: j50WeFhaeu)
 ]
 
 # [[[cog
@@ -144,6 +144,11 @@ __all__ = [
 #           cog.out(", empty=True")
 #           if info.get("omit_end_tag", False):
 #               cog.out(", omit_end_tag=True")
+#       if before := info.get("omit_end_tag_before"):
+#           tags = ", ".join(f'"{t}"' for t in before)
+#           cog.out(f", omit_end_tag_before=[{tags}]")
+#       if info.get("omit_end_tag_last", False):
+#           cog.out(", omit_end_tag_last=True")
 #       cog.out(")\n")
 #       if alias:
 #           cog.outl(f"#: The ``{tag}`` element. Alias for :data:`{name}`.")
@@ -153,7 +158,7 @@ __all__ = [
 #: The ``html`` element.
 html: PrototypeNonEmpty = make_prototype("html")
 #: The ``head`` element.
-head: PrototypeNonEmpty = make_prototype("head")
+head: PrototypeNonEmpty = make_prototype("head", omit_end_tag_before=["body"])
 #: The ``title`` element.
 title: PrototypeNonEmpty = make_prototype("title")
 #: The ``base`` element.
@@ -165,7 +170,7 @@ meta: PrototypeEmpty = make_prototype("meta", empty=True, omit_end_tag=True)
 #: The ``style`` element.
 style: PrototypeNonEmpty = make_prototype("style")
 #: The ``body`` element.
-body: PrototypeNonEmpty = make_prototype("body")
+body: PrototypeNonEmpty = make_prototype("body", omit_end_tag_last=True)
 #: The ``article`` element.
 article: PrototypeNonEmpty = make_prototype("article")
 #: The ``section`` element.
@@ -195,7 +200,7 @@ footer: PrototypeNonEmpty = make_prototype("footer")
 #: The ``address`` element.
 address: PrototypeNonEmpty = make_prototype("address")
 #: The ``p`` element.
-p: PrototypeNonEmpty = make_prototype("p")
+p: PrototypeNonEmpty = make_prototype("p", omit_end_tag_before=["address", "article", "aside", "blockquote", "details", "dialog", "div", "dl", "fieldset", "figcaption", "figure", "footer", "form", "h1", "h2", "h3", "h4", "h5", "h6", "header", "hgroup", "hr", "main", "menu", "nav", "ol", "p", "pre", "search", "section", "table", "ul"], omit_end_tag_last=True)
 #: The ``hr`` element.
 hr: PrototypeEmpty = make_prototype("hr", empty=True, omit_end_tag=True)
 #: The ``pre`` element.
@@ -209,13 +214,13 @@ ul: PrototypeNonEmpty = make_prototype("ul")
 #: The ``menu`` element.
 menu: PrototypeNonEmpty = make_prototype("menu")
 #: The ``li`` element.
-li: PrototypeNonEmpty = make_prototype("li")
+li: PrototypeNonEmpty = make_prototype("li", omit_end_tag_before=["li"], omit_end_tag_last=True)
 #: The ``dl`` element.
 dl: PrototypeNonEmpty = make_prototype("dl")
 #: The ``dt`` element.
-dt: PrototypeNonEmpty = make_prototype("dt")
+dt: PrototypeNonEmpty = make_prototype("dt", omit_end_tag_before=["dt", "dd"])
 #: The ``dd`` element.
-dd: PrototypeNonEmpty = make_prototype("dd")
+dd: PrototypeNonEmpty = make_prototype("dd", omit_end_tag_before=["dt", "dd"], omit_end_tag_last=True)
 #: The ``figure`` element.
 figure: PrototypeNonEmpty = make_prototype("figure")
 #: The ``figcaption`` element.
@@ -247,9 +252,9 @@ abbr: PrototypeNonEmpty = make_prototype("abbr", inline=True)
 #: The ``ruby`` element.
 ruby: PrototypeNonEmpty = make_prototype("ruby", inline=True)
 #: The ``rt`` element.
-rt: PrototypeNonEmpty = make_prototype("rt", inline=True)
+rt: PrototypeNonEmpty = make_prototype("rt", inline=True, omit_end_tag_before=["rt", "rp"], omit_end_tag_last=True)
 #: The ``rp`` element.
-rp: PrototypeNonEmpty = make_prototype("rp", inline=True)
+rp: PrototypeNonEmpty = make_prototype("rp", inline=True, omit_end_tag_before=["rt", "rp"], omit_end_tag_last=True)
 #: The ``data`` element.
 data: PrototypeNonEmpty = make_prototype("data", inline=True)
 #: The ``time`` element.
@@ -323,17 +328,17 @@ colgroup: PrototypeNonEmpty = make_prototype("colgroup")
 #: The ``col`` element.
 col: PrototypeEmpty = make_prototype("col", empty=True, omit_end_tag=True)
 #: The ``tbody`` element.
-tbody: PrototypeNonEmpty = make_prototype("tbody")
+tbody: PrototypeNonEmpty = make_prototype("tbody", omit_end_tag_before=["tbody", "tfoot"], omit_end_tag_last=True)
 #: The ``thead`` element.
-thead: PrototypeNonEmpty = make_prototype("thead")
+thead: PrototypeNonEmpty = make_prototype("thead", omit_end_tag_before=["tbody", "tfoot"])
 #: The ``tfoot`` element.
-tfoot: PrototypeNonEmpty = make_prototype("tfoot")
+tfoot: PrototypeNonEmpty = make_prototype("tfoot", omit_end_tag_last=True)
 #: The ``tr`` element.
-tr: PrototypeNonEmpty = make_prototype("tr")
+tr: PrototypeNonEmpty = make_prototype("tr", omit_end_tag_before=["tr"], omit_end_tag_last=True)
 #: The ``td`` element.
-td: PrototypeNonEmpty = make_prototype("td")
+td: PrototypeNonEmpty = make_prototype("td", omit_end_tag_before=["td", "th"], omit_end_tag_last=True)
 #: The ``th`` element.
-th: PrototypeNonEmpty = make_prototype("th")
+th: PrototypeNonEmpty = make_prototype("th", omit_end_tag_before=["td", "th"], omit_end_tag_last=True)
 #: The ``form`` element.
 form: PrototypeNonEmpty = make_prototype("form")
 #: The ``label`` element.
@@ -349,9 +354,9 @@ select: PrototypeNonEmpty = make_prototype("select", inline=True)
 #: The ``datalist`` element.
 datalist: PrototypeNonEmpty = make_prototype("datalist")
 #: The ``optgroup`` element.
-optgroup: PrototypeNonEmpty = make_prototype("optgroup")
+optgroup: PrototypeNonEmpty = make_prototype("optgroup", omit_end_tag_before=["optgroup", "hr"], omit_end_tag_last=True)
 #: The ``option`` element.
-option: PrototypeNonEmpty = make_prototype("option")
+option: PrototypeNonEmpty = make_prototype("option", omit_end_tag_before=["option", "optgroup", "hr"], omit_end_tag_last=True)
 #: The ``textarea`` element.
 textarea: PrototypeNonEmpty = make_prototype("textarea", inline=True)
 #: The ``output`` element.
@@ -382,4 +387,4 @@ template_ = template
 slot: PrototypeNonEmpty = make_prototype("slot")
 #: The ``canvas`` element.
 canvas: PrototypeNonEmpty = make_prototype("canvas")
-# [[[end]]] (checksum: 122bdfe2f4c7ca99f14dbdad1426dedb)
+# [[[end]]] (sum: EzksEUNWuw)
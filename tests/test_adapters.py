@@ -0,0 +1,213 @@
+import asyncio
+import gzip
+import time
+import zlib
+from typing import Any, TextIO
+
+import pytest
+
+from minihtml import Element, Node, asgi_response, template, wsgi_response
+from minihtml.tags import div
+
+
+class CountingNode(Node):
+    """A node that counts how often it has been rendered."""
+
+    count = 0
+
+    def __init__(self) -> None:
+        self._inline = False
+
+    def write(self, f: TextIO, indent: int = 0) -> None:
+        CountingNode.count += 1
+        f.write("x" * 100)
+
+
+@template()
+def big_page(n: int) -> Element:
+    return div(*[CountingNode() for _ in range(n)])
+
+
+@template()
+def broken_page() -> Element:
+    raise RuntimeError("oops")
+
+
+@pytest.fixture(autouse=True)
+def reset_count():
+    CountingNode.count = 0
+
+
+class StartResponse:
+    def __init__(self) -> None:
+        self.calls: list[tuple[str, list[tuple[str, str]]]] = []
+
+    def __call__(self, status: str, headers: list[tuple[str, str]]) -> None:
+        self.calls.append((status, headers))
+
+
+def test_wsgi_response_streams_chunks():
+    start_response = StartResponse()
+    chunks = list(
+        wsgi_response(
+            big_page(100),
+            start_response,
+            headers=[("Cache-Control", "no-cache")],
+            chunk_size=1000,
+        )
+    )
+
+    assert start_response.calls == [
+        (
+            "200 OK",
+            [
+                ("Content-Type", "text/html; charset=utf-8"),
+                ("Cache-Control", "no-cache"),
+            ],
+        )
+    ]
+    assert len(chunks) > 1
+    assert b"".join(chunks).decode() == big_page(100).render()
+
+
+def test_wsgi_response_stops_rendering_when_closed():
+    response = wsgi_response(big_page(1000), StartResponse(), chunk_size=1000)
+    next(response)
+    response.close()
+    time.sleep(0.1)
+
+    assert CountingNode.count < 1000
+
+
+def test_wsgi_response_raises_before_starting_response():
+    start_response = StartResponse()
+    with pytest.raises(RuntimeError):
+        list(wsgi_response(broken_page(), start_response))
+
+    assert start_response.calls == []
+
+
+class ASGIClient:
+    """A minimal in-process client for ASGI HTTP responses."""
+
+    def __init__(self, disconnect_after: int | None = None) -> None:
+        self.messages: list[dict[str, Any]] = []
+        self._disconnect_after = disconnect_after
+        self._disconnected = asyncio.Event()
+        self._request_sent = False
+
+    async def receive(self) -> dict[str, Any]:
+        if not self._request_sent:
+            self._request_sent = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        await self._disconnected.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(self, message: Any) -> None:
+        await asyncio.sleep(0)  # a slow client
+        self.messages.append(message)
+        bodies = [m for m in self.messages if m["type"] == "http.response.body"]
+        if self._disconnect_after and len(bodies) >= self._disconnect_after:
+            self._disconnected.set()
+
+    @property
+    def body(self) -> bytes:
+        return b"".join(
+            m["body"] for m in self.messages if m["type"] == "http.response.body"
+        )
+
+
+async def test_asgi_response_streams_chunks():
+    client = ASGIClient()
+    await asgi_response(
+        big_page(100),
+        client.receive,
+        client.send,
+        status=201,
+        headers=[("Cache-Control", "no-cache")],
+        chunk_size=1000,
+    )
+
+    start, *bodies = client.messages
+    assert start == {
+        "type": "http.response.start",
+        "status": 201,
+        "headers": [
+            (b"content-type", b"text/html; charset=utf-8"),
+            (b"cache-control", b"no-cache"),
+        ],
+    }
+    assert len(bodies) > 2
+    assert all(m["more_body"] for m in bodies[:-1])
+    assert bodies[-1] == {"type": "http.response.body", "body": b"", "more_body": False}
+    assert client.body.decode() == big_page(100).render()
+
+
+async def test_asgi_response_stops_rendering_on_disconnect():
+    client = ASGIClient(disconnect_after=1)
+    await asgi_response(big_page(1000), client.receive, client.send, chunk_size=1000)
+
+    assert CountingNode.count < 1000
+    assert client.messages[-1]["more_body"] is True
+
+
+async def test_asgi_response_stops_rendering_when_cancelled():
+    client = ASGIClient()
+    started = asyncio.Event()
+
+    async def send(message: Any) -> None:
+        started.set()
+        await asyncio.sleep(0.01)  # a very slow client
+        await client.send(message)
+
+    task = asyncio.create_task(
+        asgi_response(big_page(1000), client.receive, send, chunk_size=1000)
+    )
+    await started.wait()
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+    await asyncio.sleep(0.05)
+    count = CountingNode.count
+    await asyncio.sleep(0.1)
+    assert CountingNode.count == count < 1000
+
+
+async def test_asgi_response_raises_before_starting_response():
+    client = ASGIClient()
+    with pytest.raises(RuntimeError):
+        await asgi_response(broken_page(), client.receive, client.send)
+
+    assert client.messages == []
+
+
+def test_wsgi_response_with_gzip_compression():
+    start_response = StartResponse()
+    chunks = list(
+        wsgi_response(
+            big_page(100), start_response, compression="gzip", chunk_size=1000
+        )
+    )
+
+    _, headers = start_response.calls[0]
+    assert ("Content-Encoding", "gzip") in headers
+    assert ("Vary", "Accept-Encoding") in headers
+    assert len(chunks) > 1
+    assert gzip.decompress(b"".join(chunks)).decode() == big_page(100).render()
+
+
+@pytest.mark.parametrize("sync_flush", [True, False])
+async def test_asgi_response_with_deflate_compression(sync_flush: bool):
+    client = ASGIClient()
+    await asgi_response(
+        big_page(100),
+        client.receive,
+        client.send,
+        compression="deflate",
+        compresslevel=9,
+        sync_flush=sync_flush,
+    )
+
+    assert (b"content-encoding", b"deflate") in client.messages[0]["headers"]
+    assert zlib.decompress(client.body).decode() == big_page(100).render()
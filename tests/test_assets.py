@@ -0,0 +1,107 @@
+import base64
+import hashlib
+from pathlib import Path
+from textwrap import dedent
+
+from minihtml import (
+    Assets,
+    Element,
+    Slots,
+    component,
+    component_scripts,
+    component_styles,
+    safe,
+    template,
+)
+from minihtml.tags import body, div, head, html, script, style
+
+
+@component(
+    style=[style(".a { color: red }"), style(safe("a > b { color: blue }"))],
+    script=[script("// a"), script(type="module")("// module")],
+)
+def my_component(slots: Slots) -> Element:
+    return div["a"]
+
+
+def make_template(assets: Assets):
+    @template(assets=assets)
+    def my_template() -> Element:
+        return html(
+            head(component_styles()),
+            body(my_component(), component_scripts()),
+        )
+
+    return my_template
+
+
+def integrity(data: bytes) -> str:
+    return "sha384-" + base64.b64encode(hashlib.sha384(data).digest()).decode()
+
+
+def test_assets_are_written_to_files(tmp_path: Path):
+    assets = Assets(tmp_path / "assets", url_prefix="/static")
+    html = make_template(assets)().render()
+
+    css = b".a { color: red }\na > b { color: blue }"
+    css_name = hashlib.sha256(css).hexdigest()[:16] + ".css"
+    js = b"// a"
+    js_name = hashlib.sha256(js).hexdigest()[:16] + ".js"
+
+    assert (tmp_path / "assets" / css_name).read_bytes() == css
+    assert (tmp_path / "assets" / js_name).read_bytes() == js
+    assert sorted(p.name for p in (tmp_path / "assets").iterdir()) == sorted(
+        [css_name, js_name]
+    )
+
+    assert html == dedent(f"""\
+        <!doctype html>
+        <html>
+          <head>
+            <link rel="stylesheet" href="/static/{css_name}" integrity="{integrity(css)}" crossorigin="anonymous">
+          </head>
+          <body>
+            <div class="a"></div>
+            <script src="/static/{js_name}" integrity="{integrity(js)}" crossorigin="anonymous"></script>
+            <script type="module">// module</script>
+          </body>
+        </html>
+    """)
+
+
+def test_assets_manifest_preloads_with_cors(tmp_path: Path):
+    my_template = make_template(Assets(tmp_path, url_prefix="https://cdn.example.com"))
+    my_template().render()
+    manifest = my_template().manifest
+    assert manifest is not None
+    [css_url] = manifest.styles
+    assert css_url.startswith("https://cdn.example.com/")
+    assert manifest.crossorigin == (css_url, *manifest.scripts)
+    assert manifest.links()[0] == f"<{css_url}>; rel=preload; as=style; crossorigin"
+
+
+def test_assets_are_reused(tmp_path: Path):
+    assets = Assets(tmp_path)
+    my_template = make_template(assets)
+    first = my_template().render()
+
+    for path in tmp_path.iterdir():
+        path.write_text("modified")
+
+    assert my_template().render() == first
+    assert make_template(Assets(tmp_path))().render() == first
+    assert all(path.read_text() == "modified" for path in tmp_path.iterdir())
+
+
+def test_template_without_assets_is_unchanged():
+    @template()
+    def my_template() -> Element:
+        return div(component_styles(), my_component())
+
+    assert my_template().render(doctype=False) == dedent("""\
+        <div>
+          <style>.a { color: red }</style>
+          <style>a > b { color: blue }</style>
+          <div class="a"></div>
+        </div>
+    """)
@@ -0,0 +1,88 @@
+import pytest
+
+from minihtml import Element, table_from_rows, template
+from minihtml.tags import body, head, html, img, input, p, script, style
+
+
+def add_nonce(attrs: dict[str, str | None]) -> None:
+    attrs["nonce"] = "r4nd0m"
+
+
+scripts = script(src="app.js", defer=True)
+
+
+@template()
+def page() -> Element:
+    with html as elem:
+        head(scripts, style("p { color: red }"))
+        with body:
+            p("text")
+            img(src="a.png")
+    return elem
+
+
+def test_attribute_filters():
+    t = page()
+    assert t.render(
+        doctype=False, attribute_filters={"script": add_nonce, "style": add_nonce}
+    ) == (
+        "<html>\n"
+        "  <head>\n"
+        '    <script src="app.js" nonce="r4nd0m" defer></script>\n'
+        '    <style nonce="r4nd0m">p { color: red }</style>\n'
+        "  </head>\n"
+        "  <body>\n"
+        "    <p>text</p>\n"
+        '    <img src="a.png">\n'
+        "  </body>\n"
+        "</html>\n"
+    )
+    # The elements are not modified.
+    assert str(scripts) == '<script src="app.js" defer></script>'
+
+
+def test_attribute_filters_minified():
+    def lazy(attrs: dict[str, str | None]) -> None:
+        attrs["loading"] = "lazy"
+        attrs["hidden"] = None
+
+    assert page().render(
+        minify=True, doctype=False, attribute_filters={"img": lazy, "p": add_nonce}
+    ) == (
+        "<html><head><script src=app.js defer></script>"
+        "<style>p { color: red }</style><body><p nonce=r4nd0m>text</p>"
+        "<img src=a.png loading=lazy hidden></html>"
+    )
+
+
+def test_attribute_filters_remove_and_escape():
+    def rewrite(attrs: dict[str, str | None]) -> None:
+        del attrs["disabled"]
+        attrs["value"] = '"quoted"'
+
+    @template()
+    def t() -> Element:
+        return input(value="x", disabled=True)
+
+    assert t().render(doctype=False, attribute_filters={"input": rewrite}) == (
+        '<input value="&quot;quoted&quot;">\n'
+    )
+
+
+def test_attribute_filters_invalid_name():
+    def invalid(attrs: dict[str, str | None]) -> None:
+        attrs["a b"] = "c"
+
+    with pytest.raises(ValueError, match="Invalid attribute name"):
+        page().render(attribute_filters={"p": invalid})
+
+
+def test_attribute_filters_table():
+    @template()
+    def t() -> Element:
+        return table_from_rows([[1]], class_="data")
+
+    html = t().render(
+        doctype=False, minify=True, attribute_filters={"table": add_nonce}
+    )
+    assert html.startswith("<table class=data nonce=r4nd0m>")
@@ -0,0 +1,116 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+from minihtml import Build, Element, Slots, component, depends_on, template
+from minihtml.tags import div, html, p, style
+
+rendered: list[str] = []
+
+
+@component(style=style(".card {}"))
+def card(slots: Slots, text: str) -> Element:
+    return div["card"](text)
+
+
+@template()
+def page(path: Path) -> Element:
+    rendered.append(path.name)
+    depends_on(path)
+    return html(card(path.read_text()))
+
+
+def build_site(tmp_path: Path, key: str = "", minify: bool = False) -> list[str]:
+    rendered.clear()
+    with Build(tmp_path / "state.json") as build:
+        for name in ["a", "b"]:
+            build.render(
+                tmp_path / "out" / f"{name}.html",
+                page(tmp_path / name),
+                key=key,
+                minify=minify,
+            )
+    return sorted(rendered)
+
+
+def test_build_only_renders_changed_pages(tmp_path: Path):
+    (tmp_path / "a").write_text("first")
+    (tmp_path / "b").write_text("second")
+
+    assert build_site(tmp_path) == ["a", "b"]
+    assert (tmp_path / "out" / "a.html").read_text() == page(tmp_path / "a").render()
+    assert build_site(tmp_path) == []
+
+    (tmp_path / "b").write_text("changed")
+    assert build_site(tmp_path) == ["b"]
+    assert "changed" in (tmp_path / "out" / "b.html").read_text()
+
+    (tmp_path / "out" / "a.html").unlink()
+    assert build_site(tmp_path) == ["a"]
+
+    assert build_site(tmp_path, key="v2") == ["a", "b"]
+    assert build_site(tmp_path, key="v2") == []
+
+
+def test_build_renders_pages_again_when_minify_changes(tmp_path: Path):
+    (tmp_path / "a").write_text("first")
+    (tmp_path / "b").write_text("second")
+    assert build_site(tmp_path) == ["a", "b"]
+
+    assert build_site(tmp_path, minify=True) == ["a", "b"]
+    assert (tmp_path / "out" / "a.html").read_text() == page(tmp_path / "a").render(
+        minify=True
+    )
+    assert build_site(tmp_path, minify=True) == []
+    assert build_site(tmp_path) == ["a", "b"]
+
+
+def test_build_renders_pages_again_when_components_change(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+):
+    (tmp_path / "a").write_text("first")
+    (tmp_path / "b").write_text("second")
+    assert build_site(tmp_path) == ["a", "b"]
+
+    @component(style=style(".card { color: red }"))
+    def new_card(slots: Slots, text: str) -> Element:
+        return div["card"](text)
+
+    monkeypatch.setattr(sys.modules[__name__], "card", new_card)
+    assert build_site(tmp_path) == ["a", "b"]
+
+
+def test_build_always_renders_local_templates(tmp_path: Path):
+    @template()
+    def local_page() -> Element:
+        rendered.append("local")
+        return p("local")
+
+    for _ in range(2):
+        rendered.clear()
+        with Build(tmp_path / "state.json") as build:
+            assert build.render(tmp_path / "local.html", local_page())
+        assert rendered == ["local"]
+
+
+def test_dependency_fingerprints(tmp_path: Path):
+    (tmp_path / "a").write_text("first")
+    t = page(tmp_path / "a")
+    t.render()
+    assert t.name == "test_build:page"
+
+    fingerprints = t.dependencies.fingerprints()
+    names = list(fingerprints)
+    assert names[:2] == ["template:test_build:page", "component:test_build:card"]
+    assert names[2].startswith("style:")
+    assert names[3] == f"file:{tmp_path / 'a'}"
+
+    t.render()
+    assert t.dependencies.fingerprints() == fingerprints
+    (tmp_path / "a").write_text("changed")
+    t.render()
+    changed = t.dependencies.fingerprints()
+    assert [name for name in names if changed[name] != fingerprints[name]] == [
+        f"file:{tmp_path / 'a'}"
+    ]
@@ -0,0 +1,79 @@
+import pytest
+
+from minihtml import (
+    Element,
+    ElementEmpty,
+    ElementNonEmpty,
+    element,
+    from_data,
+    template,
+)
+from minihtml.tags import a, div, img, li, p, td, tr, ul
+
+
+def test_element_matches_prototype():
+    elem = element("ul", element("li", "one"), element("li", element("a", "two")))
+    assert isinstance(elem, ElementNonEmpty)
+    assert str(elem) == str(ul(li("one"), li(a("two"))))
+
+
+def test_element_attributes():
+    elem = element("div", class_="box", data_id="1", hidden=True)
+    assert str(elem) == '<div class="box" data-id="1" hidden></div>'
+
+
+def test_element_empty():
+    elem = element("img", src="a.png")
+    assert isinstance(elem, ElementEmpty)
+    assert str(elem) == str(img(src="a.png"))
+
+    with pytest.raises(ValueError, match="cannot have content"):
+        element("img", "content")
+
+
+def test_element_alias():
+    assert str(element("del", "x")) == "<del>x</del>"
+
+
+def test_element_custom_tag():
+    elem = element("my-widget", p("x"))
+    assert str(elem) == "<my-widget>\n  <p>x</p>\n</my-widget>"
+
+
+def test_element_keeps_omitted_end_tags():
+    @template()
+    def page() -> Element:
+        return element("tr", element("td", "1"), element("td", "2"))
+
+    @template()
+    def expected() -> ElementNonEmpty:
+        return tr(td("1"), td("2"))
+
+    assert page().render(minify=True) == expected().render(minify=True)
+
+
+def test_element_is_not_added_to_context():
+    with div as elem:
+        p("one")
+        element("p", "two")
+    assert str(elem) == "<div>\n  <p>one</p>\n</div>"
+
+
+def test_from_data():
+    data = ("ul", {"class": "items"}, ("li", "one"), ["li", ("b", "two")], "three")
+    assert str(from_data(data)) == (
+        '<ul class="items">\n  <li>one</li>\n  <li><b>two</b></li>\n  three\n</ul>'
+    )
+
+
+def test_from_data_nodes():
+    assert str(from_data(("div", p("x"), "<y>"))) == str(div(p("x"), "<y>"))
+    assert str(from_data("<text>")) == "&lt;text&gt;"
+
+
+def test_from_data_invalid():
+    with pytest.raises(ValueError, match="Invalid element data"):
+        from_data(())
+
+    with pytest.raises(ValueError, match="Unexpected attributes"):
+        from_data(("div", "x", {"class": "y"}))
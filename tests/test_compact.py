@@ -0,0 +1,99 @@
+import pytest
+
+from minihtml import (
+    CircularReferenceError,
+    Element,
+    Node,
+    Text,
+    fragment,
+    safe,
+    template,
+    text,
+)
+from minihtml.tags import a, b, div, em, i, li, p, rp, rt, ruby, span, ul
+
+
+def build() -> Element:
+    with div as elem:
+        with p:
+            text("one ")
+            safe("<i>two</i>")
+            text(" & three")
+        p(b("bold"), " and ", em("em", i("nested")), a(href="#")("link"))
+        with ul:
+            li("x", fragment("y", "z"))
+            li(span["cls"]("attrs"))
+        ruby("漢", rp("("), rt("kan"), rp(")"))
+    return elem
+
+
+@pytest.mark.parametrize("minify", [False, True])
+def test_compact_output_is_unchanged(minify: bool):
+    @template()
+    def original() -> Element:
+        return build()
+
+    @template()
+    def compacted() -> Node:
+        return build().compact()
+
+    assert compacted().render(minify=minify) == original().render(minify=minify)
+
+
+def test_compact_merges_text():
+    elem = p("a", "<b>", safe("<i>c</i>"))
+    assert elem.compact() is elem
+    assert len(list(elem.iter_events())) == 3
+    assert str(elem) == "<p>a&lt;b&gt;<i>c</i></p>"
+
+
+def test_compact_collapses_inline_elements():
+    node = b("x", em("y"))
+    compacted = node.compact()
+    assert isinstance(compacted, Text)
+    assert str(compacted) == "<b>x<em>y</em></b>"
+
+
+def test_compact_keeps_elements():
+    for node in [span["cls"]("x"), b(hidden=True), div("x"), b(div("x"))]:
+        expected = str(node)
+        assert node.compact() is node
+        assert str(node) == expected
+
+
+def test_compact_fragment():
+    f = fragment("a", fragment("b", b("c")), p("d"))
+    expected = str(f)
+    f.compact()
+    assert str(f) == expected
+    assert len(list(f.get_nodes())) == 2
+
+
+def test_compact_circular_reference():
+    elem = div(p("x"))
+    elem(elem)
+    with pytest.raises(CircularReferenceError):
+        elem.compact()
+
+
+def test_compact_shared_nodes():
+    shared: Node = p("a", "b")
+    elem = div(shared, span(shared), shared)
+    expected = str(elem)
+    elem.compact()
+    assert str(elem) == expected
+
+
+def test_compact_pre_rendered_elements_are_not_transformed():
+    @template()
+    def compacted() -> Node:
+        return p("a ", b("bold"), span["cls"]("attrs")).compact()
+
+    def add_title(elem: Element) -> Element:
+        return elem.copy()(title="t")
+
+    assert compacted().render(doctype=False, transforms=[add_title]) == (
+        '<p title="t">a <b>bold</b><span class="cls" title="t">attrs</span></p>\n'
+    )
+    with pytest.raises(ValueError, match="No element matches"):
+        compacted().render(select="b")
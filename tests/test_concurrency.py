@@ -1,5 +1,7 @@
 import asyncio
 import sys
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import copy_context
 from textwrap import dedent
 
 if sys.version_info >= (3, 11):
@@ -8,6 +10,7 @@ else:
     from taskgroup import TaskGroup
 
 from minihtml import Element, make_prototype
+from minihtml._core import _rendering_context  # pyright: ignore[reportPrivateUsage]
 
 div = make_prototype("div")
 
@@ -38,3 +41,30 @@ async def test_concurrent_templates():
           <div>b-1</div>
           <div>b-2</div>
         </div>""")
+
+
+def test_render_shared_tree_from_multiple_threads():
+    with div["outer"] as elem:
+        for i in range(100):
+            div(str(i))
+    expected = str(elem)
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        futures = [executor.submit(str, elem) for _ in range(100)]
+        results = [f.result() for f in futures]
+
+    assert results == [expected] * 100
+
+
+def test_rendering_does_not_leak_context_into_new_threads():
+    elem = div(div("inner"))
+    str(elem)
+
+    # Threads created here may inherit the current context (this is the default
+    # on free-threaded builds). Rendering there must not see stale state.
+    ctx = copy_context()
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        result = executor.submit(ctx.run, str, elem).result()
+
+    assert result == "<div>\n  <div>inner</div>\n</div>"
+    assert ctx.get(_rendering_context) is None
@@ -0,0 +1,168 @@
+import json
+from dataclasses import dataclass, field
+from html.parser import HTMLParser
+from typing import Any
+
+import pytest
+
+from minihtml import Element, Node, diff, text
+from minihtml.tags import b, div, img, input, li, p, span, ul
+
+VOID_TAGS = {"img", "input", "br", "hr", "meta", "link"}
+
+
+@dataclass
+class DomElement:
+    tag: str
+    attrs: dict[str, str | None]
+    children: list["DomElement | str"] = field(default_factory=list["DomElement | str"])
+
+    @property
+    def elements(self) -> list["DomElement"]:
+        return [c for c in self.children if isinstance(c, DomElement)]
+
+
+class Parser(HTMLParser):
+    def __init__(self) -> None:
+        super().__init__()
+        self.root = DomElement("#root", {})
+        self.stack = [self.root]
+
+    def handle_starttag(self, tag: str, attrs: list[tuple[str, str | None]]) -> None:
+        elem = DomElement(tag, dict(attrs))
+        self.stack[-1].children.append(elem)
+        if tag not in VOID_TAGS:
+            self.stack.append(elem)
+
+    def handle_endtag(self, tag: str) -> None:
+        self.stack.pop()
+
+    def handle_data(self, data: str) -> None:
+        if data.strip():
+            self.stack[-1].children.append(data.strip())
+
+
+def parse(html: str) -> list["DomElement | str"]:
+    parser = Parser()
+    parser.feed(html)
+    return parser.root.children
+
+
+def apply_patch(root: DomElement, patches: list[dict[str, Any]]) -> DomElement:
+    # A Python version of examples/patch.js, operating on a minimal DOM.
+    container = DomElement("#container", {}, [root])
+
+    def resolve(path: list[int]) -> tuple[DomElement, DomElement]:
+        parent, elem = container, container.elements[0]
+        for i in path:
+            parent, elem = elem, elem.elements[i]
+        return parent, elem
+
+    for patch in patches:
+        parent, elem = resolve(patch["path"])
+        match patch["op"]:
+            case "replace":
+                parent.children[parent.children.index(elem)] = parse(patch["html"])[0]
+            case "set_attr":
+                elem.attrs[patch["name"]] = patch["value"]
+            case "remove_attr":
+                del elem.attrs[patch["name"]]
+            case "insert":
+                siblings, index = elem.elements, int(patch["index"])
+                new = parse(patch["html"])[0]
+                if index < len(siblings):
+                    elem.children.insert(elem.children.index(siblings[index]), new)
+                else:
+                    elem.children.append(new)
+            case "remove":
+                parent.children.remove(elem)
+            case op:
+                raise AssertionError(op)
+    return container.elements[0]
+
+
+def check(old: Node, new: Node) -> list[dict[str, Any]]:
+    patches = json.loads(json.dumps(diff(old, new)))
+    (dom,) = parse(str(old))
+    assert isinstance(dom, DomElement)
+    assert [apply_patch(dom, patches)] == parse(str(new))
+    return patches
+
+
+def items(*keys: str) -> Element:
+    return ul(*[li[f"#{key}"](key) for key in keys])
+
+
+def test_diff_identical():
+    assert check(div(p("x"), img(src="a")), div(p("x"), img(src="a"))) == []
+
+
+def test_diff_attributes():
+    patches = check(
+        div["a"](input(value="1", disabled=True)),
+        div["b"](id="x")(input(value="2")),
+    )
+    assert patches == [
+        {"op": "set_attr", "path": [], "name": "class", "value": "b"},
+        {"op": "set_attr", "path": [], "name": "id", "value": "x"},
+        {"op": "set_attr", "path": [0], "name": "value", "value": "2"},
+        {"op": "remove_attr", "path": [0], "name": "disabled"},
+    ]
+
+
+def test_diff_text_replaces_element():
+    patches = check(div(p("a", b("b")), p("c")), div(p("a", b("B")), p("c")))
+    assert patches == [{"op": "replace", "path": [0], "html": "<p>a<b>B</b></p>"}]
+
+
+@pytest.mark.parametrize(
+    "old, new",
+    [
+        (["a", "b", "c"], ["a", "b", "c", "d"]),
+        (["a", "b", "c"], ["d", "a", "b", "c"]),
+        (["a", "b", "c"], ["a", "c"]),
+        (["a", "b", "c"], ["c", "b", "a"]),
+        (["a", "b", "c"], ["x", "y"]),
+        (["a", "b", "c"], []),
+        ([], ["a"]),
+    ],
+)
+def test_diff_keyed_children(old: list[str], new: list[str]):
+    check(items(*old), items(*new))
+
+
+def test_diff_keyed_children_are_not_recreated():
+    patches = check(items("a", "b", "c"), items("x", "a", "b", "c"))
+    assert patches == [
+        {"op": "insert", "path": [], "index": 0, "html": '<li id="x">x</li>'}
+    ]
+
+
+def test_diff_unkeyed_children():
+    check(div(p("a"), span("b")), div(p("a"), span("c"), p("d")))
+    check(div(p("a"), span("b"), p("c")), div(p("a")))
+
+
+def test_diff_nested():
+    with div as old:
+        with ul["#list"]:
+            li("a")
+            li(b("b"))
+        text("")
+    new = div(ul["#list"](li("a"), li(b("c"))), p("x"))
+    check(div(old), div(new))
+    check(div(items("a"), items("b")), div(items("a", "b"), items()))
+
+
+def test_diff_root_replaced():
+    assert check(div("a"), p("b")) == [
+        {"op": "replace", "path": [], "html": "<p>b</p>"}
+    ]
+
+
+def test_element_accessors():
+    elem = div["#main wide"](hidden=True)(p("a"), "b")
+    assert elem.tag == "div"
+    assert elem.attributes == {"id": "main", "class": "wide", "hidden": None}
+    assert [str(child) for child in elem.children] == ["<p>a</p>", "b"]
+    assert img(src="x").attributes == {"src": "x"}
@@ -3,7 +3,13 @@ from textwrap import dedent
 import pytest
 from pytest import raises as assert_raises
 
-from minihtml import CircularReferenceError, make_prototype, safe, text
+from minihtml import (
+    AttributeEvent,
+    CircularReferenceError,
+    make_prototype,
+    safe,
+    text,
+)
 
 div = make_prototype("div")
 span = make_prototype("span", inline=True)
@@ -101,6 +107,19 @@ def test_attribute_names_are_validated(name: str):
         img(**{name: "test"})
 
 
+def test_attribute_names_are_validated_every_time():
+    for _ in range(2):
+        with assert_raises(ValueError, match="Invalid attribute name"):
+            div(**{"a b": "test"})
+
+
+def test_many_attribute_names():
+    attrs = {f"data_{i}": str(i) for i in range(2000)}
+    elem = div(**attrs)
+    assert str(elem).endswith('data-1999="1999"></div>')
+    assert str(div(**attrs)) == str(elem)
+
+
 def test_text_contend_is_escaped():
     assert str(div('hello"<world>&')) == '<div>hello"&lt;world&gt;&amp;</div>'
 
@@ -113,6 +132,27 @@ def test_indexing_adds_class_names():
     assert str(img["myclass"]["otherclass"]) == '<img class="myclass otherclass">'
 
 
+def test_indexing_adds_each_class_name_once():
+    assert str(div["a b a"]) == '<div class="a b"></div>'
+    elem = div["a"]
+    for name in ["b", "a", "c", "b"] * 100:
+        elem[name]
+    assert str(elem) == '<div class="a b c"></div>'
+    assert str(div(class_="a b")["b c"]) == '<div class="a b c"></div>'
+
+
+def test_indexing_keeps_attribute_order():
+    elem = div(title="t", class_="a")(id="x")["b"]
+    assert str(elem) == '<div title="t" class="a b" id="x"></div>'
+    assert elem.attributes == {"title": "t", "class": "a b", "id": "x"}
+    elem["c"](class_="d")["e"]
+    assert str(elem) == '<div title="t" class="d e" id="x"></div>'
+    elem["f"]
+    assert AttributeEvent("class", "d e f") in elem.iter_events()
+    assert str(elem.copy()["g"]) == '<div title="t" class="d e f g" id="x"></div>'
+    assert str(elem) == '<div title="t" class="d e f" id="x"></div>'
+
+
 def test_indexing_sets_hashtag_id():
     assert str(div["#blue"]) == '<div id="blue"></div>'
     assert str(div["green #blue"]) == '<div id="blue" class="green"></div>'
@@ -0,0 +1,92 @@
+from pytest import raises as assert_raises
+
+from minihtml import (
+    AttributeEvent,
+    CircularReferenceError,
+    Element,
+    EndEvent,
+    Slots,
+    StartEvent,
+    TextEvent,
+    component,
+    component_styles,
+    independent,
+    make_prototype,
+    safe,
+    template,
+)
+from minihtml.tags import a, div, head, html, img, p, style
+
+span = make_prototype("span", inline=True)
+
+
+def test_element_events():
+    elem = div["#main"](
+        p("Hello, ", a(href="/world")("world"), safe("&nbsp;!")),
+        img(src="a.png", hidden=True),
+    )
+
+    assert list(elem.iter_events()) == [
+        StartEvent("div"),
+        AttributeEvent("id", "main"),
+        StartEvent("p"),
+        TextEvent("Hello, "),
+        StartEvent("a"),
+        AttributeEvent("href", "/world"),
+        TextEvent("world"),
+        EndEvent("a"),
+        TextEvent("&nbsp;!", safe=True),
+        EndEvent("p"),
+        StartEvent("img"),
+        AttributeEvent("src", "a.png"),
+        AttributeEvent("hidden", None),
+        EndEvent("img"),
+        EndEvent("div"),
+    ]
+
+
+def test_text_is_not_escaped_in_events():
+    assert list(span("a < b").iter_events()) == [
+        StartEvent("span"),
+        TextEvent("a < b"),
+        EndEvent("span"),
+    ]
+
+
+def test_independent_and_resource_nodes_are_transparent():
+    @component(style=style("body {}"))
+    def my_component(slots: Slots) -> Element:
+        return p("hello")
+
+    trees: list[Element] = []
+
+    @template()
+    def my_template() -> Element:
+        elem = html(head(component_styles()), independent(div(my_component())))
+        trees.append(elem)
+        return elem
+
+    my_template().render()
+
+    assert list(trees[0].iter_events()) == [
+        StartEvent("html"),
+        StartEvent("head"),
+        StartEvent("style"),
+        TextEvent("body {}"),
+        EndEvent("style"),
+        EndEvent("head"),
+        StartEvent("div"),
+        StartEvent("p"),
+        TextEvent("hello"),
+        EndEvent("p"),
+        EndEvent("div"),
+        EndEvent("html"),
+    ]
+
+
+def test_circular_reference_raises_error():
+    elem = div()
+    elem(div(elem))
+
+    with assert_raises(CircularReferenceError):
+        list(elem.iter_events())
@@ -0,0 +1,104 @@
+from collections.abc import Iterator
+
+import pytest
+
+from minihtml import (
+    Element,
+    Slots,
+    component,
+    fragment,
+    set_escape_function,
+    table_from_rows,
+)
+from minihtml.tags import div, li, p, span, ul
+
+
+class Markup(str):
+    # A minimal version of markupsafe.Markup
+    def __html__(self) -> str:
+        return self
+
+
+class Widget:
+    def __html__(self) -> str:
+        return '<input name="q">'
+
+
+def test_html_content():
+    elem = div(Markup("<b>bold</b>"), Widget(), "<plain>")
+    assert str(elem) == '<div><b>bold</b><input name="q">&lt;plain&gt;</div>'
+
+
+def test_html_content_in_context():
+    with p as elem:
+        span(Markup("&amp;"))
+    assert str(elem) == "<p><span>&amp;</span></p>"
+
+
+def test_html_content_in_iterator():
+    def items() -> Iterator[Markup]:
+        yield Markup("<li>a</li>")
+
+    assert str(ul(items())) == "<ul>\n  <li>a</li>\n</ul>"
+
+
+def test_str_subclass_without_html_is_escaped():
+    class Name(str):
+        pass
+
+    assert str(p(Name("<x>"))) == "<p>&lt;x&gt;</p>"
+
+
+@component()
+def card(slots: Slots) -> Element:
+    return div["card"](p("card"))
+
+
+def test_html_method():
+    assert p("<x>").__html__() == "<p>&lt;x&gt;</p>"
+    assert fragment(li("a"), "b").__html__() == "<li>a</li>\nb"
+    assert card().__html__() == '<div class="card">\n  <p>card</p>\n</div>'
+
+
+@pytest.fixture
+def custom_escape() -> Iterator[None]:
+    def escape(s: str) -> str:
+        return s.replace("&", "&#38;").replace("<", "&#60;").replace('"', "&#34;")
+
+    set_escape_function(escape)
+    yield
+    set_escape_function(None)
+
+
+@pytest.mark.usefixtures("custom_escape")
+def test_set_escape_function():
+    elem = div(title='"&"')("<&>", table_from_rows([["<"]]))
+    assert str(elem) == (
+        '<div title="&#34;&#38;&#34;">\n'
+        "  &#60;&#38;>\n"
+        "  <table>\n"
+        "    <tbody>\n"
+        "      <tr>\n"
+        "        <td>&#60;</td>\n"
+        "      </tr>\n"
+        "    </tbody>\n"
+        "  </table>\n"
+        "</div>"
+    )
+
+
+def test_markupsafe():
+    markupsafe = pytest.importorskip("markupsafe")
+    assert str(p(markupsafe.Markup("<b>x</b>"))) == "<p><b>x</b></p>"
+    set_escape_function(markupsafe.escape)
+    try:
+        assert str(p(title="'\"")("<'>")) == ('<p title="&#39;&#34;">&lt;&#39;&gt;</p>')
+    finally:
+        set_escape_function(None)
+    assert markupsafe.Markup("{}").format(p("x")) == "<p>x</p>"
+
+
+@pytest.mark.parametrize("content", [5, None, ["a"], b"bytes"])
+def test_invalid_content_raises_type_error(content: object):
+    with pytest.raises(TypeError, match="Invalid content"):
+        div(content)  # pyright: ignore[reportArgumentType]
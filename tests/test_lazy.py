@@ -0,0 +1,142 @@
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from minihtml import (
+    Element,
+    Slots,
+    component,
+    component_scripts,
+    component_styles,
+    independent,
+    template,
+)
+from minihtml.tags import body, div, head, html, li, p, script, style, table, td, tr, ul
+
+
+def test_iterator_is_consumed_when_rendering():
+    consumed: list[int] = []
+
+    def items() -> Iterator[Element]:
+        for i in range(3):
+            consumed.append(i)
+            yield li(str(i))
+
+    elem = ul(items())
+    assert consumed == []
+
+    assert str(elem) == "<ul>\n  <li>0</li>\n  <li>1</li>\n  <li>2</li>\n</ul>"
+    assert consumed == [0, 1, 2]
+
+
+def test_iterator_matches_eager_output():
+    eager = table(*[tr(td(str(i)), td("<x>")) for i in range(3)])
+    lazy = table(tr(td(str(i)), td("<x>")) for i in range(3))
+    assert str(lazy) == str(eager)
+
+
+def test_iterator_is_block_content():
+    elem = p("a", (str(i) for i in range(2)), "b")
+    assert str(elem) == "<p>\n  a\n  0\n  1\n  b\n</p>"
+
+
+def test_elements_created_by_iterator_are_not_registered():
+    def rows() -> Iterator[Element]:
+        for i in range(2):
+            with tr() as row:
+                td(str(i))
+            yield row
+
+    @template()
+    def page() -> Element:
+        with div() as elem:
+            table(rows())
+            p("done")
+        return elem
+
+    assert page().render(doctype=False) == (
+        "<div>\n"
+        "  <table>\n"
+        "    <tr>\n"
+        "      <td>0</td>\n"
+        "    </tr>\n"
+        "    <tr>\n"
+        "      <td>1</td>\n"
+        "    </tr>\n"
+        "  </table>\n"
+        "  <p>done</p>\n"
+        "</div>\n"
+    )
+
+
+def test_iterator_minified():
+    @template()
+    def page() -> Element:
+        return table(tr(td(str(i))) for i in range(2))
+
+    assert page().render(minify=True, doctype=False) == (
+        "<table><tr><td>0<tr><td>1</table>"
+    )
+
+
+def test_iterator_can_only_be_rendered_once():
+    elem = ul(li(str(i)) for i in range(2))
+    str(elem)
+    with pytest.raises(RuntimeError):
+        str(elem)
+
+
+@component(style=style(".row {}"), script=script("row()"))
+def row(slots: Slots, i: int) -> Element:
+    return li["row"](str(i))
+
+
+def test_components_in_iterator_add_styles_and_scripts():
+    @template()
+    def page() -> Element:
+        with html as elem:
+            with body:
+                ul(row(i) for i in range(2))
+                component_styles()
+                component_scripts()
+        return elem
+
+    output = page().render()
+    assert "<style>.row {}</style>" in output
+    assert "<script>row()</script>" in output
+
+
+def test_components_in_iterator_after_placeholder_raise_error():
+    @template()
+    def page() -> Element:
+        with html as elem:
+            with head:
+                component_styles()
+            with body:
+                ul(row(i) for i in range(2))
+                component_scripts()
+        return elem
+
+    with pytest.raises(RuntimeError, match=r"after component_styles\(\)"):
+        page().render()
+
+
+def test_components_in_iterator_in_independent_subtree():
+    @template()
+    def page(eager: bool) -> Element:
+        with html as elem:
+            with head:
+                component_styles()
+            with body:
+                if eager:
+                    row(0)
+                independent(ul(row(i) for i in range(2)))
+                component_scripts()
+        return elem
+
+    # Iterators can not be pickled, so this requires worker threads.
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        assert "<style>.row {}</style>" in page(eager=True).render(parallel=executor)
+        with pytest.raises(RuntimeError, match="parallel"):
+            page(eager=False).render(parallel=executor)
@@ -0,0 +1,140 @@
+from minihtml import Element, independent, make_prototype, safe, template, text
+from minihtml.tags import (
+    a,
+    body,
+    canvas,
+    dd,
+    div,
+    dl,
+    dt,
+    head,
+    html,
+    img,
+    input_,
+    li,
+    option,
+    p,
+    select,
+    slot,
+    span,
+    table,
+    td,
+    th,
+    thead,
+    title,
+    tr,
+    ul,
+)
+
+
+def render(elem: Element) -> str:
+    @template()
+    def t() -> Element:
+        return elem
+
+    return t().render(doctype=False, minify=True)
+
+
+def test_minified_document():
+    @template()
+    def t() -> Element:
+        with html(lang="en") as elem:
+            with head:
+                title("hello")
+            with body:
+                with div["#content"]:
+                    p("Welcome to ", a(href="/")("my website"))
+        return elem
+
+    assert t().render(minify=True) == (
+        "<!doctype html>"
+        "<html lang=en><head><title>hello</title>"
+        '<body><div id=content><p>Welcome to <a href="/">my website</a></div>'
+        "</html>"
+    )
+
+
+def test_attribute_values_are_quoted_only_when_needed():
+    elem = div(
+        id="main",
+        class_="a b",
+        title="",
+        data_x="a=b",
+        data_y="it's",
+        data_z="`",
+        hidden=True,
+    )
+
+    assert render(elem) == (
+        '<div id=main class="a b" title="" data-x="a=b" data-y=it&#x27;s '
+        'data-z="`" hidden></div>'
+    )
+    assert render(img(src="a.png")) == "<img src=a.png>"
+
+
+def test_list_end_tags_are_omitted():
+    assert render(ul(li("one"), li("two"))) == "<ul><li>one<li>two</ul>"
+
+
+def test_table_end_tags_are_omitted():
+    elem = table(
+        thead(tr(th("a"), th("b"))),
+        tr(td("1"), td("2")),
+        tr(td("3"), td("4")),
+    )
+
+    assert render(elem) == (
+        "<table><thead><tr><th>a<th>b</thead><tr><td>1<td>2<tr><td>3<td>4</table>"
+    )
+
+
+def test_definition_list_end_tags():
+    elem = dl(dt("term"), dd("definition"), dt("last term"))
+
+    assert render(elem) == "<dl><dt>term<dd>definition<dt>last term</dt></dl>"
+
+
+def test_option_end_tags_are_omitted():
+    assert render(select(option("a"), option("b"))) == (
+        "<select><option>a<option>b</select>"
+    )
+
+
+def test_paragraph_end_tags():
+    assert render(div(p("a"), p("b"), div())) == "<div><p>a<p>b<div></div></div>"
+    assert render(div(p("a"), span("b"))) == "<div><p>a</p><span>b</span></div>"
+    assert render(div(p("a"), input_())) == "<div><p>a</p><input></div>"
+    assert render(a(p("a"))) == "<a><p>a</p></a>"
+    assert render(slot(p("a"))) == "<slot><p>a</p></slot>"
+    assert render(canvas(p("a"))) == "<canvas><p>a</p></canvas>"
+
+
+def test_paragraph_end_tags_in_custom_elements():
+    card = make_prototype("x-card")
+    assert render(card(p("a"))) == "<x-card><p>a</p></x-card>"
+    assert render(card(p("a"), p("b"))) == "<x-card><p>a<p>b</p></x-card>"
+
+
+def test_end_tags_are_kept_before_text():
+    with ul as elem:
+        li("one")
+        text("two")
+
+    assert render(elem) == "<ul><li>one</li>two</ul>"
+
+
+def test_minified_safe_text_is_unchanged():
+    assert render(div(safe("<b>\n  bold\n</b>"))) == "<div><b>\n  bold\n</b></div>"
+
+
+def test_minify_independent_subtrees():
+    @template()
+    def t() -> Element:
+        with div as elem:
+            for i in range(3):
+                independent(ul(li(str(i)), li("x")))
+        return elem
+
+    assert t().render(doctype=False, minify=True, parallel=2) == (
+        "<div><ul><li>0<li>x</ul><ul><li>1<li>x</ul><ul><li>2<li>x</ul></div>"
+    )
@@ -0,0 +1,100 @@
+import multiprocessing
+from collections.abc import Iterator
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from html import escape
+from textwrap import dedent
+
+import pytest
+
+from minihtml import Element, independent, set_escape_function, template, text
+from minihtml.tags import body, html, p, section
+
+EXPECTED = dedent("""\
+    <!doctype html>
+    <html>
+      <body>
+        <p>intro</p>
+        <section>
+          <p>section 0</p>
+        </section>
+        <section>
+          <p>section 1</p>
+        </section>
+        <section>
+          <p>section 2</p>
+        </section>
+        <p>outro</p>
+      </body>
+    </html>
+""")
+
+
+@template()
+def report() -> Element:
+    with html as elem:
+        with body:
+            p("intro")
+            for i in range(3):
+                with section as s:
+                    p(f"section {i}")
+                independent(s)
+            p("outro")
+    return elem
+
+
+def test_independent_nodes_render_normally():
+    assert report().render() == EXPECTED
+
+
+def test_render_independent_subtrees_in_worker_processes():
+    assert report().render(parallel=2) == EXPECTED
+
+
+def test_render_independent_subtrees_with_executor():
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        assert report().render(parallel=executor) == EXPECTED
+
+
+def test_independent_inline_node():
+    with p as elem:
+        text("a")
+        independent(text("b"))
+        text("c")
+
+    assert str(elem) == "<p>abc</p>"
+
+
+def test_unpicklable_options_with_worker_processes():
+    def add_nonce(attrs: dict[str, str | None]) -> None:
+        attrs["nonce"] = "abc"
+
+    with pytest.raises(ValueError, match="attribute_filters can not be sent"):
+        report().render(parallel=2, attribute_filters={"p": add_nonce})
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        output = report().render(parallel=executor, attribute_filters={"p": add_nonce})
+    assert output.count('<p nonce="abc">') == 5
+
+
+def escape_quotes(s: str) -> str:
+    return escape(s).replace("&quot;", "&#34;")
+
+
+@pytest.fixture
+def custom_escape() -> Iterator[None]:
+    set_escape_function(escape_quotes)
+    yield
+    set_escape_function(None)
+
+
+def test_escape_function_is_used_in_worker_processes(custom_escape: None):
+    @template()
+    def quotes() -> Element:
+        return section(independent(p('"quoted"')), independent(p(title='"')))
+
+    # Spawned processes do not inherit the escape function of this process.
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=2, mp_context=context) as executor:
+        output = quotes().render(doctype=False, parallel=executor)
+    assert output == quotes().render(doctype=False)
+    assert "&#34;quoted&#34;" in output
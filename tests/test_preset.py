@@ -0,0 +1,168 @@
+from collections.abc import Iterator
+from html import escape
+
+import pytest
+
+from minihtml import Element, set_escape_function, template
+from minihtml.tags import a, button, div, img, input_, span
+
+primary = button.preset(type="button", class_="btn btn-primary")
+
+
+def test_preset():
+    assert str(primary("Save")) == (
+        '<button type="button" class="btn btn-primary">Save</button>'
+    )
+    assert str(img.preset(alt="", loading="lazy")(src="a.png")) == (
+        '<img alt="" loading="lazy" src="a.png">'
+    )
+
+
+def test_preset_attributes_can_be_overridden():
+    assert str(primary(type="submit", disabled=True)("Send")) == (
+        '<button type="submit" class="btn btn-primary" disabled>Send</button>'
+    )
+    assert str(primary["wide"]("Go")) == (
+        '<button type="button" class="btn btn-primary wide">Go</button>'
+    )
+
+
+def test_preset_elements_do_not_share_changes():
+    first, second = primary("One"), primary("Two")
+    first(id="first")["active"]
+    third = primary.build("Three")
+    assert str(first) == (
+        '<button type="button" class="btn btn-primary active" id="first">One</button>'
+    )
+    assert str(second) == '<button type="button" class="btn btn-primary">Two</button>'
+    assert str(third) == '<button type="button" class="btn btn-primary">Three</button>'
+    assert str(second.copy()(title="t")("!")) == (
+        '<button type="button" class="btn btn-primary" title="t">Two!</button>'
+    )
+    assert primary("x").attributes == {"type": "button", "class": "btn btn-primary"}
+
+
+def test_nested_presets():
+    danger = primary.preset(class_="btn btn-danger", form="f")
+    assert str(danger("Delete")) == (
+        '<button type="button" class="btn btn-danger" form="f">Delete</button>'
+    )
+    assert str(primary("Save")) == (
+        '<button type="button" class="btn btn-primary">Save</button>'
+    )
+
+
+def test_preset_in_element_context():
+    link = a.preset(rel="noopener")
+    with div as elem:
+        with span:
+            link(href="/")("home")
+    assert str(elem) == ('<div><span><a rel="noopener" href="/">home</a></span></div>')
+    with link as elem:
+        span("x")
+    assert str(elem) == '<a rel="noopener"><span>x</span></a>'
+
+
+def test_preset_invalid_attribute_name():
+    with pytest.raises(ValueError, match="Invalid attribute name"):
+        div.preset(**{"a b": "c"})
+
+
+def test_preset_rendering():
+    @template()
+    def t() -> Element:
+        return div(primary("Save"), primary(id="x")("Go"))
+
+    assert t().render(minify=True, doctype=False) == (
+        '<div><button type=button class="btn btn-primary">Save</button>'
+        '<button type=button class="btn btn-primary" id=x>Go</button></div>'
+    )
+
+    def nonce(attrs: dict[str, str | None]) -> None:
+        attrs["nonce"] = "n"
+
+    html = t().render(doctype=False, attribute_filters={"button": nonce})
+    assert html.count('nonce="n"') == 2
+
+
+def test_preset_with_escape_function():
+    quoted = span.preset(title='"')
+    set_escape_function(lambda s: s.replace('"', "&#34;"))
+    try:
+        assert str(quoted("x")) == '<span title="&#34;">x</span>'
+    finally:
+        set_escape_function(None)
+    assert str(quoted("x")) == '<span title="&quot;">x</span>'
+
+
+@pytest.fixture
+def escaped() -> Iterator[list[str]]:
+    calls: list[str] = []
+
+    def counting_escape(s: str) -> str:
+        calls.append(s)
+        return escape(s)
+
+    set_escape_function(counting_escape)
+    yield calls
+    set_escape_function(None)
+
+
+def test_additional_attributes_keep_preset(escaped: list[str]):
+    text_input = input_.preset(type="text", class_="form-control", required=True)
+    elem = text_input(id="a", name="b", autofocus=True)
+    plain = input_(type="text", class_="form-control", required=True, id="a", name="b")(
+        autofocus=True
+    )
+
+    # The preset attributes are escaped once, when first rendered.
+    str(elem)
+    escaped.clear()
+    assert (
+        str(elem)
+        == str(plain)
+        == (
+            '<input type="text" class="form-control" id="a" name="b" required autofocus>'
+        )
+    )
+    # Only the attributes that are not part of the preset are escaped.
+    assert escaped[:2] == ["a", "b"]
+
+    @template()
+    def t() -> Element:
+        return div(elem)
+
+    escaped.clear()
+    assert t().render(minify=True, doctype=False) == (
+        "<div><input type=text class=form-control id=a name=b required autofocus></div>"
+    )
+    assert escaped == ["a", "b"]
+
+    elem["#c"]
+    escaped.clear()
+    assert str(elem).startswith('<input type="text" class="form-control" id="c"')
+    assert escaped[:2] == ["c", "b"]
+
+
+def test_preset_created_before_escape_function(escaped: list[str]):
+    elem = primary(id="x")
+    assert str(elem) == '<button type="button" class="btn btn-primary" id="x"></button>'
+    escaped.clear()
+    str(elem)
+    str(primary())
+    assert escaped == ["x"]
+
+
+def test_overriding_attributes_drops_preset(escaped: list[str]):
+    text_input = input_.preset(type="text", class_="form-control")
+    for elem in [text_input(type="email"), text_input(id="x")["wide"]]:
+        escaped.clear()
+        str(elem)
+        assert "form-control" in " ".join(escaped)
+
+    assert str(text_input(type="email")) == (
+        '<input type="email" class="form-control">'
+    )
+    assert str(text_input(id="x")["wide"]) == (
+        '<input type="text" class="form-control wide" id="x">'
+    )
@@ -0,0 +1,125 @@
+import pickle
+
+import pytest
+
+from minihtml import (
+    CircularReferenceError,
+    Element,
+    ElementEmpty,
+    ElementNonEmpty,
+    independent,
+    table_from_rows,
+    template,
+)
+from minihtml.tags import a, div, img, li, nav, p, span, ul
+
+
+def make_tree() -> Element:
+    with div["#main"] as elem:
+        with nav:
+            with ul["menu"]:
+                li["active"](a(href="/")("Home"))
+                li(a(href="/about")("About"))
+        p("See ", a(href="/more")("more"), ".")
+        p(img(src="a.png"), img["wide"](src="b.png"))
+    return elem
+
+
+def tags(elements: list[Element]) -> list[str]:
+    return [str(elem) if elem.tag == "img" else elem.tag for elem in elements]
+
+
+def test_select_by_tag_id_and_class():
+    tree = make_tree()
+    assert [e.attributes["href"] for e in tree.select("a")] == ["/", "/about", "/more"]
+    assert tree.select("#main") == [tree]
+    assert tags(tree.select(".active")) == ["li"]
+    assert tags(tree.select("img.wide")) == ['<img class="wide" src="b.png">']
+    assert tags(tree.select("li.active.missing")) == []
+    assert tags(tree.select("span")) == []
+    assert len(tree.select("*")) == 12
+
+
+def test_select_combinators():
+    tree = make_tree()
+    assert len(tree.select("nav a")) == 2
+    assert len(tree.select("ul > li > a")) == 2
+    assert tree.select("nav > a") == []
+    assert len(tree.select("#main > p a")) == 1
+    assert len(tree.select("div li.active a")) == 1
+
+
+def test_select_list_in_document_order():
+    tree = make_tree()
+    assert tags(tree.select("p, ul, nav, ul")) == ["nav", "ul", "p", "p"]
+
+
+def test_select_one():
+    tree = make_tree()
+    first = tree.select_one("p a")
+    assert first is not None and first.attributes["href"] == "/more"
+    assert tree.select_one("table") is None
+    assert img().select_one("img") is not None
+
+
+def test_select_invalid_selector():
+    with pytest.raises(ValueError, match="Invalid selector"):
+        make_tree().select("a >")
+
+
+def test_select_index_is_updated_on_changes():
+    tree = make_tree()
+    assert len(tree.select("a")) == 3
+
+    menu = tree.select_one(".menu")
+    assert isinstance(menu, ElementNonEmpty)
+    menu(li(a(href="/contact")("Contact")))
+    assert len(tree.select("a")) == 4
+
+    link = tree.select_one("a")
+    assert link is not None
+    link["#home external"]
+    assert tree.select("#home.external") == [link]
+
+    img_ = tree.select_one("img")
+    assert isinstance(img_, ElementEmpty)
+    img_(class_="wide")
+    assert len(tree.select(".wide")) == 2
+
+    # A subtree with its own index is updated as well.
+    assert len(menu.select("li")) == 3
+    menu(li("Blog"))
+    assert len(menu.select("li")) == 4
+    assert len(tree.select("li")) == 4
+
+
+def test_select_shared_and_special_nodes():
+    shared = span["x"]("shared")
+    tree = div(p(shared), p(shared), table_from_rows([[1]], class_="data"))
+    assert tree.select(".x") == [shared]
+    assert tags(tree.select("div > table.data")) == ["table"]
+
+
+def test_select_circular_reference():
+    elem = div()
+    elem(p(elem))
+    with pytest.raises(CircularReferenceError):
+        elem.select("p")
+
+
+def test_indexed_elements_can_be_pickled():
+    tree = make_tree()
+    assert tags(tree.select("li")) == ["li", "li"]
+    copy = pickle.loads(pickle.dumps(tree))
+    assert str(copy) == str(tree)
+    assert tags(copy.select("a")) == ["a", "a", "a"]
+
+
+def test_render_indexed_tree_in_worker_processes():
+    @template()
+    def page() -> Element:
+        tree = make_tree()
+        tree.select(".active")
+        return div(independent(tree))
+
+    assert page().render(parallel=2) == page().render()
@@ -0,0 +1,169 @@
+import io
+import socket
+import weakref
+from pathlib import Path
+from typing import TextIO
+
+from minihtml import (
+    Element,
+    Node,
+    Slots,
+    component,
+    component_scripts,
+    component_styles,
+    template,
+)
+from minihtml.tags import body, div, head, html, li, p, script, span, style, ul
+
+
+@template()
+def page(n: int) -> Element:
+    return div(*[p(f"paragraph {i} – ü") for i in range(n)])
+
+
+class CountingSink(io.BytesIO):
+    def __init__(self) -> None:
+        super().__init__()
+        self.writes = 0
+
+    def write(self, data: bytes, /) -> int:  # pyright: ignore[reportIncompatibleMethodOverride]
+        self.writes += 1
+        return super().write(data)
+
+
+def test_render_to_binary_stream():
+    sink = io.BytesIO()
+    page(10).render_to(sink)
+
+    assert sink.getvalue() == page(10).render().encode()
+
+
+def test_render_to_writes_in_blocks():
+    sink = CountingSink()
+    page(100).render_to(sink, buffer_size=1000)
+
+    assert sink.getvalue() == page(100).render().encode()
+    assert 1 < sink.writes <= len(sink.getvalue()) // 1000 + 1
+
+
+def test_render_to_with_encoding():
+    sink = io.BytesIO()
+    page(3).render_to(sink, encoding="utf-16", minify=True, doctype=False)
+
+    assert sink.getvalue().decode("utf-16") == page(3).render(
+        minify=True, doctype=False
+    )
+
+
+def test_render_to_text_stream():
+    sink = io.StringIO()
+    page(10).render_to(sink, encoding=None)
+
+    assert sink.getvalue() == page(10).render()
+
+
+def test_render_to_file(tmp_path: Path):
+    path = tmp_path / "page.html"
+    with path.open("wb") as f:
+        page(10).render_to(f)
+
+    assert path.read_text(encoding="utf-8") == page(10).render()
+
+
+def test_render_to_socket():
+    a, b = socket.socketpair()
+    with a, b:
+        page(10).render_to(a)
+        a.shutdown(socket.SHUT_WR)
+        data = b"".join(iter(lambda: b.recv(4096), b""))
+
+    assert data == page(10).render().encode()
+
+
+class Probe(Node):
+    def __init__(self) -> None:
+        self._inline = False
+        self.refs: list[weakref.ref[Element]] = []
+        self.alive: list[bool] = []
+
+    def write(self, f: TextIO, indent: int = 0) -> None:
+        self.alive = [ref() is not None for ref in self.refs]
+
+
+@template()
+def sections(probe: Probe) -> Element:
+    with div() as root:
+        for i in range(3):
+            with ul() as section:
+                li(f"item {i}")
+            probe.refs.append(weakref.ref(section))
+    return root(probe)
+
+
+def test_render_to_release():
+    probe = Probe()
+    sections(probe).render_to(io.BytesIO())
+    assert probe.alive == [True, True, True]
+
+    probe = Probe()
+    sink = io.BytesIO()
+    sections(probe).render_to(sink, release=True)
+    assert sink.getvalue() == sections(Probe()).render().encode()
+    assert probe.alive == [False, False, False]
+
+
+def test_render_to_release_minified():
+    probe = Probe()
+    sink = io.BytesIO()
+    sections(probe).render_to(sink, minify=True, release=True)
+    assert sink.getvalue() == sections(Probe()).render(minify=True).encode()
+    assert probe.alive == [False, False, False]
+
+
+def test_render_to_release_keeps_shared_elements():
+    @template()
+    def shared_page() -> Element:
+        shared = span("shared ", p("content"))
+        return div(p(shared), p(shared))
+
+    for minify in (False, True):
+        sink = io.BytesIO()
+        shared_page().render_to(sink, minify=minify, release=True)
+        assert sink.getvalue() == shared_page().render(minify=minify).encode()
+
+
+@component(style=style(".card { color: red }"))
+def card(slots: Slots) -> Element:
+    return div["card"]("card")
+
+
+def test_render_to_release_keeps_component_styles():
+    @template()
+    def styled_page() -> Element:
+        return div(head(component_styles()), card())
+
+    expected = styled_page().render().encode()
+    assert b".card { color: red }" in expected
+    for _ in range(2):
+        sink = io.BytesIO()
+        styled_page().render_to(sink, release=True)
+        assert sink.getvalue() == expected
+
+
+@component(script=script("setup_widget();"))
+def widget(slots: Slots) -> Element:
+    return div["widget"]("widget")
+
+
+def test_render_to_release_keeps_lazy_component_scripts():
+    @template()
+    def lazy_page() -> Element:
+        return html(body(div(widget() for _ in range(1)), component_scripts()))
+
+    # The script is first seen while rendering with release=True.
+    sinks = [io.BytesIO(), io.BytesIO()]
+    for sink in sinks:
+        lazy_page().render_to(sink, release=True)
+    expected = lazy_page().render()
+    assert "<script>setup_widget();</script>" in expected
+    assert [sink.getvalue() for sink in sinks] == [expected.encode()] * 2
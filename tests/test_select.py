@@ -0,0 +1,116 @@
+import pytest
+
+from minihtml import Component, Element, Slots, component, independent, template
+from minihtml.tags import body, div, h1, html, li, main, p, section, span, ul
+
+calls: list[str] = []
+
+
+@component()
+def sidebar(slots: Slots) -> Element:
+    calls.append("sidebar")
+    return div["sidebar"](p("links"))
+
+
+@component()
+def results(slots: Slots, items: list[str]) -> Element:
+    calls.append("results")
+    return ul["#results"](*[li(item) for item in items])
+
+
+@component()
+def layout(slots: Slots) -> Element:
+    calls.append("layout")
+    with html as elem:
+        with body:
+            sidebar()
+            with main:
+                slots.slot()
+    return elem
+
+
+@template(layout=layout)
+def page(layout: Component, items: list[str]) -> None:
+    h1("Search")
+    with div["#content"]:
+        p["note"]("Results:")
+        results(items)
+
+
+@pytest.fixture(autouse=True)
+def reset_calls():
+    calls.clear()
+
+
+def test_select_in_slot_content():
+    assert page(["a"]).render(select="#content") == (
+        '<div id="content">\n'
+        '  <p class="note">Results:</p>\n'
+        '  <ul id="results">\n'
+        "    <li>a</li>\n"
+        "  </ul>\n"
+        "</div>\n"
+    )
+    assert calls == ["results"]
+
+
+def test_select_in_component():
+    assert page(["a", "b"]).render(select="ul#results", minify=True) == (
+        "<ul id=results><li>a<li>b</ul>"
+    )
+    assert calls == ["results"]
+
+
+def test_select_in_layout():
+    assert page([]).render(select=".sidebar") == (
+        '<div class="sidebar">\n  <p>links</p>\n</div>\n'
+    )
+    # Components in slots are searched before the layout is expanded.
+    assert calls == ["results", "layout", "sidebar"]
+
+
+def test_select_matches_full_render():
+    full = page(["a"]).render()
+    selected = page(["a"]).render(select="ul")
+    assert selected.replace("\n", "\n        ").strip() in full
+
+
+def test_select_without_match():
+    with pytest.raises(ValueError, match="No element matches"):
+        page([]).render(select="#missing")
+
+
+def test_select_plain_template():
+    @template()
+    def my_template() -> Element:
+        return div(span["a b"]("x"), span["b"]("y"))
+
+    assert my_template().render(select="span.b") == '<span class="a b">x</span>\n'
+    assert my_template().render(select="span.b.a") == '<span class="a b">x</span>\n'
+
+
+def test_select_in_independent_subtree():
+    @template()
+    def my_template() -> Element:
+        return div(
+            independent(section(p["#target"]("x"))),
+            independent(div["#list"](results(["a"]))),
+        )
+
+    assert my_template().render(select="#target") == '<p id="target">x</p>\n'
+    assert my_template().render(select="#results", minify=True) == (
+        "<ul id=results><li>a</ul>"
+    )
+    assert my_template().render(select="#list", parallel=2) == (
+        '<div id="list">\n  <ul id="results">\n    <li>a</li>\n  </ul>\n</div>\n'
+    )
+
+
+@pytest.mark.parametrize("selector", ["", "#", "div >", "#a#b", "a b"])
+def test_select_invalid_selector(selector: str):
+    @template()
+    def my_template() -> Element:
+        return div()
+
+    with pytest.raises(ValueError, match="Invalid selector"):
+        my_template().render(select=selector)
@@ -0,0 +1,84 @@
+from collections.abc import Sequence
+
+import pytest
+
+from minihtml import Element, table_from_rows, template
+from minihtml.tags import div, p, table, tbody, td, th, thead, tr
+
+ROWS = [[1, "a < b"], [None, "x & y"], [2.5, ""]]
+
+
+def build_table(
+    rows: Sequence[Sequence[object]], columns: Sequence[str] | None = None
+) -> Element:
+    content: list[Element] = []
+    if columns is not None:
+        content.append(thead(tr(*[th(c) for c in columns])))
+    content.append(
+        tbody(*[tr(*[td("" if v is None else str(v)) for v in row]) for row in rows])
+    )
+    return table(*content)
+
+
+@pytest.mark.parametrize("columns", [["n", "text"], None])
+@pytest.mark.parametrize("rows", [ROWS, []])
+@pytest.mark.parametrize("minify", [False, True])
+def test_table_from_rows_matches_elements(
+    rows: list[list[object]], columns: list[str] | None, minify: bool
+):
+    @template()
+    def expected() -> Element:
+        return div(p("before"), build_table(rows, columns)["data"], p("after"))
+
+    @template()
+    def actual() -> Element:
+        return div(p("before"), table_from_rows(rows, columns)["data"], p("after"))
+
+    assert actual().render(minify=minify) == expected().render(minify=minify)
+
+
+def test_table_from_rows_attributes():
+    elem = table_from_rows([[1]], class_="data", hidden=True)
+    assert str(elem) == (
+        '<table class="data" hidden>\n'
+        "  <tbody>\n"
+        "    <tr>\n"
+        "      <td>1</td>\n"
+        "    </tr>\n"
+        "  </tbody>\n"
+        "</table>"
+    )
+
+
+def test_table_from_rows_in_context():
+    with div as elem:
+        table_from_rows([["x"]])
+    assert str(elem) == str(div(build_table([["x"]])))
+
+
+def test_table_from_rows_escapes_cells_with_separator():
+    elem = table_from_rows([["a\x00<"], ["b"]])
+    assert str(elem) == str(build_table([["a\x00<"], ["b"]]))
+
+
+def test_table_from_rows_to_list():
+    class Array:
+        def tolist(self) -> list[list[object]]:
+            return [[1, 2], [3, 4]]
+
+    assert str(table_from_rows(Array())) == str(build_table([[1, 2], [3, 4]]))
+
+
+def test_table_from_rows_invalid_row_length():
+    with pytest.raises(ValueError, match="All rows must have 2 cells"):
+        table_from_rows([[1, 2], [3]])
+
+    with pytest.raises(ValueError, match="All rows must have 1 cells"):
+        table_from_rows([[1, 2]], columns=["a"])
+
+
+def test_table_from_rows_events():
+    events = list(table_from_rows([["<"]], ["a"]).iter_events())
+    assert [type(e).__name__ for e in events] == [
+        type(e).__name__ for e in build_table([["<"]], ["a"]).iter_events()
+    ]
@@ -1,17 +1,26 @@
+import gc
+import inspect
+import weakref
 from contextvars import ContextVar
 from textwrap import dedent
 
+import pytest
+
 from minihtml import (
     Component,
+    ComponentWrapper,
     Element,
+    Manifest,
     Slots,
+    clear_manifests,
     component,
     component_scripts,
     component_styles,
+    depends_on,
     template,
     text,
 )
-from minihtml.tags import body, div, head, html, main, script, style, title
+from minihtml.tags import body, div, head, html, link, main, script, style, title
 
 
 def test_template_renders_as_html_with_doctype_and_trailing_newline():
@@ -172,6 +181,41 @@ def test_passing_component_styles_and_scripts_as_arguments():
     """)
 
 
+def test_template_deduplicates_equal_styles_and_scripts():
+    def make_component(variant: str) -> ComponentWrapper[[]]:
+        @component(
+            style=style(".card { padding: 1em }"),
+            script=script("// shared script"),
+        )
+        def card(slots: Slots) -> Element:
+            return div[f"card {variant}"]
+
+        return card
+
+    primary, secondary = make_component("primary"), make_component("secondary")
+
+    @template()
+    def my_template() -> Element:
+        return html(
+            head(component_styles()),
+            body(primary(), secondary(), component_scripts()),
+        )
+
+    assert my_template().render() == dedent("""\
+        <!doctype html>
+        <html>
+          <head>
+            <style>.card { padding: 1em }</style>
+          </head>
+          <body>
+            <div class="card primary"></div>
+            <div class="card secondary"></div>
+            <script>// shared script</script>
+          </body>
+        </html>
+    """)
+
+
 name_context = ContextVar[str]("name")
 
 
@@ -187,3 +231,125 @@ def test_template_is_rendered_lazily():
 
     name_context.set("barney")
     assert t.render(doctype=False) == "<div>barney</div>\n"
+
+
+def test_template_records_dependencies():
+    my_style = style(".my-component { background: #ccc }")
+    my_script = script("// script goes here")
+
+    @component(style=my_style, script=my_script)
+    def my_component(slots: Slots) -> Element:
+        return div["my-component"]
+
+    @component()
+    def my_layout(slots: Slots) -> Element:
+        with html as elem:
+            slots.slot()
+        return elem
+
+    @template(layout=my_layout)
+    def my_template(layout: Component, path: str) -> None:
+        depends_on(path)
+        my_component()
+        my_component()
+
+    t = my_template("data/page.json")
+    with pytest.raises(RuntimeError):
+        t.dependencies
+
+    t.render()
+    deps = t.dependencies
+    assert deps.template is inspect.unwrap(my_template)
+    assert deps.components == (my_layout, my_component)
+    assert deps.styles == (my_style,)
+    assert deps.scripts == (my_script,)
+    assert deps.files == ("data/page.json",)
+
+
+def test_depends_on_outside_of_template_does_nothing():
+    @template()
+    def my_template() -> Element:
+        return div()
+
+    depends_on("data/page.json")
+    t = my_template()
+    t.render()
+    depends_on("data/other.json")
+    assert t.dependencies.files == ()
+
+
+def test_template_manifest():
+    @component(
+        style=[link(rel="stylesheet", href="/a.css"), style("p {}")],
+        script=script(src="/a.js"),
+    )
+    def my_component(slots: Slots) -> Element:
+        return div()
+
+    @template()
+    def my_template(n: int | str) -> Element:
+        return html(head(component_styles()), body(my_component(), component_scripts()))
+
+    assert my_template(1).manifest is None
+    my_template(1).render()
+
+    manifest = my_template(2).manifest
+    assert manifest == Manifest(styles=("/a.css",), scripts=("/a.js",))
+    assert manifest is not None
+    assert manifest.link_header() == (
+        "</a.css>; rel=preload; as=style, </a.js>; rel=preload; as=script"
+    )
+    assert my_template("other argument type").manifest is None
+
+
+def test_clear_manifests():
+    @template()
+    def my_template() -> Element:
+        return html(head(component_styles()))
+
+    my_template().render()
+    assert my_template().manifest == Manifest()
+    clear_manifests()
+    assert my_template().manifest is None
+
+
+def test_manifests_do_not_keep_templates_alive():
+    def page() -> Element:
+        return div()
+
+    ref = weakref.ref(page)
+    page_template = template()(page)
+    page_template().render()
+    assert page_template().manifest == Manifest()
+
+    del page, page_template
+    gc.collect()
+    assert ref() is None
+
+
+def test_number_of_manifests_per_template_is_limited():
+    @template()
+    def my_template(arg: object) -> Element:
+        return div()
+
+    args = [type(f"Arg{i}", (), {})() for i in range(100)]
+    for arg in args:
+        my_template(arg).render()
+    assert my_template(args[0]).manifest is None
+    assert my_template(args[-1]).manifest == Manifest()
+
+
+def test_template_manifest_without_placeholders():
+    @component(style=link(rel="stylesheet", href="/a.css"))
+    def my_component(slots: Slots) -> Element:
+        return div()
+
+    @template()
+    def my_template() -> Component:
+        return my_component()
+
+    my_template().render()
+    manifest = my_template().manifest
+    assert manifest == Manifest()
+    assert manifest is not None
+    assert manifest.link_header() == ""
@@ -0,0 +1,148 @@
+from minihtml import Element, ElementNonEmpty, fragment, template
+from minihtml.tags import a, body, div, html, img, li, p, span, ul
+
+
+def noopener(elem: Element) -> Element | None:
+    if elem.tag == "a" and (elem.attributes.get("href") or "").startswith("https:"):
+        return elem.copy()(rel="noopener")
+    return None
+
+
+def cdn(elem: Element) -> Element | None:
+    if elem.tag == "img":
+        return elem.copy()(src=f"https://cdn.example.com/{elem.attributes['src']}")
+    return None
+
+
+def make_tree() -> ElementNonEmpty:
+    return div(
+        p(a(href="https://example.com/")(img(src="logo.png")), a(href="/")("Home")),
+        img(src="photo.jpg"),
+    )
+
+
+def test_transform_replaces_elements():
+    tree = make_tree()
+    assert str(tree.transform(noopener, cdn)) == (
+        "<div>\n"
+        "  <p>"
+        '<a href="https://example.com/" rel="noopener">'
+        '<img src="https://cdn.example.com/logo.png"></a>'
+        '<a href="/">Home</a>'
+        "</p>\n"
+        '  <img src="https://cdn.example.com/photo.jpg">\n'
+        "</div>"
+    )
+
+
+def test_transform_in_place():
+    def add_class(elem: Element) -> None:
+        if elem.tag == "li":
+            elem["item"]
+
+    tree = ul(li("a"), li("b"))
+    assert tree.transform(add_class) is tree
+    assert (
+        str(tree) == '<ul>\n  <li class="item">a</li>\n  <li class="item">b</li>\n</ul>'
+    )
+
+
+def test_transform_order():
+    calls: list[str] = []
+
+    def first(elem: Element) -> Element | None:
+        calls.append(f"first {elem.tag}")
+        return span("replaced") if elem.tag == "b" else None
+
+    def second(elem: Element) -> None:
+        calls.append(f"second {elem.tag}")
+
+    assert str(div(p("x"), ul()).transform(first, second)) == (
+        "<div>\n  <p>x</p>\n  <ul></ul>\n</div>"
+    )
+    assert calls == [
+        "first div",
+        "second div",
+        "first p",
+        "second p",
+        "first ul",
+        "second ul",
+    ]
+
+
+def test_transform_replacement_is_not_transformed_again():
+    def wrap(elem: Element) -> Element | None:
+        if elem.tag == "span":
+            return div["wrapper"](elem, img(src="new.png"))
+        return None
+
+    tree = p(span("a"))
+    assert str(tree.transform(wrap, cdn)) == (
+        '<p>\n  <div class="wrapper"><span>a</span>'
+        '<img src="https://cdn.example.com/new.png"></div>\n</p>'
+    )
+
+
+def test_transform_root_replaced():
+    assert str(img(src="a.png").transform(cdn)) == (
+        '<img src="https://cdn.example.com/a.png">'
+    )
+
+
+def test_transform_fragment():
+    frag = fragment(img(src="a.png"), "text").transform(cdn)
+    assert str(frag) == '<img src="https://cdn.example.com/a.png">text'
+
+
+def test_transform_updates_index():
+    tree = make_tree()
+    assert len(tree.select("img")) == 2
+    tree.transform(lambda elem: span() if elem.tag == "img" else None)
+    assert tree.select("img") == []
+
+
+def test_copy():
+    elem = div["a"](p("x"))
+    new = elem.copy()(p("y"), id="b")
+    assert str(elem) == '<div class="a">\n  <p>x</p>\n</div>'
+    assert str(new) == '<div class="a" id="b">\n  <p>x</p>\n  <p>y</p>\n</div>'
+
+
+@template()
+def page() -> Element:
+    with html as elem:
+        with body:
+            make_tree()
+    return elem
+
+
+def test_render_with_transforms():
+    t = page()
+    expected = page().render()
+    expected = expected.replace(
+        'href="https://example.com/"', 'href="https://example.com/" rel="noopener"'
+    )
+    expected = expected.replace('src="', 'src="https://cdn.example.com/')
+    assert t.render(transforms=[noopener, cdn]) == expected
+
+
+def test_render_with_transforms_does_not_modify_tree():
+    tree = make_tree()
+    before = str(tree)
+
+    @template()
+    def t() -> Element:
+        return tree
+
+    assert "noopener" in t().render(transforms=[noopener])
+    assert str(tree) == before
+
+
+def test_render_minified_with_transforms():
+    @template()
+    def t() -> Element:
+        return ul(li(img(src="a.png")), li("b"))
+
+    assert t().render(minify=True, doctype=False, transforms=[cdn]) == (
+        "<ul><li><img src=https://cdn.example.com/a.png></li><li>b</li></ul>"
+    )